@@ -0,0 +1,3 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
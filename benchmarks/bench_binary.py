@@ -0,0 +1,52 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Serialize and reload a config: json vs. figgis.binary
+"""
+
+from __future__ import print_function
+
+import json
+
+from figgis import Config, Field, ListField
+from figgis import binary
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0, validator=lambda price: price >= 0)
+    tags = ListField(choices=['new', 'sale', 'clearance'])
+    in_stock = Field(bool, default=True)
+
+
+class Catalog(Config):
+    name = Field(required=True)
+    products = ListField(Product)
+
+
+def main():
+    catalog = Catalog(
+        name='catalog',
+        products=[{'name': 'product{0}'.format(i), 'price': i * 0.5,
+                   'tags': ['new', 'sale']}
+                  for i in range(10000)]
+    )
+    text = json.dumps(catalog.to_dict())
+    data = binary.dumps(catalog)
+    print('json: {0} bytes, binary: {1} bytes'.format(len(text), len(data)))
+
+    baseline = best_of(lambda: json.dumps(catalog.to_dict()))
+    report('json.dumps(to_dict())', baseline)
+    report('binary.dumps', best_of(lambda: binary.dumps(catalog)), baseline)
+
+    baseline = best_of(lambda: Catalog(json.loads(text)))
+    report('Catalog(json.loads())', baseline)
+    report('binary.loads', best_of(lambda: binary.loads(Catalog, data)),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
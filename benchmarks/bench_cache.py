@@ -0,0 +1,68 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+First use of per-class derived data (fingerprint, JSON schema, description)
+by many threads at once, vs. a single thread and vs. warm caches
+"""
+
+from __future__ import print_function
+
+import threading
+import timeit
+
+from figgis import Config, Field, ListField
+from benchmarks.common import report
+
+
+class Sub(Config):
+    value = Field(int)
+    label = Field()
+
+
+def make_schemas(count=200):
+    return [type('Schema{0}'.format(i), (Config,), dict(
+        [('field{0}'.format(j), Field(int, default=j)) for j in range(20)] +
+        [('sub', Field(Sub)), ('items', ListField(Sub))]))
+        for i in range(count)]
+
+
+def use(schemas):
+    for cls in schemas:
+        cls.fingerprint()
+        cls._json_schema()
+        cls.describe()
+
+
+def run_threads(schemas, count):
+    start = threading.Event()
+
+    def run():
+        start.wait()
+        use(schemas)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+
+    began = timeit.default_timer()
+    start.set()
+    for thread in threads:
+        thread.join()
+    return timeit.default_timer() - began
+
+
+def main():
+    schemas = make_schemas()
+    began = timeit.default_timer()
+    use(schemas)
+    baseline = timeit.default_timer() - began
+    report('first use, 1 thread', baseline)
+
+    report('first use, 16 threads', run_threads(make_schemas(), 16), baseline)
+    report('warm, 16 threads', run_threads(schemas, 16), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Validate a large list of tags against a large set of choices
+"""
+
+from __future__ import print_function
+
+import random
+
+from figgis import Config, ListField
+from benchmarks.common import best_of, report
+
+
+CHOICES = ['tag{0}'.format(i) for i in range(10000)]
+
+
+class Tagged(Config):
+    tags = ListField(str, choices=CHOICES)
+
+
+class Untyped(Config):
+    tags = ListField(lambda value: value, choices=CHOICES)
+
+
+def main():
+    rng = random.Random(0)
+    tags = [rng.choice(CHOICES) for _ in range(100000)]
+    field = Tagged._fields['tags']
+
+    def naive():
+        for value in tags:
+            if value not in field.choices:
+                raise AssertionError
+
+    baseline = best_of(naive)
+    report('python loop over choices', baseline)
+    report('ListField.invalid_choice', best_of(lambda: field.invalid_choice(tags)), baseline)
+    report('Tagged (exact types)', best_of(lambda: Tagged(tags=tags)))
+    report('Untyped (function coercion)', best_of(lambda: Untyped(tags=tags)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Coercion of every built-in kind of type, single values and lists, using the
+per-field coercer dispatch table vs. Field.invalid_type + Field.coerce
+"""
+
+from __future__ import print_function
+
+from decimal import Decimal
+
+import six
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Sub(Config):
+    value = Field(int)
+
+
+def identity(value):
+    return value
+
+
+SIZE = 20000
+
+CASES = [
+    ('bool', bool, ['yes', 0, 'false', 1] * (SIZE // 4)),
+    ('int', int, [str(i) for i in range(SIZE)]),
+    ('float', float, list(range(SIZE))),
+    ('text', six.text_type, list(range(SIZE))),
+    ('Config', Sub, [{'value': i} for i in range(SIZE)]),
+    ('function', identity, list(range(SIZE))),
+    ('class', Decimal, [str(i) for i in range(SIZE)]),
+]
+
+
+def legacy(field, type_, values):
+    """The original two-step type check and coercion, for comparison"""
+    result = []
+    for value in values:
+        if field.invalid_type(type_, value, 'value'):
+            raise ValueError
+        elif isinstance(value, dict):
+            value = type_._normalize(value, prefix='value')
+
+        result.append(field.coerce(value, type_))
+
+    return result
+
+
+def main():
+    for label, type_, values in CASES:
+        field = Field(type_)
+        coerce = field.coercer(type_)[0]
+
+        baseline = best_of(lambda: legacy(field, type_, values))
+        report('{0}: invalid_type + coerce'.format(label), baseline)
+        report('{0}: dispatch table'.format(label),
+               best_of(lambda: [coerce(value) for value in values]), baseline)
+
+        list_field = ListField(type_)
+        report('{0}: ListField batch'.format(label),
+               best_of(lambda: list_field.normalize_value(values, 'v', 'v')), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Memory and aggregation speed of a large ListField of configs, stored as
+objects vs. by column
+"""
+
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0)
+    quantity = Field(int, default=0)
+
+
+class Catalog(Config):
+    products = ListField(Product)
+
+
+class ColumnarCatalog(Config):
+    products = ListField(Product, columnar=True)
+
+
+def measure(cls, data):
+    gc.collect()
+    tracemalloc.start()
+    catalog = cls(products=data)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return catalog, size
+
+
+def main():
+    data = [{'name': 'product{0}'.format(i), 'price': i * 0.25, 'quantity': i}
+            for i in range(100000)]
+
+    catalog, size = measure(Catalog, data)
+    columnar, columnar_size = measure(ColumnarCatalog, data)
+    print('objects:  {0:>8.1f} MiB'.format(size / 2.0 ** 20))
+    print('columnar: {0:>8.1f} MiB'.format(columnar_size / 2.0 ** 20))
+
+    baseline = best_of(lambda: sum(product.price for product in catalog.products))
+    report('sum(price) over objects', baseline)
+    report('sum(column("price"))',
+           best_of(lambda: sum(columnar.products.column('price'))), baseline)
+
+    baseline = best_of(lambda: Catalog(products=data))
+    report('normalize as objects', baseline)
+    report('normalize as columns', best_of(lambda: ColumnarCatalog(products=data)), baseline)
+
+
+if __name__ == '__main__':
+    main()
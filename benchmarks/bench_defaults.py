@@ -0,0 +1,48 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Sparse data, where most fields fall back to their defaults: data that spells
+out the default values vs. data that omits them
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField, Range
+from benchmarks.common import best_of, report
+
+
+class Limits(Config):
+    cpu = Field(float, default=1.0, validator=Range(min=0))
+    memory = Field(int, default=512, validator=Range(min=0))
+
+
+class Service(Config):
+    name = Field(required=True)
+    port = Field(int, default=8080, validator=Range(1, 65535))
+    host = Field(default='localhost')
+    protocol = Field(default='http', choices=['http', 'https'])
+    debug = Field(bool, default='false')
+    retries = Field(int, default='3', validator=Range(min=0))
+    timeout = Field(float, default=30)
+    tags = ListField(default=['default'])
+    env = Field(dict, default={})
+    limits = Field(Limits, default={})
+
+
+def main():
+    sparse = [{'name': 'service{0}'.format(i)} for i in range(10000)]
+    explicit = [dict(item, port=8080, host='localhost', protocol='http',
+                     debug='false', retries='3', timeout=30,
+                     tags=['default'], env={}, limits={})
+                for item in sparse]
+
+    baseline = best_of(lambda: [Service(item) for item in explicit])
+    report('explicit values', baseline)
+    report('defaults', best_of(lambda: [Service(item) for item in sparse]),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
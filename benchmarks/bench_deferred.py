@@ -0,0 +1,50 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Startup latency with expensive validators: validate up front vs. deferred
+validation
+"""
+
+from __future__ import print_function
+
+import hashlib
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+def valid_certificate(pem):
+    digest = pem.encode('utf-8')
+    for _ in range(2000):
+        digest = hashlib.sha256(digest).digest()
+    return True
+
+
+class Listener(Config):
+    port = Field(int, required=True)
+    certificate = Field(validator=valid_certificate)
+
+
+class Proxy(Config):
+    listeners = ListField(Listener)
+
+
+def main():
+    data = {'listeners': [{'port': 8000 + i, 'certificate': 'cert{0}'.format(i)}
+                          for i in range(200)]}
+
+    baseline = best_of(lambda: Proxy(data))
+    report('Proxy(data)', baseline)
+    report('parse(defer_validation=True)',
+           best_of(lambda: Proxy.parse(data, defer_validation=True)),
+           baseline)
+    report('parse(defer_validation=True), wait',
+           best_of(lambda: Proxy.parse(
+               data, defer_validation=True).validation.result()),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
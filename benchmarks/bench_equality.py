@@ -0,0 +1,58 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Compare and deduplicate configs: to_dict() vs. Config equality and hashing
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Address(Config):
+    street = Field(required=True)
+    city = Field(required=True)
+
+
+class Person(Config):
+    name = Field(required=True)
+    age = Field(int)
+    address = Field(Address)
+    tags = ListField()
+
+
+def make_people(count=2000):
+    return [Person(name='person{0}'.format(i % 500), age=i % 500,
+                   address={'street': 'Main', 'city': 'Springfield'},
+                   tags=['a', 'b'])
+            for i in range(count)]
+
+
+def main():
+    people = make_people()
+    others = make_people()
+
+    baseline = best_of(lambda: [a.to_dict() == b.to_dict()
+                                for a, b in zip(people, others)])
+    report('a.to_dict() == b.to_dict()', baseline)
+    report('a == b', best_of(lambda: [a == b for a, b in zip(people, others)]),
+           baseline)
+
+    def dedup_dicts():
+        seen = []
+        for person in people:
+            data = person.to_dict()
+            if data not in seen:
+                seen.append(data)
+
+    frozen = [person.freeze() for person in make_people()]
+    baseline = best_of(dedup_dicts)
+    report('dedup by to_dict()', baseline)
+    report('set(frozen configs)', best_of(lambda: set(frozen)), baseline)
+
+
+if __name__ == '__main__':
+    main()
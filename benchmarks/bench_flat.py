@@ -0,0 +1,71 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Flat keys: unflattening into nested dictionaries before creating the config
+vs. Config.from_flat
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Worker(Config):
+    name = Field(required=True)
+    threads = Field(int, default=1)
+    queues = ListField()
+
+
+class Database(Config):
+    host = Field(required=True)
+    port = Field(int, default=5432)
+    user = Field()
+
+
+class App(Config):
+    db = Field(Database, required=True)
+    workers = ListField(Worker)
+    labels = Field(dict)
+
+
+def _listify(value):
+    if not isinstance(value, dict):
+        return value
+    elif value and all(key.isdigit() for key in value):
+        return [_listify(value[key]) for key in sorted(value, key=int)]
+
+    return dict((key, _listify(item)) for key, item in value.items())
+
+
+def unflatten(mapping, sep):
+    data = {}
+    for key, value in mapping.items():
+        node = data
+        segments = key.lower().split(sep)
+        for segment in segments[:-1]:
+            node = node.setdefault(segment, {})
+        node[segments[-1]] = value
+
+    return _listify(data)
+
+
+def main():
+    env = {'DB__HOST': 'localhost', 'DB__PORT': '5432', 'DB__USER': 'app'}
+    for i in range(500):
+        env['WORKERS__{0}__NAME'.format(i)] = 'worker{0}'.format(i)
+        env['WORKERS__{0}__THREADS'.format(i)] = '4'
+        env['WORKERS__{0}__QUEUES__0'.format(i)] = 'default'
+        env['LABELS__LABEL{0}'.format(i)] = 'value'
+
+    baseline = best_of(lambda: App(unflatten(env, '__')), number=10)
+    report('App(unflatten(env))', baseline)
+    report('App.from_flat(env)',
+           best_of(lambda: App.from_flat(env, sep='__', fold_case=True),
+                   number=10), baseline)
+
+
+if __name__ == '__main__':
+    main()
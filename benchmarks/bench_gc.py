@@ -0,0 +1,85 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Garbage collections and pause times when repeatedly building and dropping
+nested configs, with strong and weak parent references
+"""
+
+from __future__ import print_function
+
+import gc
+import time
+
+from figgis import Config, Field, ListField
+
+
+class Leaf(Config):
+    value = Field(int)
+
+
+class Node(Config):
+    name = Field()
+    leaf = Field(Leaf)
+    leaves = ListField(Leaf)
+
+
+class Tree(Config):
+    nodes = ListField(Node)
+
+
+DATA = {'nodes': [{'name': 'node{0}'.format(i),
+                   'leaf': {'value': i},
+                   'leaves': [{'value': j} for j in range(5)]}
+                  for i in range(50)]}
+
+
+class GCMonitor(object):
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pauses = []
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        else:
+            self.collections[info['generation']] += 1
+            self.pauses.append(time.perf_counter() - self._start)
+
+
+def run(build, iterations=500):
+    gc.collect()
+    monitor = GCMonitor()
+    gc.callbacks.append(monitor)
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            build()
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(monitor)
+
+    # Whatever is left for the collector after the loop
+    leftover = gc.collect()
+    return elapsed, monitor, leftover
+
+
+def main():
+    for label, build in [
+            ('strong parents', lambda: Tree.parse(DATA)),
+            ('weak parents', lambda: Tree.parse(DATA, weak_parents=True)),
+    ]:
+        elapsed, monitor, leftover = run(build)
+        pauses = monitor.pauses or [0]
+        print('{0:<16} total {1:>8.1f} ms  collections (gen0/1/2) {2}  '
+              'gc pause total {3:>6.1f} ms, max {4:>5.2f} ms  '
+              'uncollected objects {5}'.format(
+                  label, elapsed * 1000, '/'.join(map(str, monitor.collections)),
+                  sum(pauses) * 1000, max(pauses) * 1000, leftover))
+
+
+if __name__ == '__main__':
+    main()
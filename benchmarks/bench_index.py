@@ -0,0 +1,56 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Looking up configs in a list by name: a linear scan vs. an indexed ListField
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0)
+
+
+class Catalog(Config):
+    products = ListField(Product)
+
+
+class IndexedCatalog(Config):
+    products = ListField(Product, index='name')
+
+
+def main():
+    data = {'products': [{'name': 'product{0}'.format(i), 'price': i}
+                         for i in range(5000)]}
+    names = ['product{0}'.format(i) for i in range(0, 5000, 50)]
+
+    baseline = best_of(lambda: Catalog(data))
+    report('Catalog(data)', baseline)
+    report('IndexedCatalog(data)', best_of(lambda: IndexedCatalog(data)),
+           baseline)
+
+    catalog, indexed = Catalog(data), IndexedCatalog(data)
+
+    def scan():
+        for name in names:
+            next(product for product in catalog.products
+                 if product.name == name)
+
+    def lookup():
+        for name in names:
+            indexed.products.by_name[name]
+
+    baseline = best_of(scan)
+    report('{0} lookups by scan'.format(len(names)), baseline)
+    report('{0} lookups by index'.format(len(names)),
+           best_of(lookup, number=100) / 100, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Memory used by a repetitive inventory, with and without interning
+"""
+
+from __future__ import print_function
+
+import gc
+import json
+import random
+import tracemalloc
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Address(Config):
+    street = Field(required=True)
+    city = Field(required=True)
+    country = Field(default='US')
+
+
+class Supplier(Config):
+    name = Field(required=True)
+    address = Field(Address, required=True)
+
+
+class Item(Config):
+    sku = Field(required=True)
+    category = Field(required=True)
+    warehouse = Field(Address, required=True)
+    supplier = Field(Supplier)
+    tags = ListField()
+
+
+class Inventory(Config):
+    items = ListField(Item)
+
+
+def make_data(size=20000):
+    rng = random.Random(0)
+    addresses = [{'street': '{0} Main St.'.format(i), 'city': 'City{0}'.format(i)}
+                 for i in range(10)]
+    suppliers = [{'name': 'Supplier{0}'.format(i), 'address': rng.choice(addresses)}
+                 for i in range(20)]
+    items = [{'sku': 'SKU{0}'.format(i),
+              'category': rng.choice(['food', 'toys', 'tools', 'garden']),
+              'warehouse': rng.choice(addresses),
+              'supplier': rng.choice(suppliers),
+              'tags': rng.sample(['new', 'sale', 'bulk', 'fragile'], 2)}
+             for i in range(size)]
+
+    # Round-trip through json so that equal strings are separate objects, as
+    # they would be when read from a file
+    return json.loads(json.dumps({'items': items}))
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    data = make_data()
+
+    _, size = measure(lambda: Inventory(data))
+    _, interned = measure(lambda: Inventory.parse(data, intern=True))
+    print('plain:    {0:>8.1f} MiB'.format(size / 2.0 ** 20))
+    print('interned: {0:>8.1f} MiB'.format(interned / 2.0 ** 20))
+
+    baseline = best_of(lambda: Inventory(data), repeat=3)
+    report('Inventory(data)', baseline)
+    report('Inventory.parse(data, intern=True)',
+           best_of(lambda: Inventory.parse(data, intern=True), repeat=3), baseline)
+
+
+if __name__ == '__main__':
+    main()
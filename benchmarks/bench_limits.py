@@ -0,0 +1,52 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Parse limits: the time to reject an oversized payload, and the overhead of
+checking limits on a well-formed one
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField, LimitExceededError
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0)
+
+
+class Catalog(Config):
+    name = Field(required=True)
+    products = ListField(Product)
+
+
+def main():
+    hostile = {'name': 'catalog',
+               'products': [{'name': 'product'}] * 200000}
+    limits = {'max_depth': 4, 'max_list_length': 10000, 'max_values': 50000,
+              'time_budget': 0.5}
+
+    def rejected():
+        try:
+            Catalog.parse(hostile, **limits)
+        except LimitExceededError:
+            pass
+
+    baseline = best_of(lambda: Catalog.parse(hostile), repeat=3)
+    report('oversized payload', baseline)
+    report('oversized payload, with limits', best_of(rejected), baseline)
+
+    data = {'name': 'catalog',
+            'products': [{'name': 'product{0}'.format(i), 'price': i}
+                         for i in range(10000)]}
+    baseline = best_of(lambda: Catalog.parse(data))
+    report('well-formed payload', baseline)
+    report('well-formed payload, with limits',
+           best_of(lambda: Catalog.parse(data, **limits)), baseline)
+
+
+if __name__ == '__main__':
+    main()
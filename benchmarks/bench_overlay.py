@@ -0,0 +1,45 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Per-request overrides of a large shared config: deep copy vs. overlay
+"""
+
+from __future__ import print_function
+
+from copy import deepcopy
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Backend(Config):
+    host = Field(required=True)
+    port = Field(int, default=80)
+    weight = Field(float, default=1.0)
+
+
+class Service(Config):
+    name = Field(required=True)
+    timeout = Field(float, default=1.0)
+    backends = ListField(Backend)
+
+
+def main():
+    shared = Service(
+        name='service',
+        backends=[{'host': 'host{0}'.format(i), 'port': i} for i in range(1000)])
+
+    def copy():
+        copied = deepcopy(shared)
+        copied.update(timeout=2.5)
+        return copied
+
+    baseline = best_of(copy, number=10)
+    report('deepcopy + update', baseline)
+    report('overlay', best_of(lambda: shared.overlay(timeout=2.5), number=1000), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Read deeply nested values: a generic path walker vs. Config.get_path
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Address(Config):
+    host = Field(required=True)
+    port = Field(int, key='listen-port')
+
+
+class Node(Config):
+    address = Field(Address)
+
+
+class Cluster(Config):
+    nodes = ListField(Node)
+
+
+class Fleet(Config):
+    clusters = ListField(Cluster)
+
+
+def walk(config, path):
+    """Follow a dotted path by attribute, key and index on every call"""
+    value = config
+    for part in path.split('.'):
+        if isinstance(value, Config):
+            fields = type(value)._fields
+            name = part if part in fields else next(
+                name for name, field in fields.items() if field.key == part)
+            value = getattr(value, name)
+        else:
+            value = value[int(part)]
+
+    return value
+
+
+def main():
+    fleet = Fleet(clusters=[
+        {'nodes': [{'address': {'host': 'node{0}'.format(i),
+                                'listen-port': 8000 + i}}
+                   for i in range(20)]}
+        for _ in range(10)])
+    paths = ['clusters.{0}.nodes.{1}.address.listen-port'.format(i % 10, i % 20)
+             for i in range(200)]
+
+    baseline = best_of(lambda: [walk(fleet, path) for path in paths],
+                       number=20)
+    report('walk(config, path)', baseline)
+    report('config.get_path(path)',
+           best_of(lambda: [fleet.get_path(path) for path in paths],
+                   number=20),
+           baseline)
+    report('chained attributes',
+           best_of(lambda: [fleet.clusters[i % 10].nodes[i % 20].address.port
+                            for i in range(200)], number=20),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Validate data into plain python data: Config(data).to_dict() vs.
+validate_to_dict
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0, validator=lambda price: price >= 0)
+    tags = ListField(choices=['new', 'sale', 'clearance'])
+    in_stock = Field(bool, default=True)
+
+
+class Catalog(Config):
+    name = Field(required=True)
+    products = ListField(Product)
+
+
+def main():
+    data = {'name': 'catalog',
+            'products': [{'name': 'product{0}'.format(i), 'price': i * 0.5,
+                          'tags': ['new', 'sale']}
+                         for i in range(10000)]}
+
+    baseline = best_of(lambda: Catalog(data).to_dict())
+    report('Catalog(data).to_dict()', baseline)
+    report('Catalog.validate_to_dict(data)',
+           best_of(lambda: Catalog.validate_to_dict(data)), baseline)
+
+    products = data['products']
+    baseline = best_of(lambda: [Product(item).to_dict() for item in products])
+    report('[Product(item).to_dict() ...]', baseline)
+    report('Product.validate_to_dicts(items)',
+           best_of(lambda: Product.validate_to_dicts(products)), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Parse a few fields of a large schema: full parse vs. a projection
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Database(Config):
+    host = Field(required=True)
+    port = Field(int, default=5432)
+    options = Field(dict)
+
+
+Service = type('Service', (Config,), dict(
+    [('setting{0}'.format(i), Field(int, default=i)) for i in range(50)] +
+    [('db', Field(Database, required=True)),
+     ('workers', Field(int, default=1)),
+     ('plugins', ListField(Database))]
+))
+
+
+def main():
+    data = dict(('setting{0}'.format(i), str(i)) for i in range(50))
+    data.update(db={'host': 'localhost', 'port': '5432'}, workers='8',
+                plugins=[{'host': 'plugin{0}'.format(i)} for i in range(200)])
+    only = ['db.host', 'db.port', 'workers']
+
+    baseline = best_of(lambda: Service(data), number=100)
+    report('Service(data)', baseline)
+    report('Service.parse(data, only=...)',
+           best_of(lambda: Service.parse(data, only=only), number=100),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Reject invalid payloads: formatted errors vs. lazy errors vs. is_valid
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField, ValidationError, PropertyError
+from figgis import Range
+from benchmarks.common import best_of, report
+
+
+class Item(Config):
+    __allow_extra__ = False
+
+    sku = Field(required=True)
+    quantity = Field(int, required=True, validator=Range(1, 100))
+
+
+class Order(Config):
+    customer = Field(required=True)
+    items = ListField(Item)
+
+
+def make_payloads(count=2000):
+    payloads = []
+    for i in range(count):
+        items = [{'sku': 'sku{0}'.format(j), 'quantity': j + 1}
+                 for j in range(10)]
+        if i % 4 == 0:
+            del items[-1]['sku']
+        elif i % 4 == 1:
+            items[-1]['coupon'] = 'FREE'
+        elif i % 4 == 2:
+            items[-1]['quantity'] = 1000
+        payloads.append({'customer': 'c{0}'.format(i), 'items': items})
+
+    return payloads
+
+
+def main():
+    payloads = make_payloads()
+
+    def construct(format_message):
+        for payload in payloads:
+            try:
+                Order(payload)
+            except (ValidationError, PropertyError) as ex:
+                if format_message:
+                    str(ex)
+
+    baseline = best_of(lambda: construct(True))
+    report('Order(data), str(error)', baseline)
+    report('Order(data)', best_of(lambda: construct(False)), baseline)
+    report('Order.is_valid(data)',
+           best_of(lambda: [Order.is_valid(payload) for payload in payloads]),
+           baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Load a large list: validate every item vs. validate a sample, with cheap
+built-in validators and with an expensive custom validator
+"""
+
+from __future__ import print_function
+
+import hashlib
+
+from figgis import Config, Field, ListField, Sample, Range, Regex
+from benchmarks.common import best_of, report
+
+
+SAMPLE = Sample(head=100, tail=100, size=1000, seed=0)
+
+
+def valid_signature(signature):
+    digest = signature.encode('utf-8')
+    for _ in range(20):
+        digest = hashlib.sha256(digest).digest()
+    return len(digest) == 32
+
+
+class Reading(Config):
+    sensor = Field(required=True, validator=Regex('sensor-[0-9]+'))
+    value = Field(float, validator=Range(-100, 100))
+    status = Field(choices=['ok', 'degraded', 'failed'])
+
+
+class SignedReading(Config):
+    __inherits__ = [Reading]
+
+    signature = Field(validator=valid_signature)
+
+
+def compare(label, item_type, data):
+    full = type('Full', (Config,), {'readings': ListField(item_type)})
+    sampled = type('Sampled', (Config,), {
+        'readings': ListField(item_type, sample=SAMPLE)})
+    ratio = sampled(data).readings.ratio
+
+    baseline = best_of(lambda: full(data), repeat=3)
+    report('{0}, every item'.format(label), baseline)
+    report('{0}, {1:.1%} of items'.format(label, ratio),
+           best_of(lambda: sampled(data), repeat=3), baseline)
+
+
+def main():
+    data = {'readings': [{'sensor': 'sensor-{0}'.format(i % 100),
+                          'value': (i % 200) - 100.0, 'status': 'ok',
+                          'signature': 'sig{0}'.format(i)}
+                         for i in range(50000)]}
+
+    compare('built-in validators', Reading, data)
+    compare('signature validator', SignedReading, data)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Reload data produced by to_dict: full normalization vs. from_trusted
+"""
+
+from __future__ import print_function
+
+from figgis import Config, Field, ListField
+from benchmarks.common import best_of, report
+
+
+class Product(Config):
+    name = Field(required=True)
+    price = Field(float, default=0.0, validator=lambda price: price >= 0)
+    tags = ListField(choices=['new', 'sale', 'clearance'])
+    in_stock = Field(bool, default=True)
+
+
+class Catalog(Config):
+    name = Field(required=True)
+    products = ListField(Product)
+
+
+def main():
+    data = Catalog(
+        name='catalog',
+        products=[{'name': 'product{0}'.format(i), 'price': i * 0.5,
+                   'tags': ['new', 'sale']}
+                  for i in range(10000)]
+    ).to_dict()
+    fingerprint = Catalog.fingerprint()
+
+    baseline = best_of(lambda: Catalog(data))
+    report('Catalog(data)', baseline)
+    report('Catalog.from_trusted(data)',
+           best_of(lambda: Catalog.from_trusted(data, fingerprint)), baseline)
+
+
+if __name__ == '__main__':
+    main()
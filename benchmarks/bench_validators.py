@@ -0,0 +1,68 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Validation of a field with several validators: one try/except per validator
+vs. the compiled pipeline, and lambdas vs. the built-in validators
+"""
+
+from __future__ import print_function
+
+import re
+
+from figgis import Field, ValidationError, Range, Length, Regex
+from benchmarks.common import best_of, report
+
+
+NAME = re.compile('[a-z]+[0-9]*$')
+
+LAMBDAS = [
+    lambda value: 0 < len(value) <= 32,
+    lambda value: NAME.match(value) is not None,
+    lambda value: value != 'root',
+]
+
+BUILTINS = [Length(1, 32), Regex('[a-z]+[0-9]*'), lambda value: value != 'root']
+
+VALUES = ['user{0}'.format(i) for i in range(10000)]
+
+
+def legacy(validators, value, prefixed):
+    """The original validation loop, for comparison"""
+    for validator in validators:
+        try:
+            if not validator(value):
+                raise ValidationError("Field '{0}' is invalid".format(prefixed))
+        except ValidationError as ex:
+            raise ValidationError("Field '{0}' is invalid: {1}".format(prefixed, ex))
+
+
+def main():
+    field = Field(validator=LAMBDAS)
+    builtin = Field(validator=BUILTINS)
+
+    def run_legacy():
+        for value in VALUES:
+            legacy(field.validators, value, 'name')
+
+    def run(field):
+        validate = field.validate
+        for value in VALUES:
+            validate(value, 'name', True)
+
+    baseline = best_of(run_legacy)
+    report('per-validator try/except', baseline)
+    report('compiled pipeline (lambdas)', best_of(lambda: run(field)), baseline)
+    report('compiled pipeline (built-ins)', best_of(lambda: run(builtin)), baseline)
+
+    ranged = Field(int, validator=Range(0, 100))
+    lambda_range = Field(int, validator=lambda value: 0 <= value <= 100)
+    numbers = list(range(100)) * 100
+    baseline = best_of(lambda: [lambda_range.validate(n, 'n', True) for n in numbers])
+    report('range lambda', baseline)
+    report('Range', best_of(lambda: [ranged.validate(n, 'n', True) for n in numbers]), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Helpers shared by the benchmark scripts.  Run a benchmark from the repository
+root with e.g. `python -m benchmarks.bench_choices`.
+"""
+
+from __future__ import print_function
+
+import timeit
+
+
+def best_of(func, number=1, repeat=5):
+    """Return the best time, in seconds, of `repeat` runs of `number` calls"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(label, seconds, baseline=None):
+    """Print a single benchmark result, optionally relative to a baseline"""
+    line = '{0:<40} {1:>10.3f} ms'.format(label, seconds * 1000)
+    if baseline:
+        line += '  ({0:.2f}x)'.format(baseline / seconds)
+
+    print(line)
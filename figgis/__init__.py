@@ -3,13 +3,50 @@
 # file for terms.
 
 import figgis._version as version
+from copy import copy, deepcopy
 from inspect import isclass, isfunction
+from operator import attrgetter, itemgetter
+from multiprocessing.pool import ThreadPool
+from types import GeneratorType
+from six.moves import cPickle as pickle
+import array
+import hashlib
+import json
+import random
+import re
 import six
+import sys
+import tempfile
+import threading
+import weakref
+
+from six.moves import intern as _intern
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # pragma: no cover
+    from collections import MutableMapping
+
+try:
+    from time import monotonic as _monotonic, process_time as _process_time
+except ImportError:  # pragma: no cover
+    from time import time as _monotonic, clock as _process_time
+
+try:
+    from types import MappingProxyType as _read_only
+except ImportError:  # pragma: no cover
+    def _read_only(mapping):
+        return mapping
 
 __version_info__ = version.__version_info__
 __version__ = version.__version__
 
-__all__ = ['Field', 'ListField', 'Config', 'ValidationError', 'PropertyError']
+__all__ = ['Field', 'ListField', 'Config', 'SpilledList', 'ColumnarList',
+           'ValidationError', 'PropertyError', 'FingerprintError',
+           'FrozenConfigError', 'ReadOnlyListError', 'ProjectionError',
+           'LimitExceededError',
+           'Range', 'Length',
+           'Regex', 'Sample', 'SampledList', 'IndexedList', 'Validation']
 
 
 if six.PY3:  # pragma: no cover
@@ -20,8 +57,28 @@ _TRUTHY = frozenset((long(1), 1, 'true', 'True', 'yes', '1', True))
 _FALSEY = frozenset((long(0), 0, 'false', 'False', 'no', '0', False))
 
 
+# JSON schema types for built-in python types
+_JSON_TYPES = {
+    bool: 'boolean',
+    int: 'integer',
+    long: 'integer',
+    float: 'number',
+    str: 'string',
+    six.text_type: 'string',
+    dict: 'object',
+    list: 'array',
+    tuple: 'array',
+}
+
+_JSON_SCHEMA_VERSION = 'http://json-schema.org/draft-04/schema#'
+
+
 # Reserved field names
-_RESERVED = frozenset(['get', 'update', 'describe', 'copy'])
+_RESERVED = frozenset([
+    'get', 'update', 'describe', 'copy', 'fingerprint', 'freeze', 'frozen',
+    'from_flat', 'from_trusted', 'get_path', 'is_valid', 'memory_usage',
+    'overlay', 'parse', 'set_path', 'to_json_schema', 'validate_to_dict',
+    'validate_to_dicts', 'validation'])
 
 
 class _NotSpecified(object):
@@ -35,6 +92,22 @@ class _NotSpecified(object):
 NotSpecified = _NotSpecified()
 
 
+def _sorted_choices(choices):
+    try:
+        return sorted(choices)
+    except TypeError:
+        # Unorderable, e.g. mixed types in python 3
+        return sorted(choices, key=repr)
+
+
+def _type_fingerprint(type_):
+    if isclass(type_) and issubclass(type_, Config):
+        return type_._fingerprint_data()
+
+    return '{0}.{1}'.format(getattr(type_, '__module__', None),
+                            getattr(type_, '__name__', repr(type_)))
+
+
 def indent(value, size=2):
     """Indent a string by a given size (default=2)"""
     lines = value.strip().split('\n')
@@ -46,13 +119,176 @@ class NormalizedDict(dict):
     pass
 
 
+class ProjectedDict(NormalizedDict):
+
+    """
+    Normalized data that only contains the fields of a projection (see
+    :meth:`Config.parse`); getting any other field throws
+    :class:`ProjectionError`
+    """
+
+    def __missing__(self, key):
+        raise ProjectionError('Field {0} is not in the projection'.format(key))
+
+    def get(self, key, default=None):
+        return self[key]
+
+    def copy(self):
+        return ProjectedDict(self)
+
+
+class OverlayDict(MutableMapping):
+
+    """
+    Copy-on-write view of normalized data.  Reads fall through to a shared
+    base mapping, which is never modified; writes only go to the overrides.
+    Values that are read with :meth:`get`, as the fields of a config are, may
+    be changed by the caller, so `own(key, value)` is called to copy any
+    mutable value into the overrides the first time that it is read.
+    """
+
+    def __init__(self, overrides, base, own=None):
+        self._overrides = overrides
+        self._base = base
+        self._own = own
+
+    def __getitem__(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+
+        return self._base[key]
+
+    def get(self, key, default=None):
+        if key in self._overrides:
+            return self._overrides[key]
+        elif key not in self._base:
+            return default
+
+        value = self._base.get(key)
+        if self._own is not None:
+            owned = self._own(key, value)
+            if owned is not value:
+                value = self._overrides[key] = owned
+
+        return value
+
+    def __contains__(self, key):
+        return key in self._overrides or key in self._base
+
+    def __setitem__(self, key, value):
+        self._overrides[key] = value
+
+    def __delitem__(self, key):
+        del self._overrides[key]
+
+    def __iter__(self):
+        # Keys keep the order of the base, e.g. of the config's fields
+        for key in self._base:
+            yield key
+        for key in self._overrides:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return len(self._overrides) + sum(
+            1 for key in self._base if key not in self._overrides)
+
+    def copy(self):
+        return dict(self.items())
+
+
 ######################################################################
 # Errors
 ######################################################################
 
 class FiggisError(Exception):
-    """Base class for figgis exceptions"""
-    pass
+
+    """
+    Base class for figgis exceptions.  Errors thrown while normalizing data
+    also describe the error with a `code` (e.g. `'type'` or `'required'`),
+    the `path` of the field as a tuple, the invalid `value` and the
+    :class:`Field`.  Their messages are only formatted when they are used.
+    Errors are pickled with their message rendered and without the field.
+    """
+
+    # (code, template, params, location, value, field) of lazy errors
+    _details = (None, None, (), None, None, None)
+
+    @classmethod
+    def lazy(cls, code, template, params, location=None, value=None,
+             field=None):
+        """
+        Create an error whose message is `template.format(*params)`.
+        `location` is the dotted path of the field, or a tuple of that path
+        followed by further keys or indices.
+        """
+        error = cls()
+        error._details = (code, template, params, location, value, field)
+        return error
+
+    def __reduce__(self):
+        code, template, params, location, value, field = self._details
+        if template is None:
+            return super(FiggisError, self).__reduce__()
+
+        # Fields can not be pickled, so only keep the rendered message
+        return _lazy_error, (type(self), code, self.message, location, value)
+
+    @property
+    def args(self):
+        if self._details[1] is None:
+            return BaseException.args.__get__(self)
+
+        return (self.message,)
+
+    @args.setter
+    def args(self, args):
+        BaseException.args.__set__(self, args)
+        self._details = (self.code, None, ()) + self._details[3:]
+
+    @property
+    def code(self):
+        return self._details[0]
+
+    @property
+    def value(self):
+        return self._details[4]
+
+    @property
+    def field(self):
+        return self._details[5]
+
+    @property
+    def message(self):
+        template, params = self._details[1:3]
+        if template is not None:
+            return template.format(*params)
+
+        return Exception.__str__(self)
+
+    @property
+    def path(self):
+        location = self._details[3]
+        if location is None:
+            return ()
+        elif not isinstance(location, tuple):
+            location = (location,)
+
+        prefixed, keys = location[0], location[1:]
+        parts = () if prefixed is None else tuple(
+            int(part) if part.isdigit() else part
+            for part in prefixed.split('.'))
+        return parts + keys
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self.message)
+
+
+def _lazy_error(cls, code, message, location, value):
+    return cls.lazy(code, '{0}', (message,), location, value)
 
 
 class ReservedFieldError(TypeError, FiggisError):
@@ -65,10 +301,474 @@ class ValidationError(FiggisError):
 
 
 class PropertyError(KeyError, FiggisError):
+
     """Thrown when a required property is missing"""
+
+    def __str__(self):
+        if self._details[1] is None:
+            return KeyError.__str__(self)
+
+        return repr(self.message)
+
+
+class FingerprintError(ValueError, FiggisError):
+    """Thrown when trusted data was produced by a different schema"""
+    pass
+
+
+class FrozenConfigError(TypeError, FiggisError):
+    """Thrown when attempting to modify a frozen config"""
+    pass
+
+
+class ReadOnlyListError(TypeError, FiggisError):
+    """
+    Thrown when setting an item of a list that can not be changed, e.g. a
+    :class:`SpilledList` or a stream
+    """
+    pass
+
+
+class ProjectionError(PropertyError):
+    """Thrown when getting a field that was not parsed by a projection"""
+    pass
+
+
+class LimitExceededError(ValidationError):
+    """
+    Thrown when data exceeds one of the limits given to :meth:`Config.parse`.
+    The `code` is the name of the limit, e.g. `'max_depth'`.
+    """
+    pass
+
+
+######################################################################
+# Parents
+######################################################################
+
+class _ParentRef(object):
+
+    """
+    Reference to a parent config that is created after its children.  The
+    reference may be weak, so that config trees do not contain cycles and are
+    freed without the help of the garbage collector.
+    """
+
+    __slots__ = ('_target',)
+
+    def __init__(self):
+        self._target = None
+
+    def resolve(self, target, weak=False):
+        self._target = weakref.ref(target) if weak else target
+
+    def __call__(self):
+        target = self._target
+        if isinstance(target, weakref.ref):
+            return target()
+
+        return target
+
+
+class _RowRef(object):
+
+    """
+    Reference to a row of a :class:`ColumnarList`, whose view is created when
+    the reference is resolved
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index, weak=False):
+        self._table = weakref.ref(table) if weak else table
+        self._index = index
+
+    def __call__(self):
+        table = self._table
+        if isinstance(table, weakref.ref):
+            table = table()
+
+        return None if table is None else table._row(self._index)
+
+
+# Types that may be used in place of a parent config
+_PARENT_REFS = (weakref.ref, _ParentRef, _RowRef)
+
+
+def _resolve_parent(parent):
+    if isinstance(parent, _PARENT_REFS):
+        return parent()
+
+    return parent
+
+
+######################################################################
+# Coercion
+######################################################################
+
+class _InvalidType(Exception):
+    """Thrown by a coercer when a value can not be coerced to its type"""
     pass
 
 
+# Single lookup table for boolean coercion
+_BOOLS = dict([(value, True) for value in _TRUTHY] +
+              [(value, False) for value in _FALSEY])
+
+
+def _type_name(type_):
+    return getattr(type_, '__name__', repr(type_))
+
+
+def _coerce_bool(value, prefixed=None, parent=None, context=None):
+    if value is True or value is False:
+        return value
+
+    try:
+        result = _BOOLS.get(value)
+    except TypeError:
+        # Unhashable
+        result = None
+
+    if result is None:
+        raise _InvalidType
+
+    return result
+
+
+def _class_coercer(type_):
+    def coerce(value, prefixed=None, parent=None, context=None):
+        if value.__class__ is type_ or isinstance(value, type_):
+            return value
+
+        try:
+            return type_(value)
+        except (TypeError, ValueError):
+            raise _InvalidType
+
+    return coerce
+
+
+def _config_coercer(type_):
+    def coerce(value, prefixed=None, parent=None, context=None):
+        if isinstance(value, type_):
+            if context is not None and context.plain:
+                return value.to_dict()
+            return value
+        elif not isinstance(value, dict):
+            raise _InvalidType
+
+        elif context is not None:
+            if context.plain:
+                return type_._normalize(value, prefix=prefixed,
+                                        context=context)
+            elif context.intern and not type_._has_streams():
+                # A stream can only be consumed once, so it is never shared
+                return context.intern_config(type_, value, prefixed)
+
+        # The config's children are normalized before it exists, so they
+        # are given a reference that is resolved once it has been created
+        ref = _ParentRef()
+        normalized = type_._normalize(value, prefix=prefixed, parent=ref,
+                                      context=context)
+        config = type_(normalized, __parent=parent)
+        ref.resolve(config, weak=context is not None and context.weak_parents)
+        return config
+
+    return coerce
+
+
+def _function_coercer(type_):
+    def coerce(value, prefixed=None, parent=None, context=None):
+        # Assume data parsed by custom functions is valid, i.e. exceptions are
+        # not type errors
+        return type_(value)
+
+    return coerce
+
+
+def _callable_coercer(type_):
+    def coerce(value, prefixed=None, parent=None, context=None):
+        try:
+            return type_(value)
+        except (TypeError, ValueError):
+            raise _InvalidType
+
+    return coerce
+
+
+def _make_coercer(type_):
+    """
+    Return a function `coerce(value, prefixed=None, parent=None, context=None)`
+    that
+    converts a non-null value to `type_`, specialized for the kind of type,
+    along with `True` if the coercer needs the value's prefix (i.e. for nested
+    :class:`Config` types), or `False` otherwise.  The coercer throws
+    :class:`_InvalidType` if the value is not of the given type.
+    """
+    if type_ is bool:
+        return _coerce_bool, False
+    elif isclass(type_) and issubclass(type_, Config):
+        return _config_coercer(type_), True
+    elif isclass(type_) or isinstance(type_, type):
+        return _class_coercer(type_), False
+    elif isfunction(type_):
+        return _function_coercer(type_), False
+
+    return _callable_coercer(type_), False
+
+
+######################################################################
+# Validators
+######################################################################
+
+#: Cost of validators that do not have a `cost` attribute.  Validators are run
+#: in order of increasing cost, so that cheap checks reject invalid data before
+#: expensive ones are run.
+DEFAULT_COST = 100
+
+
+def validator_cost(validator):
+    return getattr(validator, 'cost', DEFAULT_COST)
+
+
+def compile_validators(validators):
+    """
+    Combine a list of validators into a single function that returns a false
+    value or throws :class:`ValidationError` if any validator fails, or returns
+    a true value otherwise.  Returns `None` if there are no validators.
+    """
+    # Built-in validators provide a plain function that is cheaper to call
+    validators = tuple(getattr(validator, 'compiled', validator)
+                       for validator in validators)
+
+    if not validators:
+        return None
+    elif len(validators) == 1:
+        return validators[0]
+    elif len(validators) == 2:
+        first, second = validators
+        return lambda value: first(value) and second(value)
+    elif len(validators) == 3:
+        first, second, third = validators
+        return lambda value: first(value) and second(value) and third(value)
+
+    def validate(value):
+        for validator in validators:
+            if not validator(value):
+                return False
+
+        return True
+
+    return validate
+
+
+def _bounds_check(lo, hi, exclusive):
+    """Return a function that compares a value to bounds, either of which may
+    be `None`"""
+    if exclusive:
+        if hi is None:
+            return lambda value: lo < value
+        elif lo is None:
+            return lambda value: value < hi
+
+        return lambda value: lo < value < hi
+
+    if hi is None:
+        return lambda value: lo <= value
+    elif lo is None:
+        return lambda value: value <= hi
+
+    return lambda value: lo <= value <= hi
+
+
+class Range(object):
+
+    """
+    Validator that checks that a value lies between `min` and `max`
+    (inclusive, unless `exclusive` is `True`).  Either bound may be omitted.
+    Values that can not be compared to the bounds are invalid.
+
+    >>> class Server(Config):
+    ...     port = Field(int, validator=Range(1, 65535))
+    >>> Server(port=0)
+    Traceback (most recent call last):
+        ...
+    figgis.ValidationError: Field 'port' is invalid: Value 0 is not in [1, 65535]
+    """
+
+    cost = 1
+
+    def __init__(self, min=None, max=None, exclusive=False):
+        if min is None and max is None:
+            raise ValueError('At least one of min and max is required')
+
+        self.min, self.max, self.exclusive = min, max, exclusive
+        if min is None:
+            self.description = '{0} {1}'.format(
+                'less than' if exclusive else 'at most', max)
+        elif max is None:
+            self.description = '{0} {1}'.format(
+                'greater than' if exclusive else 'at least', min)
+        else:
+            self.description = 'in {0}{1}, {2}{3}'.format(
+                '(' if exclusive else '[', min, max, ')' if exclusive else ']')
+
+        self.compiled = self.compile(_bounds_check(min, max, exclusive))
+
+    def compile(self, check):
+        description = self.description
+
+        def validate(value):
+            try:
+                if value is None or check(value):
+                    return True
+            except TypeError:
+                pass
+
+            raise ValidationError.lazy('range', 'Value {0!r} is not {1}',
+                                       (value, description), value=value)
+
+        return validate
+
+    def __call__(self, value):
+        return self.compiled(value)
+
+
+class Length(Range):
+
+    """
+    Validator that checks that the length of a value (e.g. a string or list)
+    lies between `min` and `max`, inclusive.  Either bound may be omitted.
+    Values without a length are invalid.
+    """
+
+    def __init__(self, min=None, max=None):
+        super(Length, self).__init__(min, max)
+
+    def compile(self, check):
+        description = self.description
+
+        def validate(value):
+            if value is None:
+                return True
+
+            try:
+                length = len(value)
+            except TypeError:
+                length = None
+
+            if length is None:
+                raise ValidationError.lazy('length', 'Value {0!r} has no length',
+                                           (value,), value=value)
+            elif check(length):
+                return True
+
+            raise ValidationError.lazy('length', 'Length {0} is not {1}',
+                                       (length, description), value=value)
+
+        return validate
+
+
+class Regex(object):
+
+    """
+    Validator that checks that an entire string matches a regular expression,
+    which is compiled only once.  Values that are not strings are invalid.
+
+    >>> class User(Config):
+    ...     name = Field(validator=Regex('[a-z_][a-z0-9_]*'))
+    >>> User(name='root').name
+    'root'
+    """
+
+    cost = 10
+
+    def __init__(self, pattern, flags=0):
+        if hasattr(pattern, 'pattern'):
+            pattern, flags = pattern.pattern, pattern.flags | flags
+
+        self.pattern = pattern
+        match = re.compile(r'(?:{0})\Z'.format(pattern), flags).match
+
+        def validate(value):
+            try:
+                if value is None or match(value) is not None:
+                    return True
+            except TypeError:
+                pass
+
+            raise ValidationError.lazy('pattern',
+                                       "Value {0!r} does not match '{1}'",
+                                       (value, pattern), value=value)
+
+        self.compiled = validate
+
+    def __call__(self, value):
+        return self.compiled(value)
+
+
+######################################################################
+# Defaults
+######################################################################
+
+_IMMUTABLE = (type(None), bool, float, complex, frozenset, six.binary_type,
+              six.text_type) + six.integer_types + six.string_types
+
+
+def _immutable(value):
+    """Return `True` if a value, and everything it contains, is immutable"""
+    if type(value) is tuple:
+        return all(_immutable(item) for item in value)
+
+    return isinstance(value, _IMMUTABLE)
+
+
+def _copy_data(value):
+    """Copy the dicts, lists and sets of json-like data, sharing other values"""
+    if type(value) is dict:
+        return dict((key, _copy_data(item)) for key, item in value.items())
+    elif type(value) is list:
+        return [_copy_data(item) for item in value]
+    elif type(value) is set:
+        return set(value)
+
+    return value
+
+
+def _shared_mutable(value):
+    """Return whether a normalized value could be changed through a field"""
+    if isinstance(value, (Config, IndexedList, ColumnarList)):
+        return not value._frozen
+
+    return type(value) in (list, dict, set, SampledList)
+
+
+def _plain_value(value):
+    """Convert a normalized value to plain data, as in :meth:`Config.to_dict`"""
+    if isinstance(value, Config):
+        return value.to_dict()
+    elif isinstance(value, _FrozenList):
+        return [_plain_value(item) for item in value]
+    elif isinstance(value, _FrozenDict):
+        return dict((key, _plain_value(item)) for key, item in value.items())
+    elif isinstance(value, (IndexedList, SpilledList)):
+        # Even without configs, these are not plain lists
+        return [item.to_dict() if isinstance(item, Config) else item
+                for item in value]
+    elif (isinstance(value, (list, tuple)) and
+            any(isinstance(item, Config) for item in value)):
+        return [item.to_dict() if isinstance(item, Config) else item
+                for item in value]
+    elif isinstance(value, ColumnarList):
+        return value.to_list()
+    elif isinstance(value, GeneratorType):
+        return (item.to_dict() if isinstance(item, Config) else item
+                for item in value)
+
+    return value
+
+
 ######################################################################
 # Configuration
 ######################################################################
@@ -125,7 +825,8 @@ class Field(object):
                  **kwargs):
         """
         Field(*types, type=None, required=False, default=NotSpecified, \
-validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
+default_factory=None, validator=None, choices=None, help=None, hidden=None, \
+key=None, nullable=True)
 
         :param types: One or more types or functions to apply, in order, to
                       the field value.
@@ -134,7 +835,14 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
                      produces the desired result. May not be used with `types`
         :param required: If `True`, throw an exception if the data does not
                          exist
-        :param default: Default value to use if the data does not exist
+        :param default: Default value to use if the data does not exist.  If
+                        the field's types are all classes, the default is
+                        normalized and validated only once, and each config
+                        gets its own copy of mutable values.
+        :param default_factory: Function, taking no arguments, that returns
+                                the default value.  It is called, and its
+                                result normalized, whenever the data does not
+                                exist.  May not be used with `default`
         :param nullable: If `True`, then allow the field value to be null
         :param choices: List of values that constrain the possible data values
         :param key: The key in the data that should be read to produce this
@@ -143,7 +851,9 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
         :param validator: Either function or a list of functions,
                           taking the parsed field data, that either returns
                           `False` or throws :class:`ValidationError` if the
-                          data is invalid, or returns `True` otherwise
+                          data is invalid, or returns `True` otherwise.
+                          Validators with a lower `cost` attribute (see
+                          :data:`DEFAULT_COST`) are run first.
         :param hidden: Hide this field from the output of
                        :meth:`Config.describe`
         """
@@ -153,12 +863,18 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
 
         self._required = bool(kwargs.get('required', False))
         self._default = kwargs.get('default', NotSpecified)
+        self._default_factory = kwargs.get('default_factory', None)
         self._help = kwargs.get('help', None)
         self._hidden = bool(kwargs.get('hidden', False))
         self._key = kwargs.get('key', None)
         self._nullable = bool(kwargs.get('nullable', True))
         self._read_only = bool(kwargs.get('read_only', True))
 
+        if (self._default_factory is not None and
+                self._default is not NotSpecified):
+            raise ValueError("Keyword arguments 'default' and "
+                             "'default_factory' are mutually exclusive")
+
         if types and type_:
             raise ValueError("Keyword argument 'type' is not allowed with "
                              "one or more positional arguments")
@@ -171,11 +887,25 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
             validator = [] if validator is None else [validator]
 
         self._types = types
-        self._choices = set(choices) if choices else None
+        self._choices = frozenset(choices) if choices else None
+
+        # Dispatch table of specialized coercers, in the same order as types
+        self._coercers = [(type_,) + _make_coercer(type_) for type_ in types]
+
+        # Config type of the normalized value, if any
+        last = types[-1]
+        self._config_type = (last if isclass(last) and issubclass(last, Config)
+                             else None)
+
+        # Normalized value of a missing field, as (kind, data), once the
+        # default has been normalized and validated (see default_value)
+        self._prepared_default = None
 
         # Has to be done after all other options are set so that
         # base_validators can correctly create validators from field options
-        self._validators = list(validator) + self.base_validators()
+        self._validators = sorted(list(validator) + self.base_validators(),
+                                  key=validator_cost)
+        self._validate = compile_validators(self._validators)
 
     def base_validators(self):
         validators = []
@@ -186,11 +916,14 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
 
     def choice_validator(self, value):
         if value not in self.choices:
-            raise ValidationError("Value '{0}' is not a valid choice".format(
-                value))
+            raise ValidationError.lazy('choice',
+                                       "Value '{0}' is not a valid choice",
+                                       (value,), value=value)
 
         return True
 
+    choice_validator.cost = 0
+
     @property
     def read_only(self):
         return self._read_only
@@ -224,6 +957,53 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
     def default(self):
         return self._default
 
+    @property
+    def default_factory(self):
+        return self._default_factory
+
+    @property
+    def prepares_default(self):
+        """
+        `True` if the normalized default can be reused, i.e. all of the field's
+        types are classes, which are assumed to have no side effects, and the
+        defaults of a nested config can be reused too
+        """
+        return (self._default_factory is None and
+                all(isclass(type_) for type_ in self.types) and
+                (self._config_type is None or
+                 self._config_type._shares_defaults()))
+
+    def prepare_default(self, normalized):
+        """Save the normalized and validated value of a missing field"""
+        if _immutable(normalized):
+            self._prepared_default = ('shared', normalized)
+        elif self._config_type is not None:
+            self._prepared_default = ('config', _plain_value(normalized))
+        else:
+            self._prepared_default = ('data', _copy_data(normalized))
+
+    def default_value(self, parent=None, context=None, name=None):
+        """
+        Return a new copy of the normalized value of a missing field, or
+        `NotSpecified` if the default has not been prepared
+        """
+        prepared = self._prepared_default
+        if prepared is None:
+            return NotSpecified
+
+        kind, data = prepared
+        if kind == 'shared':
+            return data
+        elif kind == 'data':
+            return _copy_data(data)
+        elif context is None:
+            return self.from_trusted(_copy_data(data), parent, name)
+        elif context.plain and context.projection is None:
+            return _copy_data(data)
+
+        # Nested configs depend on the parse options
+        return NotSpecified
+
     @property
     def validators(self):
         return self._validators
@@ -236,6 +1016,15 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
     def help(self):
         return self._help
 
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def config_type(self):
+        """The :class:`Config` type of the normalized value, or `None`"""
+        return self._config_type
+
     @property
     def hidden(self):
         return self._hidden
@@ -246,6 +1035,9 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
             props.append('required')
         if self.default is not NotSpecified:
             props.append('default={0}'.format(self.default))
+        elif self.default_factory is not None:
+            props.append('default_factory={0}'.format(
+                _type_name(self.default_factory)))
         if not self.nullable:
             props.append('non-nullable')
         if self.choices:
@@ -275,18 +1067,73 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
 
         return desc
 
+    def json_schema_type(self):
+        """
+        Return the JSON schema for a single value of this field, without any
+        field options applied
+        """
+        type_ = self.types[0]
+        if isclass(type_) and issubclass(type_, Config):
+            return dict(type_._json_schema())
+        elif type_ in _JSON_TYPES:
+            return {'type': _JSON_TYPES[type_]}
+
+        # Functions may accept anything
+        return {}
+
+    def json_schema(self):
+        """Return the JSON schema for this field"""
+        schema = self.json_schema_type()
+        if self.nullable and 'type' in schema:
+            schema['type'] = [schema['type'], 'null']
+        if self.choices and len(self.types) == 1:
+            schema['enum'] = _sorted_choices(self.choices)
+        if self.default is not NotSpecified:
+            schema['default'] = self.default
+        if self.help:
+            schema['description'] = self.help
+
+        return schema
+
+    def fingerprint_data(self):
+        """Return JSON-serializable data that identifies this field's schema"""
+        return [
+            type(self).__name__,
+            self.key,
+            [_type_fingerprint(type_) for type_ in self.types],
+            self.required,
+            self.nullable,
+            repr(self.default) if self.default_factory is None else
+            'default_factory={0}'.format(_type_name(self.default_factory)),
+            [repr(choice) for choice in _sorted_choices(self.choices or ())],
+            len(self.validators),
+        ]
+
+    def from_trusted(self, value, parent=None, name=None):
+        """
+        Build the value of the field with the given name from trusted, already
+        normalized data (see :meth:`Config.from_trusted`)
+        """
+        if self._config_type is not None and isinstance(value, dict):
+            return self._config_type._from_trusted(value, parent=parent)
+
+        return value
+
     def validate(self, normalized, prefixed, exists):
-        if not (exists and self.validators):
+        if not exists or self._validate is None:
             return
 
-        for validator in self.validators:
-            try:
-                if not validator(normalized):
-                    raise ValidationError("Field '{0}' is invalid".format(
-                        prefixed))
-            except ValidationError as ex:
-                raise ValidationError("Field '{0}' is invalid: {1}".format(
-                    prefixed, ex))
+        try:
+            valid = self._validate(normalized)
+        except ValidationError as ex:
+            raise ValidationError.lazy(
+                ex.code or 'invalid', "Field '{0}' is invalid: {1}",
+                (prefixed, ex), prefixed,
+                normalized if ex.value is None else ex.value, self)
+
+        if not valid:
+            raise ValidationError.lazy('invalid', "Field '{0}' is invalid",
+                                       (prefixed,), prefixed, normalized, self)
 
     def coerce_bool(self, value):
         if value in _TRUTHY:
@@ -320,47 +1167,154 @@ validator=None, choices=None, help=None, hidden=None, key=None, nullable=True)
         else:
             try:
                 # Attempt to coerce value
-                self.coerce(value, type_)
+                self.coercer(type_)[0](value)
                 return False
-            except (TypeError, ValueError):
+            except _InvalidType:
                 return True
 
-    def normalize(self, config, name, prefix=None, parent=None):
+    def normalize(self, config, name, prefix=None, parent=None, context=None):
         config_key = self._key or name
 
         prefixed = name if prefix is None else '{0}.{1}'.format(prefix, name)
         if config_key not in config:
             if self.required:
-                raise PropertyError('Missing property: {0}'.format(prefixed))
-
-            exists = self.default is not NotSpecified
-            conf_value = None if self.default is NotSpecified else self.default
+                raise PropertyError.lazy('required', 'Missing property: {0}',
+                                         (prefixed,), prefixed, field=self)
+
+            normalized = self.default_value(parent, context, name)
+            if normalized is not NotSpecified:
+                if context is not None and context.intern:
+                    normalized = context.intern_value(normalized)
+                return name, normalized
+            elif self.default_factory is not None:
+                exists = True
+                conf_value = self.default_factory()
+            elif context is None and self.prepares_default:
+                exists = self.default is not NotSpecified
+                normalized = self.normalize_value(
+                    self.default if exists else None, name, prefixed,
+                    parent=parent)
+                self.validate(normalized, prefixed, exists)
+
+                # Give even the first config its own copy of the default
+                self.prepare_default(normalized)
+                return name, self.default_value(parent, name=name)
+            else:
+                exists = self.default is not NotSpecified
+                conf_value = None if not exists else self.default
         else:
             exists = True
             conf_value = config[config_key]
 
-        normalized = conf_value
-        for type_ in self.types:
-            normalized = self.normalize_field(type_, normalized, name,
-                                              prefixed, parent=parent)
+        normalized = self.normalize_value(conf_value, name, prefixed,
+                                          parent=parent, context=context)
+        if context is not None:
+            if context.intern:
+                normalized = context.intern_value(normalized)
+            if not context.validate:
+                return name, normalized
+            if context.deferred is not None:
+                context.deferred.append(
+                    (self, normalized, prefixed, exists, parent))
+                return name, normalized
+            if context.plain and self._config_type is not None:
+                # Validators expect configs, not plain data
+                if self._validate is not None and exists:
+                    self.validate(self.from_trusted(normalized), prefixed,
+                                  exists)
+                return name, normalized
 
         self.validate(normalized, prefixed, exists)
 
         return name, normalized
 
-    def normalize_field(self, type_, field_value, name, prefixed, parent=None):
-        if self.invalid_type(type_, field_value, prefixed):
-            raise ValidationError('Property {0} is not of type {1}'.format(
-                prefixed, type_.__name__))
+    def normalize_value(self, value, name, prefixed, parent=None,
+                        context=None):
+        """Apply each of the field's types, in order, to a value"""
+        for type_ in self.types:
+            value = self.normalize_field(type_, value, name, prefixed,
+                                         parent=parent, context=context)
+
+        return value
+
+    def coercer(self, type_):
+        """
+        Return the specialized coercer for one of the field's types, and
+        whether it needs the value's prefix
+        """
+        for known, coerce, nested in self._coercers:
+            if known is type_:
+                return coerce, nested
+
+        return _make_coercer(type_)
 
+    def normalize_field(self, type_, field_value, name, prefixed, parent=None,
+                        context=None):
         if field_value is None:
+            if not self.nullable:
+                raise self.type_error(type_, field_value, prefixed)
+
             return None
 
-        if isclass(type_) and issubclass(type_, Config):
-            normalized = type_._normalize(field_value, prefix=prefixed)
-            return self.coerce(normalized, type_, parent=parent)
-        else:
-            return self.coerce(field_value, type_)
+        coerce, _ = self.coercer(type_)
+        try:
+            return coerce(field_value, prefixed, parent, context)
+        except _InvalidType:
+            # The coercer's own exception is not of interest
+            six.raise_from(self.type_error(type_, field_value, prefixed), None)
+
+    def type_error(self, type_, value, location):
+        """Return the error for a value that is not of the given type"""
+        return ValidationError.lazy(
+            'type', 'Property {0} is not of type {1}',
+            ('.'.join(str(part) for part in location)
+             if isinstance(location, tuple) else location, _type_name(type_)),
+            location, value, self)
+
+    def list_error(self, value, prefixed):
+        """Return the error for a value that is not a list"""
+        return ValidationError.lazy('list', 'Field {0} is not a list',
+                                    (prefixed,), prefixed, value, self)
+
+
+class Sample(object):
+
+    """
+    Options for a :class:`ListField` that only runs validators (including
+    choices, and those of nested configs) on a sample of its items; every
+    item is still coerced to the field's types.  The sample consists of the
+    first `head` and last `tail` items, every `stride`-th item, and `size`
+    other items chosen at random.  Give a `seed` to choose the same items for
+    lists of the same length every time.
+    """
+
+    def __init__(self, head=0, tail=0, size=0, stride=None, seed=None):
+        if stride is not None and stride < 1:
+            raise ValueError('stride must be positive')
+
+        self.head, self.tail, self.size = head, tail, size
+        self.stride, self.seed = stride, seed
+
+    def indices(self, length):
+        """Return the set of indices to validate in a list of a given length"""
+        head, tail = min(self.head, length), max(length - self.tail, 0)
+        indices = set(range(head))
+        indices.update(range(max(tail, head), length))
+        if self.stride:
+            indices.update(range(0, length, self.stride))
+
+        remaining = [i for i in range(head, tail) if i not in indices] \
+            if self.stride else range(head, tail)
+        size = min(self.size, len(remaining))
+        if size:
+            indices.update(random.Random(self.seed).sample(remaining, size))
+
+        return indices
+
+    def __repr__(self):
+        return 'Sample(head={0}, tail={1}, size={2}, stride={3}, ' \
+            'seed={4})'.format(self.head, self.tail, self.size, self.stride,
+                               self.seed)
 
 
 class ListField(Field):
@@ -384,197 +1338,2808 @@ class ListField(Field):
     ...     print('{0} costs {1}'.format(product.name, product.price))
     Orange costs 0.79
     Apple costs 0.59
+
+    Very large lists need not be held in memory.  With `stream=True`, the
+    field value is an iterator that normalizes and validates each item as it
+    is consumed; errors are raised during iteration rather than when the
+    config is created.  Since the items are never all available at once,
+    `validator` may not be used with `stream`.  The input may be any
+    iterable, e.g. a generator:
+
+    >>> class Import(Config):
+    ...     ids = ListField(int, stream=True)
+    >>> data = Import(ids=(str(i) for i in range(3)))
+    >>> sum(data.ids)
+    3
+
+    With `spill=True`, every item is normalized and validated up front, but
+    the result is a read-only :class:`SpilledList` stored in a temporary file
+    rather than in memory.
+
+    Lists of a nested :class:`Config` may use `columnar=True`, in which case
+    the value is a :class:`ColumnarList` that stores one list per field
+    rather than one object per item, and allows operations on entire columns:
+
+    >>> class Inventory(Config):
+    ...     products = ListField(Product, columnar=True)
+    >>> inventory = Inventory(products=[
+    ...     {'name': 'Orange', 'price': 0.79},
+    ...     {'name': 'Apple', 'price': 0.59},
+    ... ])
+    >>> inventory.products[1].name
+    'Apple'
+    >>> round(sum(inventory.products.column('price')), 2)
+    1.38
+
+    For very large lists from trusted sources, `sample` (see :class:`Sample`)
+    limits validation to some of the items.  The value is a
+    :class:`SampledList`, which records how much of it was validated:
+
+    >>> class Readings(Config):
+    ...     values = ListField(int, choices=[0, 1],
+    ...                        sample=Sample(head=2, tail=2, seed=0))
+    >>> Readings(values=[0, 1, 5, 1, 0]).values.ratio
+    0.8
     """
 
+    def __init__(self, *types, **kwargs):
+        """
+        ListField(*types, stream=False, spill=False, columnar=False, \
+sample=None, index=None, **kwargs)
+
+        Accepts the same arguments as :class:`Field`, plus:
+
+        :param stream: If `True`, the value is an iterator that lazily
+                       normalizes and validates each item
+        :param spill: If `True`, the normalized value is stored in a temporary
+                      file (see :class:`SpilledList`)
+        :param columnar: If `True`, store a list of configs by column (see
+                         :class:`ColumnarList`)
+        :param sample: A :class:`Sample` of the items to validate
+        :param index: The name of a field of the config type, or a list of
+                      names, whose values must be unique in the list.  The
+                      list is an :class:`IndexedList`, which looks up items
+                      by each name, e.g. `by_name`.
+        """
+        # Has to be set before Field.__init__, which calls base_validators
+        self._stream = bool(kwargs.get('stream', False))
+        self._spill = bool(kwargs.get('spill', False))
+        self._columnar = bool(kwargs.get('columnar', False))
+        self._sample = kwargs.get('sample')
+
+        index = kwargs.get('index')
+        if isinstance(index, six.string_types):
+            index = (index,)
+        self._index = tuple(index) if index else None
+
+        if (self._stream + self._spill + self._columnar +
+                (self._sample is not None) + (self._index is not None)) > 1:
+            raise ValueError("Keyword arguments 'stream', 'spill', "
+                             "'columnar', 'sample' and 'index' are mutually "
+                             "exclusive")
+        elif self._stream and kwargs.get('validator') is not None:
+            raise ValueError("Keyword argument 'validator' is not allowed "
+                             "with 'stream'")
+
+        super(ListField, self).__init__(*types, **kwargs)
+
+        if self._columnar and self._config_type is None:
+            raise ValueError("Keyword argument 'columnar' requires a Config "
+                             "type")
+        elif self._index is not None:
+            if self._config_type is None:
+                raise ValueError("Keyword argument 'index' requires a Config "
+                                 "type")
+
+            for name in self._index:
+                if name not in self._config_type._fields:
+                    raise ValueError('Invalid index for {0}: {1}'.format(
+                        self._config_type.__name__, name))
+
+    @property
+    def stream(self):
+        return self._stream
+
+    @property
+    def spill(self):
+        return self._spill
+
+    @property
+    def columnar(self):
+        return self._columnar
+
+    @property
+    def sample(self):
+        return self._sample
+
+    @property
+    def index(self):
+        """The names of the fields by which items are indexed, or `None`"""
+        return self._index
+
+    @property
+    def lazy(self):
+        """`True` if items are normalized one at a time, i.e. not as a list"""
+        return self._stream or self._spill
+
+    @property
+    def prepares_default(self):
+        # Iterators and samples are specific to a single config
+        return (not self.lazy and self._sample is None and
+                super(ListField, self).prepares_default)
+
     @property
     def pretty_type(self):
         return 'list({0})'.format(Field.pretty_type.fget(self))
 
+    def describe_properties(self):
+        props = super(ListField, self).describe_properties()
+        if self.index:
+            props.append('index={0}'.format(','.join(self.index)))
+
+        return props
+
+    def json_schema(self):
+        items = self.json_schema_type()
+        if self.nullable and 'type' in items:
+            items['type'] = [items['type'], 'null']
+        if self.choices and len(self.types) == 1:
+            items['enum'] = _sorted_choices(self.choices)
+
+        # A missing or null list is an empty list, unless there is a default
+        schema = {'type': ['array', 'null'] if self.is_list(None) else 'array',
+                  'items': items}
+        if self.default is not NotSpecified:
+            schema['default'] = self.default
+        if self.help:
+            schema['description'] = self.help
+
+        return schema
+
+    def fingerprint_data(self):
+        return super(ListField, self).fingerprint_data() + [
+            self.stream, self.spill, self.columnar, self.sample is not None]
+
+    def from_trusted(self, value, parent=None, name=None):
+        config_type = self._config_type
+        if self.columnar:
+            table = ColumnarList(config_type, parent=parent)
+            for i, item in enumerate(value or ()):
+                table._append(None if item is None else
+                              config_type._trusted_properties(
+                                  item, _RowRef(table, i)))
+
+            return table.compact()
+        elif self.stream:
+            # Like a normalized stream, configs are created as they are read
+            return (config_type._from_trusted(item, parent=parent)
+                    if config_type is not None and isinstance(item, dict)
+                    else item for item in value or ())
+        elif config_type is None:
+            items = list(value or ())
+        else:
+            items = [config_type._from_trusted(item, parent=parent)
+                     if isinstance(item, dict) else item
+                     for item in value or ()]
+
+        if self.spill:
+            return SpilledList(items, parent=parent)
+        elif self.index:
+            return IndexedList(items, self, name, parent=parent)
+        elif self._sample is not None:
+            return self.sampled_list(items)
+
+        return items
+
+    def sampled_list(self, values):
+        """
+        Return a :class:`SampledList` of values that were already normalized,
+        with the number of items that the sample validates
+        """
+        return SampledList(values, len(self._sample.indices(len(values))))
+
+    def base_validators(self):
+        if self.lazy or self._sample is not None:
+            # Choices are checked item by item in normalize_items, or for the
+            # sampled items in normalize_sampled
+            return []
+
+        return super(ListField, self).base_validators()
+
     def choice_validator(self, values):
-        for value in values:
-            if value not in self.choices:
-                raise ValidationError(
-                    "Value '{0}' is not a valid choice".format(value))
+        invalid = self.invalid_choice(values)
+        if invalid is not None:
+            raise ValidationError.lazy(
+                'choice', "Value '{1}' at index {0} is not a valid choice",
+                invalid, value=invalid[1])
 
         return True
 
+    choice_validator.cost = 0
+
+    def invalid_choice(self, values):
+        """
+        Return a tuple `(index, value)` for the first value that is not a valid
+        choice, or `None` if every value is valid
+        """
+        try:
+            # Set containment is done in C, so the common (valid) case never
+            # has to loop over the values in python
+            if self.choices.issuperset(values):
+                return None
+        except TypeError:
+            # Unhashable values; fall back to checking them one at a time
+            pass
+
+        for index, value in enumerate(values):
+            if value not in self.choices:
+                return index, value
+
+        return None
+
+    def is_exact(self, type_, field_value):
+        """
+        Return `True` if every value is already exactly of type `type_`, in
+        which case coercion would return each value unchanged
+        """
+        if not (isclass(type_) and field_value) or issubclass(type_, Config):
+            return False
+
+        types = set(map(type, field_value))
+        return len(types) == 1 and type_ in types
+
     def is_list(self, field_value):
         if field_value is None:
             return not self.required and self.default is NotSpecified
+        elif self.lazy:
+            return (hasattr(field_value, '__iter__') and
+                    not isinstance(field_value, (six.string_types,
+                                                 six.binary_type, dict)))
+        elif self.columnar and isinstance(field_value, ColumnarList):
+            # The rows of another table, e.g. when a config is copied
+            return field_value.config_type is self._config_type
         else:
             return isinstance(field_value, list)
 
-    def normalize_field(self, type_, field_value, name, prefixed, parent=None):
+    def normalize_value(self, value, name, prefixed, parent=None,
+                        context=None):
+        if (context is not None and context.limits is not None and
+                value is not None):
+            context.limits.add_list(value, prefixed)
+
+        plain = context is not None and context.plain
+        if self.columnar and not plain:
+            return self.normalize_columns(value, name, prefixed,
+                                          parent=parent, context=context)
+        elif self.columnar:
+            # Like the table, apply every type to each row in turn
+            if not self.is_list(value):
+                raise self.list_error(value, prefixed)
+            return list(self.normalize_items(value or (), name, prefixed,
+                                             parent=parent, context=context))
+        elif self._sample is not None:
+            values = self.normalize_sampled(value, name, prefixed,
+                                            parent=parent, context=context)
+            return list(values) if plain else values
+        elif self._index is not None:
+            values = super(ListField, self).normalize_value(
+                value, name, prefixed, parent=parent, context=context)
+            return self.index_values(values, name, prefixed, parent=parent,
+                                     context=context)
+        elif not self.lazy:
+            return super(ListField, self).normalize_value(
+                value, name, prefixed, parent=parent, context=context)
+
+        if not self.is_list(value):
+            raise self.list_error(value, prefixed)
+
+        if self.stream and context is not None:
+            # The items are normalized after the parse, once the context has
+            # moved on
+            context = context.after_parse()
+
+        items = self.normalize_items(value or (), name, prefixed,
+                                     parent=parent, context=context)
+        if self.stream:
+            return items
+        elif plain:
+            return list(items)
+
+        return SpilledList(items, parent=parent)
+
+    def normalize_columns(self, values, name, prefixed, parent=None,
+                          context=None):
+        """Normalize a list of configs into a :class:`ColumnarList`"""
+        if not self.is_list(values):
+            raise self.list_error(values, prefixed)
+
+        table = ColumnarList(self._config_type, parent=parent)
+
+        values = values or ()
+        limits = None if context is None else context.limits
+        if limits is not None and limits.timed:
+            values = limits.checked(values, prefixed)
+
+        for i, value in enumerate(values):
+            table._append(self._normalize_row(table, i, value, name, prefixed,
+                                              context=context))
+
+        return table.compact()
+
+    def _normalize_row(self, table, index, value, name, prefixed,
+                       context=None):
+        """
+        Return the normalized properties of a row of a :class:`ColumnarList`,
+        or `None` for a null row
+        """
+        prefix = '{0}.{1}'.format(prefixed, index)
+        normalize_field = super(ListField, self).normalize_field
+        for type_ in self.types[:-1]:
+            value = normalize_field(type_, value, name, prefix,
+                                    parent=table._parent, context=context)
+
+        config_type = self._config_type
+        if value is None and self.nullable:
+            return None
+        elif isinstance(value, config_type):
+            return value._properties
+        elif isinstance(value, dict):
+            # Nested configs of the row see a view of the row as parent
+            weak = context is not None and context.weak_parents
+            return config_type._normalize(
+                value, prefix=prefix, parent=_RowRef(table, index, weak),
+                context=context)
+
+        raise self.type_error(config_type, value, prefix)
+
+    def normalize_sampled(self, values, name, prefixed, parent=None,
+                          context=None):
+        """
+        Coerce every item of a list, but only validate a sample of them (see
+        :class:`Sample`)
+        """
+        if not self.is_list(values):
+            raise self.list_error(values, prefixed)
+
+        values = list(values or ())
+        sample = self._sample.indices(len(values))
+        unvalidated = (_ParseContext(validate=False) if context is None
+                       else context.unvalidated())
+
+        normalize_field = super(ListField, self).normalize_field
+        for type_ in self.types:
+            if not self.coercer(type_)[1]:
+                values = self.normalize_field(type_, values, name, prefixed,
+                                              parent=parent, context=context)
+                continue
+
+            # Nested configs only run their validators for sampled items
+            values = [normalize_field(type_, value, name,
+                                      '{0}.{1}'.format(prefixed, i),
+                                      parent=parent,
+                                      context=context if i in sample
+                                      else unvalidated)
+                      for i, value in enumerate(values)]
+
+        if self.choices and (context is None or context.validate):
+            for i in sorted(sample):
+                value = values[i]
+                if value not in self.choices:
+                    raise ValidationError.lazy(
+                        'choice', "Field '{0}' is invalid: Value '{1}' at "
+                        "index {2} is not a valid choice", (prefixed, value, i),
+                        '{0}.{1}'.format(prefixed, i), value, self)
+
+        return SampledList(values, len(sample))
+
+    def index_values(self, values, name, prefixed, parent=None,
+                     context=None):
+        """Return an :class:`IndexedList` of the normalized values"""
+        if values is None:
+            return None
+        elif context is not None:
+            projection = context.projection
+            if projection is not None and not all(key in projection
+                                                  for key in self._index):
+                # The indexed fields are not normalized
+                return values
+            elif context.plain:
+                # Only check that the values are unique
+                self.index_changes(values, {}, prefixed)
+                return values
+
+        return IndexedList(values, self, name, prefixed, parent)
+
+    def index_changes(self, items, indexes, prefixed, start=0, replaced=()):
+        """
+        Return the values by which to index items that are added to a list, as
+        `(name, value, item)`, or throw :class:`ValidationError` if an item
+        has the same value as another item, other than the replaced items
+        """
+        changes = []
+        for name in self._index:
+            index, added = indexes.get(name, {}), {}
+            for i, item in enumerate(items, start):
+                if item is None:
+                    continue
+
+                properties = (item._properties if isinstance(item, Config)
+                              else item)
+                value = properties.get(name)
+                if value is None:
+                    continue
+
+                try:
+                    other = added.get(value, index.get(value))
+                except TypeError:
+                    raise ValidationError.lazy(
+                        'invalid', "Field '{0}' is invalid: Value of '{1}' "
+                        "at index {2} can not be indexed", (prefixed, name, i),
+                        (prefixed, i, name), value, self)
+
+                if other is not None and not any(other is item_
+                                                 for item_ in replaced):
+                    raise ValidationError.lazy(
+                        'unique', "Field '{0}' is invalid: Duplicate value "
+                        "'{1}' for '{2}' at index {3}", (prefixed, value, name,
+                                                         i),
+                        (prefixed, i, name), value, self)
+
+                added[value] = item
+                changes.append((name, value, item))
+
+        return changes
+
+    def normalize_items(self, values, name, prefixed, parent=None,
+                        context=None, start=0):
+        """
+        Generate the fully normalized (i.e. all types applied) and validated
+        items of a list, one at a time, numbered from `start`
+        """
+        normalize_field = super(ListField, self).normalize_field
+        limits = None if context is None else context.limits
+        if limits is not None and limits.timed:
+            values = limits.checked(values, prefixed)
+
+        for i, value in enumerate(values, start):
+            prefix = '{0}.{1}'.format(prefixed, i)
+            for type_ in self.types:
+                value = normalize_field(type_, value, name, prefix,
+                                        parent=parent, context=context)
+
+            if (self.choices and value not in self.choices and
+                    (context is None or context.validate)):
+                raise ValidationError.lazy(
+                    'choice', "Field '{0}' is invalid: Value '{1}' at index "
+                    "{2} is not a valid choice", (prefixed, value, i), prefix,
+                    value, self)
+
+            yield value
+
+    def normalize_field(self, type_, field_value, name, prefixed, parent=None,
+                        context=None):
         if not self.is_list(field_value):
-            raise ValidationError('Field {0} is not a list'.format(prefixed))
+            raise self.list_error(field_value, prefixed)
 
         if field_value is None:
             field_value = []
 
+        if self.is_exact(type_, field_value):
+            return list(field_value)
+
+        coerce, nested = self.coercer(type_)
+        if nested:
+            # Nested configs need their prefix for error messages
+            normalize_field = super(ListField, self).normalize_field
+            return [normalize_field(type_, value, name,
+                                    '{0}.{1}'.format(prefixed, i),
+                                    parent=parent, context=context)
+                    for i, value in enumerate(field_value)]
+
+        # Batch coercion; the prefix is only built if there is an error
         values = []
-        for i, value in enumerate(field_value):
-            prefix = '{0}.{1}'.format(prefixed, i)
-            normalized = super(ListField, self).normalize_field(
-                type_, value, name, prefix, parent=parent)
-            values.append(normalized)
+        append = values.append
+        nullable = self.nullable
+        items = field_value
+        limits = None if context is None else context.limits
+        if limits is not None and limits.timed:
+            items = limits.checked(field_value, prefixed)
+        try:
+            for value in items:
+                if value is not None:
+                    append(coerce(value, None, parent, context))
+                elif nullable:
+                    append(None)
+                else:
+                    raise _InvalidType
+        except _InvalidType:
+            six.raise_from(self.type_error(type_, field_value[len(values)],
+                                           (prefixed, len(values))), None)
 
         return values
 
 
-def normalizer(allow_extra=None):
-    if allow_extra is None:
-        allow_extra = True
+class SampledList(list):
 
-    @classmethod
-    def normalize(cls, config, prefix=None, allow_extra=allow_extra, parent=None):
-        extra = frozenset(config) - frozenset(cls._fields)
-        if extra and not allow_extra:
-            raise PropertyError('Encountered unexpected key: {0}{1}'.format(
-                prefix + '.' if prefix else '',
-                six.next(iter(extra))))
+    """
+    List produced by a :class:`ListField` with a :class:`Sample`, of which
+    only `sampled` items were validated when it was normalized
+    """
 
-        return NormalizedDict(
-            field.normalize(config, name, prefix=prefix, parent=parent)
-            for name, field in cls._fields.items())
+    def __init__(self, values=(), sampled=0):
+        super(SampledList, self).__init__(values)
+        self.sampled = sampled
 
-    return normalize
+    @property
+    def ratio(self):
+        """The fraction of the items that were validated"""
+        return float(self.sampled) / len(self) if self else 1.0
 
 
-def autoproperty(key, docstring=None, read_only=True):
-    """
-    Create a property for the given key that retrieves the corresponding value
-    from self._properties
-    """
-    def getter(self):
-        return self._properties.get(key)
+def _frozen(self, *args, **kwargs):
+    raise FrozenConfigError('Config is frozen')
 
-    def setter(self, value):
-        self._properties[key] = value
 
-    return property(getter,
-                    None if read_only else setter,
-                    None,
-                    docstring)
+class _FrozenList(list):
 
+    """List of a frozen config, which throws on any change"""
+
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = reverse = sort = clear = \
+        __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+
+    if six.PY2:  # pragma: no cover
+        __setslice__ = __delslice__ = _frozen
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+class _FrozenSampledList(_FrozenList, SampledList):
+
+    """:class:`SampledList` of a frozen config"""
+
+    def __reduce__(self):
+        return type(self), (list(self), self.sampled)
 
-class ConfigMeta(type):
+
+class _FrozenDict(dict):
+
+    """Dictionary of a frozen config, which throws on any change"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = __ior__ = _frozen
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class IndexedList(list):
 
     """
-    Metaclass for configuration objects.  Do not use this directly; instead,
-    use :class:`Config`.
+    List of configs produced by a :class:`ListField` with `index`, which
+    looks up items by the value of each indexed field, e.g.
+    `config.products.by_name['Orange']`.  Items that are added to the list
+    are normalized and validated.  The indexes are kept up to date by the
+    list's own methods, and when an indexed field of an item is set with
+    :meth:`Config.update`, :meth:`Config.set_path` or attribute assignment.
+    Throws :class:`ValidationError` if two items have the same value for an
+    indexed field, or if the validators of the field, e.g. :class:`Length`,
+    reject the list that a change would produce.
     """
 
-    def __new__(cls, name, bases, dct):
-        # Normalization
-        fields = dict()
+    __slots__ = ('_field', '_name', '_prefix', '_parent', '_indexes',
+                 '_frozen')
+
+    def __init__(self, values=(), field=None, name=None, prefix=None,
+                 parent=None):
+        super(IndexedList, self).__init__(values)
+        self._frozen = False
+        self._field = field
+        self._name = name
+        self._prefix = prefix or name
+        self._parent = parent
+        self._indexes = dict((key, {}) for key in field.index)
+        self._apply(field.index_changes(self, {}, self._prefix))
+
+    def __reduce__(self):
+        owner = _resolve_parent(self._parent)
+        if owner is None or self._name is None:
+            return list, (list(self),)
+
+        # Fields can not be pickled, so find the field by its owner's type
+        return _indexed_list, (list(self), owner, self._name, self._prefix)
+
+    def __getattr__(self, attr):
+        if attr.startswith('by_'):
+            try:
+                return _read_only(self._indexes[attr[3:]])
+            except (AttributeError, KeyError):
+                pass
+
+        raise AttributeError(attr)
+
+    def _apply(self, changes, removed=()):
+        indexes = self._indexes
+        for item in removed:
+            if item is None:
+                continue
+
+            for name, index in indexes.items():
+                value = item._properties.get(name)
+                if value is not None and index.get(value) is item:
+                    del index[value]
+
+        for name, value, item in changes:
+            indexes[name][value] = item
+
+    def _freeze(self):
+        self._frozen = True
+        for item in self:
+            if item is not None:
+                item.freeze()
+
+    def _check_frozen(self):
+        owner = _resolve_parent(self._parent)
+        if self._frozen or (owner is not None and owner._frozen):
+            raise FrozenConfigError('Config is frozen')
+
+    def _normalize(self, values, start, replaced=()):
+        """
+        Return the normalized values, and the index changes for adding them in
+        place of the replaced items
+        """
+        self._check_frozen()
+        field = self._field
+        items = list(field.normalize_items(values, self._name, self._prefix,
+                                           parent=self._parent, start=start))
+        return items, field.index_changes(items, self._indexes, self._prefix,
+                                          start=start, replaced=replaced)
+
+    def _position(self, index):
+        return max(index + len(self), 0) if index < 0 else index
+
+    def _contains(self, item):
+        """Return whether the list contains an item, by identity"""
+        properties = item._properties
+        for name, index in self._indexes.items():
+            value = properties.get(name)
+            if value is not None:
+                try:
+                    return index.get(value) is item
+                except TypeError:
+                    break
+
+        return any(other is item for other in self)
+
+    def _index_error(self, code, template, item, name, value):
+        position = six.next(i for i, other in enumerate(self)
+                            if other is item)
+        return ValidationError.lazy(
+            code, template, (self._prefix, name, position, value),
+            (self._prefix, position, name), value, self._field)
+
+    def _rekey(self, item, changes):
+        """
+        Update the indexes for fields of an item that are set to new values
+        (see :meth:`Config.set_path` and :meth:`Config.update`), or throw
+        :class:`ValidationError` without changing them if a new value is
+        already used by another item
+        """
+        indexes, properties = self._indexes, item._properties
+        changes = [(name, properties.get(name), new)
+                   for name, new in changes.items() if name in indexes]
 
-        # Preserve MRO by reversing inheritance list; first parent overwrites
-        # everything before it
-        inherits = reversed(dct.get('__inherits__', []))
-        for parent in inherits:
-            fields.update(parent._fields)
+        for name, old, new in changes:
+            if new is None:
+                continue
 
-        fields.update((key, value) for key, value in dct.items()
-                      if not key.startswith('__') and isinstance(value, Field))
+            try:
+                other = indexes[name].get(new)
+            except TypeError:
+                raise self._index_error(
+                    'invalid', "Field '{0}' is invalid: Value of '{1}' at "
+                    "index {2} can not be indexed", item, name, new)
+
+            if other is not None and other is not item:
+                raise self._index_error(
+                    'unique', "Field '{0}' is invalid: Duplicate value '{3}' "
+                    "for '{1}' at index {2}", item, name, new)
+
+        for name, old, new in changes:
+            index = indexes[name]
+            if old is not None and index.get(old) is item:
+                del index[old]
+            if new is not None:
+                index[new] = item
+
+    def _validate(self, change):
+        """
+        Run the validators of the whole list, e.g. :class:`Length`, on a copy
+        of the list with a change applied
+        """
+        values = list(self)
+        change(values)
+        self._field.validate(values, self._prefix, True)
+
+    def append(self, value):
+        items, changes = self._normalize([value], len(self))
+        self._validate(lambda values: values.append(items[0]))
+        super(IndexedList, self).append(items[0])
+        self._apply(changes)
+
+    def extend(self, values):
+        items, changes = self._normalize(values, len(self))
+        self._validate(lambda values: values.extend(items))
+        super(IndexedList, self).extend(items)
+        self._apply(changes)
+
+    def insert(self, index, value):
+        items, changes = self._normalize([value], self._position(index))
+        self._validate(lambda values: values.insert(index, items[0]))
+        super(IndexedList, self).insert(index, items[0])
+        self._apply(changes)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        if count < 1:
+            del self[:]
+        else:
+            self.extend(list(self) * (count - 1))
 
-        forbidden = _RESERVED.intersection(frozenset(fields.keys()))
-        if forbidden:
-            raise ReservedFieldError((
-                'Config {0} overwrites reserved field{1} {2}; use key option '
-                'to rename field{1}'
-            ).format(name,
-                     's' if len(forbidden) > 1 else '',
-                     ', '.join(forbidden)))
+        return self
 
-        dct['_fields'] = fields
-        dct['_normalize'] = normalizer(
-            allow_extra=dct.pop('__allow_extra__', None))
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            replaced = self[index]
+            items, changes = self._normalize(
+                value, self._position(index.start or 0), replaced)
+        else:
+            replaced = [self[index]]
+            items, changes = self._normalize([value], self._position(index),
+                                             replaced)
+            items = items[0]
 
-        # Automatic properties
-        for key, field in fields.items():
-            dct[key] = autoproperty(key, read_only=field.read_only, docstring=field.help)
+        self._validate(lambda values: values.__setitem__(index, items))
+        super(IndexedList, self).__setitem__(index, items)
+        self._apply(changes, replaced)
 
-        return type.__new__(cls, name, bases, dct)
+    def __delitem__(self, index):
+        self._check_frozen()
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        self._validate(lambda values: values.__delitem__(index))
+        super(IndexedList, self).__delitem__(index)
+        self._apply((), removed)
 
+    if six.PY2:  # pragma: no cover
+        def __setslice__(self, start, stop, values):
+            self.__setitem__(slice(start, stop), values)
 
-@six.add_metaclass(ConfigMeta)
-class Config(object):
+        def __delslice__(self, start, stop):
+            self.__delitem__(slice(start, stop))
 
-    """
-    Base class for configuration objects.  See :class:`Field` and
-    :class:`ListField` for usage.
+    def pop(self, index=-1):
+        self._check_frozen()
+        self._validate(lambda values: values.pop(index))
+        item = super(IndexedList, self).pop(index)
+        self._apply((), [item])
+        return item
 
-    When you create a :class:`Config` instance, you pass to it parameters as
-    you would a `dict`.  Similar to a `dict`, you can either use keyword
-    arguments or pass in an actual `dict` object.
+    def remove(self, value):
+        del self[self.index(value)]
 
-    If you wish to inherit from another :class:`Config`, do not do it in the
-    traditional class inheritance sense.  Instead, specify any parents using
-    the `__inherits__` attribute:
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        self._check_frozen()
+        super(IndexedList, self).sort(*args, **kwargs)
+
+    def reverse(self):
+        self._check_frozen()
+        super(IndexedList, self).reverse()
+
+
+def _indexed_list(values, owner, name, prefix):
+    return IndexedList(values, type(owner)._fields[name], name, prefix, owner)
+
+
+class _SpilledConfig(object):
+
+    """Picklable stand-in for a :class:`Config` stored in a SpilledList"""
+
+    __slots__ = ('index', 'properties')
+
+    def __init__(self, index, properties):
+        self.index = index
+        self.properties = properties
+
+    def __getstate__(self):
+        return self.index, self.properties
+
+    def __setstate__(self, state):
+        self.index, self.properties = state
+
+
+class SpilledList(object):
 
-    >>> class Parent(Config):
-    ...     id = Field(int, required=True)
-    >>> class Child(Config):
-    ...     __inherits__ = [Parent]
-    ...
-    ...     name = Field()
+    """
+    Read-only sequence of normalized values that are pickled to a temporary
+    file, so that only an offset per item is held in memory.  The pickled
+    values are kept in memory until they exceed 1 MB, so small lists do not
+    open a file.  Configs are stored by value, so items retrieved from the list
+    are new objects each time they are accessed.
     """
 
-    def __init__(self, *args, **kwargs):
-        if len(args) > 1:
-            raise TypeError(
-                'Expected one or fewer arguments, but received {0}'.format(
-                    len(args)))
+    _OFFSET_TYPECODE = 'Q' if six.PY3 else 'L'
+    _SPOOL_SIZE = 1 << 20
 
-        self._parent = kwargs.pop('__parent', None)
+    def __init__(self, values=(), parent=None):
+        self._parent = parent
+        self._frozen = False
+        self._classes = []
+        self._file = tempfile.SpooledTemporaryFile(self._SPOOL_SIZE)
+        self._lock = threading.Lock()
+        self._offsets = array.array(self._OFFSET_TYPECODE, [0])
 
-        properties = args[0] if args else {}
-        if isinstance(properties, NormalizedDict):
-            # No need to normalize, since we're already normalized
-            # (ignore kwargs, though)
-            normalized = properties
-        else:
-            combined = properties.copy()
-            combined.update(kwargs)
-            normalized = self._normalize(combined, parent=self)
+        for value in values:
+            self._file.write(pickle.dumps(self._dump(value),
+                                          pickle.HIGHEST_PROTOCOL))
+            self._offsets.append(self._file.tell())
+
+    def _dump(self, value):
+        if isinstance(value, Config):
+            cls = type(value)
+            if cls not in self._classes:
+                self._classes.append(cls)
+
+            # Nested lists, e.g. columnar ones, are rebuilt by their fields
+            return _SpilledConfig(self._classes.index(cls), value.to_dict())
+        elif isinstance(value, list):
+            return [self._dump(item) for item in value]
+        elif isinstance(value, dict):
+            return dict((key, self._dump(item)) for key, item in value.items())
+
+        return value
+
+    def _load(self, value, parent):
+        if isinstance(value, _SpilledConfig):
+            return self._classes[value.index]._from_trusted(value.properties,
+                                                            parent=parent)
+        elif isinstance(value, list):
+            return [self._load(item, parent) for item in value]
+        elif isinstance(value, dict):
+            return dict((key, self._load(item, parent))
+                        for key, item in value.items())
+
+        return value
+
+    def _freeze(self):
+        """Freeze the items that are read from the list"""
+        self._frozen = True
+
+    def _read(self, index):
+        start, end = self._offsets[index], self._offsets[index + 1]
+        with self._lock:
+            self._file.seek(start)
+            data = self._file.read(end - start)
+
+        value = self._load(pickle.loads(data), self._parent)
+        return _freeze_value(value) if self._frozen else value
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._read(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('SpilledList index out of range')
+
+        return self._read(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._read(index)
+
+    def __repr__(self):
+        return '<SpilledList of {0} items>'.format(len(self))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, (SpilledList, list, tuple)):
+            return NotImplemented
 
-        self._properties = normalized
+        return (len(self) == len(other) and
+                all(item == other_item for item, other_item in zip(self, other)))
 
-    @property
-    def parent(self):
-        return self._parent
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
 
-    def __contains__(self, key):
-        return key in self._properties
+    __hash__ = None
 
-    def copy(self):
-        return self.__class__(self._properties.copy())
+    def close(self):
+        """Delete the backing file, if any; the list may not be used afterwards"""
+        self._file.close()
 
-    def update(self, *args, **kwargs):
-        self._properties.update(*args, **kwargs)
+
+class _ColumnarRow(MutableMapping):
+
+    """Properties of a single row of a :class:`ColumnarList`"""
+
+    __slots__ = ('_table', '_columns', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._columns = table._columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key][self._index]
 
     def get(self, key, default=None):
-        return self._properties.get(key, default)
+        column = self._columns.get(key)
+        return default if column is None else column[self._index]
 
-    def to_dict(self):
-        """Convert the config to a plain python dictionary"""
-        converted = {}
-        for key, value in self._properties.items():
-            if isinstance(value, Config):
-                converted[key] = value.to_dict()
-            elif (isinstance(value, (list, tuple)) and
-                    any(isinstance(item, Config) for item in value)):
-                converted[key] = [item.to_dict() for item in value]
-            else:
-                converted[key] = value
+    def __contains__(self, key):
+        return key in self._columns
 
-        return converted
+    def __setitem__(self, key, value):
+        if self._table._frozen:
+            raise FrozenConfigError('Config is frozen')
 
-    @classmethod
-    def describe(cls):
-        """
-        Return a pretty-formatted string that describes the format of the data
-        """
+        column = self._columns[key]
+        try:
+            column[self._index] = value
+        except (TypeError, OverflowError):
+            # Value does not fit into a typed array
+            column = self._columns[key] = list(column)
+            column[self._index] = value
+
+    def __delitem__(self, key):
+        raise TypeError('Columnar config properties may not be deleted')
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def copy(self):
+        return dict(self.items())
+
+
+class ColumnarList(object):
+
+    """
+    Sequence of configs of the same type that stores a single list per field,
+    rather than one object per config.  Indexing or iterating produces
+    lightweight views of each row, which are instances of the config type and
+    support attribute access, :meth:`Config.to_dict`, etc.  Changes made
+    through a view, e.g. with :meth:`Config.update`, are written to the
+    columns, unless the list belongs to a frozen config.  Views are created
+    on demand, so they are not identical across accesses; any `__init__`
+    defined by the config type is not called.
+
+    Columns of floats and integers are stored as :mod:`array` objects if
+    possible, which may be retrieved with :meth:`column` for fast aggregation.
+    """
+
+    _ARRAY_TYPECODES = {float: 'd'}
+    if six.PY3:  # pragma: no cover
+        _ARRAY_TYPECODES[int] = 'q'
+
+    def __init__(self, config_type, parent=None):
+        self._type = config_type
+        self._parent = parent
+        self._columns = dict((name, []) for name in config_type._fields)
+        self._nulls = set()
+        self._length = 0
+        self._frozen = False
+
+    def _set(self, index, properties):
+        """Replace the normalized properties of a row, or set it to `None`"""
+        if self._frozen:
+            raise FrozenConfigError('Config is frozen')
+
+        if properties is None:
+            self._nulls.add(index)
+            properties = {}
+        else:
+            self._nulls.discard(index)
+
+        row = _ColumnarRow(self, index)
+        for name in self._columns:
+            row[name] = properties.get(name)
+
+    def _append(self, properties):
+        """Append the normalized properties of a row, or `None`"""
+        if properties is None:
+            self._nulls.add(self._length)
+            properties = {}
+        elif isinstance(properties, ProjectedDict):
+            # Fields outside of the projection are stored as None
+            properties = dict(properties)
+
+        for name, column in self._columns.items():
+            column.append(properties.get(name))
+
+        self._length += 1
+
+    def compact(self):
+        """Convert numeric columns to arrays, if possible"""
+        for name, field in self._type._fields.items():
+            type_ = field.types[-1]
+            typecode = self._ARRAY_TYPECODES.get(type_)
+            column = self._columns[name]
+            if (typecode is None or isinstance(field, ListField) or
+                    set(map(type, column)) != set([type_])):
+                # Only columns whose values are all exactly of the array type
+                # (i.e. not None or bool) are converted
+                continue
+
+            try:
+                self._columns[name] = array.array(typecode, column)
+            except OverflowError:
+                pass
+
+        return self
+
+    def _freeze(self):
+        """Make the rows, and the values of their fields, read-only"""
+        for column in self._columns.values():
+            if type(column) is list:
+                column[:] = [_freeze_value(value) for value in column]
+
+        self._frozen = True
+
+    @property
+    def config_type(self):
+        return self._type
+
+    @property
+    def parent(self):
+        return _resolve_parent(self._parent)
+
+    def column(self, name):
+        """Return the values of a field for all rows"""
+        return self._columns[name]
+
+    def _row(self, index):
+        if index in self._nulls:
+            return None
+
+        row = self._type.__new__(self._type)
+        row._parent = self._parent
+        row._properties = _ColumnarRow(self, index)
+        row._frozen = self._frozen
+        return row
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ColumnarList index out of range')
+
+        return self._row(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def __repr__(self):
+        return '<ColumnarList of {0} {1}>'.format(len(self),
+                                                  self._type.__name__)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ColumnarList) or other._type is not self._type:
+            return NotImplemented
+
+        if self._length != other._length or self._nulls != other._nulls:
+            return False
+
+        for name, column in self._columns.items():
+            other_column = other._columns[name]
+            if type(column) is not type(other_column):
+                # Compare arrays to lists by value
+                column, other_column = list(column), list(other_column)
+            if column != other_column:
+                return False
+
+        return True
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def to_list(self):
+        """Convert the rows to a list of plain python dictionaries"""
+        return [None if row is None else row.to_dict() for row in self]
+
+
+def _freeze_value(value):
+    """
+    Return a read-only version of a normalized value, freezing nested configs
+    and lists in place
+    """
+    type_ = type(value)
+    if type_ is list:
+        return _FrozenList(_freeze_value(item) for item in value)
+    elif type_ is SampledList:
+        return _FrozenSampledList([_freeze_value(item) for item in value],
+                                  value.sampled)
+    elif type_ is dict:
+        return _FrozenDict((key, _freeze_value(item))
+                           for key, item in value.items())
+    elif type_ is tuple:
+        return tuple(_freeze_value(item) for item in value)
+    elif type_ is set:
+        return frozenset(value)
+    elif isinstance(value, Config):
+        return value.freeze()
+    elif isinstance(value, (IndexedList, ColumnarList, SpilledList)):
+        value._freeze()
+
+    return value
+
+
+######################################################################
+# Memory
+######################################################################
+
+def _sizeof(value, seen, deep=True):
+    """
+    Return the size of a value (and, if `deep`, of the values that it
+    contains) that have not already been counted.  Singletons are not counted.
+    """
+    if value is None or value is True or value is False or id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if deep:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                size += _sizeof(key, seen) + _sizeof(item, seen)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for item in value:
+                size += _sizeof(item, seen)
+
+    return size
+
+
+def _config_usage(config, path, usage, seen, deep):
+    """
+    Return the size of a config, adding the size of each of its fields to
+    `usage` by path.  The config's parent is not counted.
+    """
+    if id(config) in seen:
+        return 0
+
+    seen.add(id(config))
+    properties = config._properties
+    size = (sys.getsizeof(config) + sys.getsizeof(vars(config)) +
+            _sizeof(properties, seen, deep=False))
+
+    if isinstance(properties, OverlayDict):
+        size += (_sizeof(properties._overrides, seen, deep=False) +
+                 _sizeof(properties._base, seen, deep=False))
+
+    for name, value in properties.items():
+        prefixed = name if not path else '{0}.{1}'.format(path, name)
+        field_size = _value_usage(value, prefixed, usage, seen, deep)
+        usage[prefixed] = usage.get(prefixed, 0) + field_size
+        size += field_size
+
+    return size
+
+
+def _value_usage(value, path, usage, seen, deep):
+    """
+    Return the size of a field's value.  The fields of nested configs are
+    added to `usage`; those of list items share one path, e.g. `items.*.name`.
+    """
+    if not deep or id(value) in seen:
+        return _sizeof(value, seen, deep)
+
+    items = '{0}.*'.format(path)
+
+    if isinstance(value, Config):
+        return _config_usage(value, path, usage, seen, deep)
+    elif isinstance(value, ColumnarList):
+        seen.add(id(value))
+        size = (sys.getsizeof(value) + sys.getsizeof(vars(value)) +
+                _sizeof(value._columns, seen, deep=False) +
+                _sizeof(value._nulls, seen))
+        for name, column in value._columns.items():
+            prefixed = '{0}.{1}'.format(items, name)
+            column_size = _sizeof(column, seen)
+            usage[prefixed] = usage.get(prefixed, 0) + column_size
+            size += column_size
+        return size
+    elif isinstance(value, SpilledList):
+        # Items are on disk; only count the offsets held in memory
+        seen.add(id(value))
+        return (sys.getsizeof(value) + sys.getsizeof(vars(value)) +
+                _sizeof(value._offsets, seen) + _sizeof(value._classes, seen))
+    elif (isinstance(value, (list, tuple)) and
+            any(isinstance(item, Config) for item in value)):
+        seen.add(id(value))
+        size = sys.getsizeof(value)
+        for item in value:
+            if isinstance(item, Config):
+                size += _config_usage(item, items, usage, seen, deep)
+            else:
+                size += _sizeof(item, seen)
+        return size
+
+    return _sizeof(value, seen)
+
+
+######################################################################
+# Deferred validation
+######################################################################
+
+_validation_pool = None
+_validation_pool_lock = threading.Lock()
+
+
+def _get_validation_pool():
+    """Return the thread pool for deferred validation, creating it if needed"""
+    global _validation_pool
+
+    with _validation_pool_lock:
+        if _validation_pool is None:
+            _validation_pool = ThreadPool()
+
+    return _validation_pool
+
+
+class _PoisonedProperties(object):
+
+    """
+    Replaces the properties of a config that failed deferred validation, so
+    that any use of them throws the validation error
+    """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+    def fail(self, *args, **kwargs):
+        error = self.error
+        details = (error._details if isinstance(error, FiggisError)
+                   else FiggisError._details)
+        raise ValidationError.lazy(details[0] or 'invalid', '{0}', (error,),
+                                   *details[3:])
+
+    def __getattr__(self, name):
+        return self.fail
+
+    __getitem__ = __setitem__ = __contains__ = __iter__ = __len__ = fail
+
+
+class Validation(object):
+
+    """
+    Handle for the validation of a config created with
+    `Config.parse(data, defer_validation=True)`, which runs in a background
+    thread.  If validation fails, the config (and the config that contains
+    the invalid field) is poisoned: getting any of its fields throws the
+    :class:`ValidationError`.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._error = None
+
+    @classmethod
+    def start(cls, config, checks):
+        """Validate the checks collected while parsing a config"""
+        validation = cls()
+        _get_validation_pool().apply_async(validation._run, (config, checks))
+        return validation
+
+    def _run(self, config, checks):
+        error = None
+        try:
+            for field, normalized, prefixed, exists, parent in checks:
+                try:
+                    field.validate(normalized, prefixed, exists)
+                except Exception as ex:
+                    error = ex
+                    poisoned = _PoisonedProperties(ex)
+                    config._properties = poisoned
+
+                    owner = _resolve_parent(parent)
+                    if owner is not None:
+                        owner._properties = poisoned
+                    break
+        finally:
+            self._finish(error)
+
+    def _finish(self, error):
+        with self._lock:
+            self._error = error
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, None
+
+        for callback in callbacks:
+            callback(self)
+
+    @property
+    def error(self):
+        """The exception thrown by validation, or `None`"""
+        return self._error
+
+    def done(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for validation to finish, and return whether it has finished
+        """
+        return self._event.wait(timeout)
+
+    def result(self, timeout=None):
+        """
+        Wait for validation to finish, and throw its error, if any.  Throws
+        `RuntimeError` if validation does not finish within the timeout.
+        """
+        if not self.wait(timeout):
+            raise RuntimeError('Validation did not finish in time')
+        if self._error is not None:
+            raise self._error
+
+    def add_done_callback(self, callback):
+        """
+        Call `callback(validation)` when validation finishes, or immediately
+        if it already has
+        """
+        with self._lock:
+            if self._callbacks is not None:
+                self._callbacks.append(callback)
+                return
+
+        callback(self)
+
+
+#: Handle for configs that were validated when they were created
+_VALIDATED = Validation()
+_VALIDATED._finish(None)
+
+
+def _canonical(value):
+    """
+    Return a hashable representation of json-like data, such that two values
+    have equal representations only if they are equal and of the same types
+    """
+    if isinstance(value, dict):
+        return dict, frozenset((key, _canonical(item))
+                               for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        return type(value), tuple(_canonical(item) for item in value)
+
+    return type(value), value
+
+
+def _value_hash(value):
+    """
+    Return a hash of a normalized value that is consistent with equality, even
+    for unhashable containers
+    """
+    if isinstance(value, Config):
+        return value._structural_hash()
+    elif isinstance(value, (list, tuple, SpilledList, ColumnarList)):
+        return hash(tuple(_value_hash(item) for item in value))
+    elif isinstance(value, dict):
+        return hash(frozenset((key, _value_hash(item))
+                              for key, item in value.items()))
+    elif isinstance(value, set):
+        return hash(frozenset(value))
+
+    return hash(value)
+
+
+class _Limits(object):
+
+    """
+    Resources used by a single call to :meth:`Config.parse`, which are checked
+    as the data is normalized.  The time budgets are checked before each
+    config and after each list item, so that slow validators or types do not
+    run far past them.
+    """
+
+    def __init__(self, max_depth=None, max_list_length=None, max_values=None,
+                 time_budget=None, cpu_budget=None):
+        if max_depth is not None and max_depth < 1:
+            raise ValueError('max_depth must be at least 1')
+
+        unlimited = float('inf')
+        self.max_depth = unlimited if max_depth is None else max_depth
+        self.max_list_length = (unlimited if max_list_length is None
+                                else max_list_length)
+        self.max_values = unlimited if max_values is None else max_values
+        self.time_budget = time_budget
+        self.cpu_budget = cpu_budget
+        self.timed = time_budget is not None or cpu_budget is not None
+
+        self.deadline = (None if time_budget is None
+                         else _monotonic() + time_budget)
+        self.cpu_deadline = (None if cpu_budget is None
+                             else _process_time() + cpu_budget)
+
+        # Configs currently being normalized, and values normalized so far
+        self.depth = 0
+        self.values = 0
+
+    def enter(self, cls, prefix):
+        """Start normalizing a (possibly nested) config"""
+        self.depth += 1
+        self.values += len(cls._fields)
+        if (self.depth > self.max_depth or self.values > self.max_values or
+                self.timed):
+            self.check(prefix)
+
+    def add_list(self, values, prefixed):
+        """Start normalizing the items of a list"""
+        try:
+            length = len(values)
+        except TypeError:
+            # Iterators are normalized after the parse
+            return
+
+        if length > self.max_list_length:
+            raise LimitExceededError.lazy(
+                'max_list_length', 'Field {0} has more than {1} items',
+                (prefixed, self.max_list_length), prefixed)
+
+        self.values += length
+        if self.values > self.max_values:
+            self.check(prefixed)
+
+    def check(self, location):
+        """Throw :class:`LimitExceededError` if any limit is exceeded"""
+        if self.depth > self.max_depth:
+            raise LimitExceededError.lazy(
+                'max_depth', 'Property {0} is nested more than {1} configs '
+                'deep', (location, self.max_depth), location)
+        elif self.values > self.max_values:
+            raise LimitExceededError.lazy(
+                'max_values', 'Data has more than {0} values',
+                (self.max_values,), location)
+        elif self.timed:
+            self.check_time(location)
+
+    def check_time(self, location):
+        """Throw :class:`LimitExceededError` if a time budget is exceeded"""
+        if self.deadline is not None and _monotonic() >= self.deadline:
+            raise LimitExceededError.lazy(
+                'time_budget', 'Parsing took more than {0} seconds',
+                (self.time_budget,), location)
+        elif (self.cpu_deadline is not None and
+                _process_time() >= self.cpu_deadline):
+            raise LimitExceededError.lazy(
+                'cpu_budget', 'Parsing used more than {0} seconds of CPU '
+                'time', (self.cpu_budget,), location)
+
+    def checked(self, values, location):
+        """Generate the items of a list, checking the time budgets after each"""
+        check_time = self.check_time
+        for value in values:
+            yield value
+            check_time(location)
+
+
+class _ParseContext(object):
+
+    """Options and state for a single call to :meth:`Config.parse`"""
+
+    def __init__(self, intern=False, weak_parents=False, projection=None,
+                 validate=True, defer_validation=False, plain=False,
+                 **limits):
+        self.intern = intern
+        self.weak_parents = weak_parents
+
+        # Limits on the resources used by the parse, if any, which are shared
+        # by copies of the context
+        self.limits = _Limits(**limits) if limits else None
+
+        # If True, configs are normalized into plain dictionaries
+        self.plain = plain
+
+        # If False, only types are applied; validators are not run
+        self.validate = validate
+
+        # Validation to run later, as (field, normalized, prefixed, exists,
+        # parent), if validation is deferred
+        self.deferred = [] if defer_validation else None
+
+        # Projection tree for the config currently being normalized
+        self.projection = projection
+
+        # Interned configs, by type and canonical data
+        self.interned = {}
+
+    def intern_config(self, type_, value, prefixed):
+        """
+        Return a frozen config of the given type for the data, which is shared
+        by all identical data in the parse
+        """
+        try:
+            key = (type_, id(self.projection), self.validate,
+                   _canonical(value))
+            config = self.interned.get(key)
+        except TypeError:
+            # Unhashable data
+            key = config = None
+
+        if config is None:
+            normalized = type_._normalize(value, prefix=prefixed, context=self)
+            config = type_(normalized).freeze()
+
+            if key is not None:
+                self.interned[key] = config
+
+        return config
+
+    def unvalidated(self):
+        """Return a context that shares this one's state but skips validators"""
+        context = copy(self)
+        context.validate = False
+        return context
+
+    def after_parse(self):
+        """
+        Return a context for normalizing a stream once the parse has
+        finished, which keeps the current projection but validates inline and
+        has no limits
+        """
+        context = copy(self)
+        context.deferred = None
+        context.limits = None
+        return context
+
+    def intern_value(self, value):
+        """Intern a string, or the strings in a list"""
+        if type(value) is str:
+            return _intern(value)
+        elif type(value) is list:
+            return [_intern(item) if type(item) is str else item
+                    for item in value]
+
+        return value
+
+
+def normalizer(allow_extra=None):
+    if allow_extra is None:
+        allow_extra = True
+
+    @classmethod
+    def normalize(cls, config, prefix=None, allow_extra=allow_extra, parent=None,
+                  context=None):
+        limits = None if context is None else context.limits
+        if limits is not None:
+            limits.enter(cls, prefix)
+
+        if context is not None and context.projection is not None:
+            normalized = project(cls, config, prefix, parent, context)
+        else:
+            extra = frozenset(config) - frozenset(cls._fields)
+            if extra and not allow_extra:
+                key = six.next(iter(extra))
+                raise PropertyError.lazy(
+                    'extra', 'Encountered unexpected key: {0}{1}',
+                    (prefix + '.' if prefix else '', key), (prefix, key),
+                    config[key])
+
+            result = (dict if context is not None and context.plain
+                      else NormalizedDict)
+            normalized = result(
+                field.normalize(config, name, prefix=prefix, parent=parent,
+                                context=context)
+                for name, field in cls._fields.items())
+
+        if limits is not None:
+            # An error aborts the whole parse, so the depth does not need to
+            # be restored
+            limits.depth -= 1
+
+        return normalized
+
+    return normalize
+
+
+def project(cls, config, prefix, parent, context):
+    """
+    Normalize only the fields in the context's projection, each of which
+    projects its nested config, if any, by its own subtree
+    """
+    projection = context.projection
+    normalized = ProjectedDict()
+
+    try:
+        for name, subtree in projection.items():
+            context.projection = subtree
+            name, value = cls._fields[name].normalize(
+                config, name, prefix=prefix, parent=parent, context=context)
+            normalized[name] = value
+    finally:
+        context.projection = projection
+
+    return normalized
+
+
+def compile_projection(cls, paths):
+    """
+    Compile dotted field paths into a projection tree, which maps field names
+    to the tree for the field's config, or `None` for the whole field
+    """
+    if isinstance(paths, six.string_types):
+        paths = [paths]
+
+    tree = {}
+    for path in paths:
+        names = path.split('.')
+
+        type_ = cls
+        for name in names:
+            if type_ is None or name not in type_._fields:
+                raise ValueError('Invalid projection path for {0}: {1}'.format(
+                    cls.__name__, path))
+            type_ = type_._fields[name].config_type
+
+        node = tree
+        for name in names[:-1]:
+            if node.get(name, {}) is None:
+                # Already projecting the entire field
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    return tree
+
+
+# Number of compiled paths that are cached for each config class
+_MAX_PATHS = 1024
+
+
+class _Path(object):
+
+    """A dotted path compiled for a config class; see :meth:`Config.get_path`"""
+
+    __slots__ = ('steps', 'getters', 'parent_getters', 'owner_getters',
+                 'prefix')
+
+    def __init__(self, steps, names):
+        self.steps = steps
+        self.getters = _path_getters(steps)
+        self.parent_getters = _path_getters(steps[:-1])
+        self.owner_getters = _path_getters(steps[:-2])
+        self.prefix = '.'.join(names[:-1]) or None
+
+
+def _path_getters(steps):
+    """
+    Return the getters that follow a path, combining consecutive fields into
+    one :func:`operator.attrgetter`
+    """
+    getters, names = [], []
+    for kind, key, _ in steps:
+        if kind == 'field':
+            names.append(key)
+            continue
+
+        if names:
+            getters.append(attrgetter('.'.join(names)))
+            names = []
+        getters.append(itemgetter(key))
+
+    if names:
+        getters.append(attrgetter('.'.join(names)))
+
+    return tuple(getters)
+
+
+def compile_path(cls, path):
+    """
+    Compile a dotted path (or a sequence of names and indices) into the
+    `('field', name, field)`, `('index', index, list_field)` and
+    `('item', key, None)` steps that follow it through the schema
+    """
+    parts = path.split('.') if isinstance(path, six.string_types) else path
+    if not parts:
+        raise ValueError('Empty path for {0}'.format(cls.__name__))
+
+    steps = []
+    type_, field, in_list = cls, None, False
+    for part in parts:
+        if in_list:
+            try:
+                steps.append(('index', int(part), field))
+            except (TypeError, ValueError):
+                raise ValueError('Invalid list index in path for {0}: '
+                                 '{1}'.format(cls.__name__, path))
+            in_list = False
+        elif type_ is not None:
+            name = type_._cached('path_names', type_._build_path_names).get(
+                part)
+            if name is None:
+                raise ValueError('Invalid path for {0}: {1}'.format(
+                    cls.__name__, path))
+
+            field = type_._fields[name]
+            steps.append(('field', name, field))
+            type_, in_list = field.config_type, isinstance(field, ListField)
+        else:
+            # Plain data, e.g. the value of a dict field
+            if isinstance(part, six.string_types) and part.lstrip('-').isdigit():
+                part = int(part)
+            steps.append(('item', part, None))
+
+    return _Path(tuple(steps), [str(part) for part in parts])
+
+
+class _FlatList(dict):
+
+    """Items of a list field, by index, while unflattening keys"""
+
+
+def compile_flat(cls, sep, fold_case):
+    """
+    Compile the keys of a config class into a trie that maps each segment of a
+    flat key to either the trie for the following segments, if the data key
+    contains the separator, or to `(key, kind, trie)`, where `kind` is
+    `'config'`, `'list'` or `'value'`, and `trie` is the trie of the field's
+    config type, if any
+    """
+    trie = {}
+    for name, field in cls._fields.items():
+        key = field.key or name
+        segments = (key.lower() if fold_case else key).split(sep)
+
+        if isinstance(field, ListField):
+            kind = 'list'
+        elif field.config_type is not None:
+            kind = 'config'
+        else:
+            kind = 'value'
+
+        child = None
+        if field.config_type is not None:
+            child = field.config_type._flat_trie(sep, fold_case)
+
+        node = trie
+        for segment in segments[:-1]:
+            node = node.setdefault(segment, {})
+            if not isinstance(node, dict):
+                # A field's key is a prefix of this one's
+                break
+        else:
+            node.setdefault(segments[-1], (key, kind, child))
+
+    return trie
+
+
+def _flat_conflict(segments, count, value):
+    path = '.'.join(segments[:count])
+    return ValidationError.lazy('invalid', 'Conflicting values for {0}',
+                                (path,), path, value)
+
+
+def unflatten(cls, mapping, sep='.', fold_case=False, prefix=None):
+    """
+    Convert flat keys, e.g. `'db.host'` or `'workers.0.name'`, into the nested
+    data for a config class, routing each key through the class's key trie
+    (see :meth:`Config.from_flat`)
+    """
+    if prefix is not None:
+        prefix = (prefix.lower() if fold_case else prefix) + sep
+
+    root = cls._flat_trie(sep, fold_case)
+    data, lists = {}, []
+    for flat_key, value in mapping.items():
+        folded = flat_key.lower() if fold_case else flat_key
+        if prefix is not None:
+            if not folded.startswith(prefix):
+                continue
+            flat_key, folded = flat_key[len(prefix):], folded[len(prefix):]
+
+        segments = flat_key.split(sep)
+        if fold_case:
+            folded = folded.split(sep)
+            if len(folded) != len(segments):  # pragma: no cover
+                # Case folding changed the separators
+                folded = [segment.lower() for segment in segments]
+        else:
+            folded = segments
+
+        count = len(segments)
+        container, node, start, i = data, root, 0, 0
+        while True:
+            if node is None:
+                # Plain data, e.g. the value of a dict field
+                for j in range(i, count - 1):
+                    child = container.get(segments[j])
+                    if child is None:
+                        child = container[segments[j]] = {}
+                    elif type(child) is not dict:
+                        raise _flat_conflict(segments, j + 1, value)
+                    container = child
+                key = segments[-1]
+                break
+
+            entry = node.get(folded[i])
+            i += 1
+            if type(entry) is dict:
+                if i < count:
+                    node = entry
+                    continue
+                entry = None
+
+            if entry is None:
+                # Unexpected key, which the config accepts or rejects
+                key = sep.join(segments[start:])
+                break
+
+            key, kind, node = entry
+            if i == count:
+                break
+
+            child = container.get(key)
+            if kind == 'value':
+                node = None
+                if child is None:
+                    child = container[key] = {}
+            elif kind == 'config':
+                if child is None:
+                    child = container[key] = {}
+            elif child is None:
+                child = container[key] = _FlatList()
+                lists.append((container, key, '.'.join(segments[:i])))
+
+            if type(child) is not (_FlatList if kind == 'list' else dict):
+                raise _flat_conflict(segments, i, value)
+            container, start = child, i
+            if kind != 'list':
+                continue
+
+            index = segments[i]
+            i += 1
+            if not index.isdigit():
+                path = '.'.join(segments[:i - 1])
+                raise PropertyError.lazy(
+                    'extra', 'Encountered unexpected key: {0}{1}',
+                    (path + '.', index), (path, index), value)
+
+            key = int(index)
+            if i == count:
+                break
+
+            child = container.get(key)
+            if child is None:
+                child = container[key] = {}
+            elif type(child) is not dict:
+                raise _flat_conflict(segments, i, value)
+            container, start = child, i
+
+        if key in container:
+            raise _flat_conflict(segments, count, value)
+        container[key] = value
+
+    # Lists are created before the lists that they contain, so convert the
+    # innermost lists first
+    for container, key, path in reversed(lists):
+        items = container[key]
+        for index in range(len(items)):
+            if index not in items:
+                location = '{0}.{1}'.format(path, index)
+                raise PropertyError.lazy('required', 'Missing property: {0}',
+                                         (location,), location)
+        container[key] = [items[index] for index in range(len(items))]
+
+    return data
+
+
+def autoproperty(key, docstring=None, read_only=True):
+    """
+    Create a property for the given key that retrieves the corresponding value
+    from self._properties
+    """
+    def getter(self):
+        return self._properties.get(key)
+
+    def setter(self, value):
+        if self._frozen:
+            raise FrozenConfigError('Config is frozen')
+
+        if self._parent is not None:
+            self._reindex({key: value})
+        self._properties[key] = value
+
+    return property(getter,
+                    None if read_only else setter,
+                    None,
+                    docstring)
+
+
+class ConfigMeta(type):
+
+    """
+    Metaclass for configuration objects.  Do not use this directly; instead,
+    use :class:`Config`.
+    """
+
+    def __new__(cls, name, bases, dct):
+        # Normalization
+        fields = dict()
+
+        # Preserve MRO by reversing inheritance list; first parent overwrites
+        # everything before it
+        inherits = reversed(dct.get('__inherits__', []))
+        for parent in inherits:
+            fields.update(parent._fields)
+
+        fields.update((key, value) for key, value in dct.items()
+                      if not key.startswith('__') and isinstance(value, Field))
+
+        forbidden = _RESERVED.intersection(frozenset(fields.keys()))
+        if forbidden:
+            raise ReservedFieldError((
+                'Config {0} overwrites reserved field{1} {2}; use key option '
+                'to rename field{1}'
+            ).format(name,
+                     's' if len(forbidden) > 1 else '',
+                     ', '.join(forbidden)))
+
+        allow_extra = dct.pop('__allow_extra__', None)
+
+        dct['_fields'] = fields
+        dct['_allow_extra'] = allow_extra is None or bool(allow_extra)
+        dct['_normalize'] = normalizer(allow_extra=allow_extra)
+
+        # Data derived from the fields, built on demand by _cached
+        dct['_cache'] = {}
+        dct['_cache_lock'] = threading.RLock()
+
+        # Automatic properties
+        for key, field in fields.items():
+            dct[key] = autoproperty(key, read_only=field.read_only, docstring=field.help)
+
+        return type.__new__(cls, name, bases, dct)
+
+    def _cached(cls, key, build):
+        """
+        Return data derived from the config class, which is created by calling
+        `build()` the first time that the key is used.  Each key is built
+        exactly once, even if many threads use it at the same time.
+        """
+        try:
+            return cls._cache[key]
+        except KeyError:
+            pass
+
+        with cls._cache_lock:
+            try:
+                return cls._cache[key]
+            except KeyError:
+                value = cls._cache[key] = build()
+                return value
+
+    def _shares_defaults(cls):
+        """
+        Return whether the normalized defaults of every field, including those
+        of nested configs, can be reused (see :attr:`Field.prepares_default`)
+        """
+        return cls._cached('shares_defaults', lambda: all(
+            field.prepares_default for field in cls._fields.values()))
+
+    def _has_streams(cls):
+        """Return whether the config, or a nested one, has a stream field"""
+        return cls._cached('streams', lambda: any(
+            getattr(field, 'stream', False) or
+            (field.config_type is not None and
+             field.config_type._has_streams())
+            for field in cls._fields.values()))
+
+
+@six.add_metaclass(ConfigMeta)
+class Config(object):
+
+    """
+    Base class for configuration objects.  See :class:`Field` and
+    :class:`ListField` for usage.
+
+    When you create a :class:`Config` instance, you pass to it parameters as
+    you would a `dict`.  Similar to a `dict`, you can either use keyword
+    arguments or pass in an actual `dict` object.
+
+    If you wish to inherit from another :class:`Config`, do not do it in the
+    traditional class inheritance sense.  Instead, specify any parents using
+    the `__inherits__` attribute:
+
+    >>> class Parent(Config):
+    ...     id = Field(int, required=True)
+    >>> class Child(Config):
+    ...     __inherits__ = [Parent]
+    ...
+    ...     name = Field()
+
+    Configs of the same type are equal if all of their fields are equal, and
+    are ordered by their fields in declaration order.  Only frozen configs
+    (see :meth:`freeze`) are hashable, by their fields, so equal frozen
+    configs have equal hashes.
+    """
+
+    _frozen = False
+    _hash = None
+    _validation = _VALIDATED
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > 1:
+            raise TypeError(
+                'Expected one or fewer arguments, but received {0}'.format(
+                    len(args)))
+
+        self._parent = kwargs.pop('__parent', None)
+        context = kwargs.pop('__context', None)
+
+        properties = args[0] if args else {}
+        if isinstance(properties, NormalizedDict):
+            # No need to normalize, since we're already normalized
+            # (ignore kwargs, though)
+            normalized = properties
+        else:
+            combined = properties.copy()
+            combined.update(kwargs)
+
+            parent = self
+            if context is not None and context.weak_parents:
+                parent = weakref.ref(self)
+
+            normalized = self._normalize(combined, parent=parent,
+                                         context=context)
+
+        self._properties = normalized
+
+    @classmethod
+    def parse(cls, data=None, **options):
+        """
+        Create a config from data, as with the constructor, but with options
+        that control how the data is parsed.
+
+        :param intern: If `True`, identical nested configs in the data are
+                       normalized only once and share a single frozen
+                       instance, which has no `parent`, unless they have
+                       streams.  Text values are
+                       also interned with :func:`sys.intern`.  This can
+                       save a great deal of memory for repetitive data.
+        :param weak_parents: If `True`, nested configs only hold weak
+                             references to their parents, so that the config
+                             does not contain reference cycles and is freed as
+                             soon as it is no longer used, rather than by the
+                             garbage collector.  However, the `parent` of a
+                             nested config is `None` once the top-level config
+                             has been freed.
+
+        >>> class Address(Config):
+        ...     city = Field()
+        >>> class Store(Config):
+        ...     address = Field(Address)
+        >>> class Chain(Config):
+        ...     stores = ListField(Store)
+        >>> chain = Chain.parse({'stores': [
+        ...     {'address': {'city': 'Springfield'}},
+        ...     {'address': {'city': 'Springfield'}},
+        ... ]}, intern=True)
+        >>> chain.stores[0].address is chain.stores[1].address
+        True
+
+        :param only: A list of dotted field paths, e.g. `['stores.address']`.
+                     Only these fields (and the configs that contain them)
+                     are normalized and validated, and getting any other
+                     field throws :class:`ProjectionError`.  Unexpected keys
+                     are ignored.
+
+        >>> chain = Chain.parse({'stores': [{'address': {'city': 'Ogdenville'},
+        ...                                  'unused': None}]},
+        ...                     only=['stores.address.city'])
+        >>> chain.stores[0].address.city
+        'Ogdenville'
+
+        :param defer_validation: If `True`, only types are applied when the
+                                 config is created; validators run in a
+                                 background thread.  See :attr:`validation`.
+
+        The following limits protect against hostile data, by throwing
+        :class:`LimitExceededError` as soon as they are exceeded:
+
+        :param max_depth: Maximum number of nested configs, including this one
+        :param max_list_length: Maximum number of items in a :class:`ListField`
+        :param max_values: Maximum total number of fields of configs and items
+                           of :class:`ListField` values
+        :param time_budget: Maximum time to spend parsing, in seconds
+        :param cpu_budget: Maximum CPU time to spend parsing, in seconds
+
+        Time is checked as configs and list items are normalized, and once the
+        config has been created, but a single coercion or validator is never
+        interrupted.
+
+        >>> try:
+        ...     Chain.parse({'stores': [{}, {}]}, max_list_length=1)
+        ... except LimitExceededError as ex:
+        ...     print(ex)
+        Field stores has more than 1 items
+        """
+        only = options.pop('only', None)
+        if only is not None:
+            key = only if isinstance(only, six.string_types) else tuple(only)
+            options['projection'] = cls._cached(
+                ('projection', key), lambda: compile_projection(cls, only))
+
+        context = _ParseContext(**options)
+        config = cls(data or {}, __context=context)
+
+        if context.limits is not None and context.limits.timed:
+            # Validators and long lists may run past the last check
+            context.limits.check_time(None)
+
+        if context.deferred is not None:
+            config._validation = Validation.start(config, context.deferred)
+
+        return config
+
+    @property
+    def parent(self):
+        return _resolve_parent(self._parent)
+
+    @property
+    def validation(self):
+        """
+        The :class:`Validation` of a config created with deferred validation
+        (see :meth:`parse`); for other configs, it has already finished
+        """
+        return self._validation
+
+    @property
+    def frozen(self):
+        return self._frozen
+
+    def freeze(self):
+        """
+        Make the config, and any nested configs, read-only, so that setting a
+        field or calling :meth:`update` throws :class:`FrozenConfigError`.
+        Lists, dicts and sets are replaced with read-only versions, so that
+        they can not change either.  Returns the config.
+        """
+        if self._frozen:
+            return self
+
+        self._frozen = True
+        properties = self._properties
+        for name, value in list(properties.items()):
+            frozen = _freeze_value(value)
+            if frozen is not value:
+                properties[name] = frozen
+
+        return self
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def _field_values(self, other):
+        """
+        Generate the values of each field of this config and another, in
+        declaration order; fields outside of a projection are `NotSpecified`
+        """
+        properties, other_properties = self._properties, other._properties
+        for name in self._fields:
+            yield (properties[name] if name in properties else NotSpecified,
+                   other_properties[name] if name in other_properties
+                   else NotSpecified)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+
+        properties, other_properties = self._properties, other._properties
+        if type(properties) is type(other_properties) is NormalizedDict:
+            # Every field is present, so compare the values all at once
+            return properties == other_properties
+
+        for value, other_value in self._field_values(other):
+            # Shared values, e.g. interned configs, are not compared
+            if value is not other_value and value != other_value:
+                return False
+
+        return True
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _compare(self, other, equal):
+        """
+        Compare the first field that differs from another config of the same
+        type, or return `equal` if every field is equal
+        """
+        for value, other_value in self._field_values(other):
+            if value is other_value or value == other_value:
+                continue
+
+            # None sorts before any other value
+            if value is None:
+                return True
+            if other_value is None:
+                return False
+            return value < other_value
+
+        return equal
+
+    def __lt__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._compare(other, False)
+
+    def __le__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._compare(other, True)
+
+    def __gt__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return other._compare(self, False)
+
+    def __ge__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return other._compare(self, True)
+
+    def __hash__(self):
+        if not self._frozen:
+            raise TypeError("unhashable type: '{0}' (only frozen configs are "
+                            "hashable)".format(type(self).__name__))
+
+        if self._hash is None:
+            self._hash = self._structural_hash()
+        return self._hash
+
+    def _structural_hash(self):
+        """Hash the fields of the config"""
+        properties = self._properties
+        return hash((type(self),) + tuple(
+            _value_hash(properties[name]) if name in properties else None
+            for name in self._fields))
+
+    def copy(self):
+        return self.__class__(self._properties.copy())
+
+    def update(self, *args, **kwargs):
+        if self._frozen:
+            raise FrozenConfigError('Config is frozen')
+
+        if self._parent is not None:
+            changes = dict(*args, **kwargs)
+            self._reindex(changes)
+            self._properties.update(changes)
+        else:
+            self._properties.update(*args, **kwargs)
+
+    def _reindex(self, changes):
+        """
+        Update the indexes of any :class:`IndexedList` of the parent that
+        contains this config for changes to its fields
+        """
+        parent = self.parent
+        if parent is None:
+            return
+
+        for name in type(parent)._cached('indexed_lists',
+                                         type(parent)._build_indexed_lists):
+            items = parent._properties.get(name)
+            if isinstance(items, IndexedList) and items._contains(self):
+                items._rekey(self, changes)
+
+    @classmethod
+    def _build_indexed_lists(cls):
+        return [name for name, field in cls._fields.items()
+                if getattr(field, 'index', None)]
+
+    def overlay(self, **changes):
+        """
+        Return a copy-on-write view of the config in which the given fields
+        are replaced.  Only the changed fields are normalized and validated;
+        every other field is read through from this config, so creating an
+        overlay costs time and memory proportional to the number of changes.
+        Nested configs, lists and other containers that are not frozen are
+        copied the first time that they are read through the overlay, so
+        changing them does not change this config.
+
+        Overlays never modify this config, so a single config may be shared
+        by many threads, each creating its own overlays, provided that nothing
+        calls :meth:`update` on the shared config.
+
+        >>> class Server(Config):
+        ...     host = Field(required=True)
+        ...     port = Field(int, default=80)
+        >>> base = Server(host='example.com')
+        >>> secure = base.overlay(port=443)
+        >>> secure.host, secure.port, base.port
+        ('example.com', 443, 80)
+        """
+        overlay = self.__class__(NormalizedDict(), __parent=self._parent)
+        fields = self._fields
+
+        def own(name, value):
+            if not _shared_mutable(value):
+                return value
+
+            # Copy the value without normalizing it again
+            return fields[name].from_trusted(
+                _copy_data(_plain_value(value)), parent=overlay, name=name)
+
+        overlay._properties = OverlayDict(
+            NormalizedDict(self._normalize_changes(changes, parent=overlay)),
+            self._properties, own)
+        return overlay
+
+    @classmethod
+    def _normalize_changes(cls, changes, parent=None):
+        """Normalize and validate only the given fields"""
+        for name, value in changes.items():
+            if name not in cls._fields:
+                raise PropertyError.lazy(
+                    'extra', 'Encountered unexpected key: {0}', (name,),
+                    (None, name), value)
+
+            field = cls._fields[name]
+            yield field.normalize({field.key or name: value}, name,
+                                  parent=parent)
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    @classmethod
+    def _compile_path(cls, path):
+        paths = cls._cached('paths', dict)
+        try:
+            # Fast path for paths that have already been compiled
+            return paths[path]
+        except (KeyError, TypeError):
+            pass
+
+        key = path if isinstance(path, six.string_types) else tuple(path)
+        compiled = compile_path(cls, key)
+        if len(paths) >= _MAX_PATHS:
+            # Each list index is a distinct path, so start over rather than
+            # let the cache grow without bound
+            paths.clear()
+        paths[key] = compiled
+        return compiled
+
+    @classmethod
+    def _build_path_names(cls):
+        names = dict((field.key, name) for name, field in cls._fields.items()
+                     if field.key)
+        names.update((name, name) for name in cls._fields)
+        return names
+
+    def get_path(self, path, default=NotSpecified):
+        """
+        Return the value at a dotted path of field names (or keys) and list
+        indices, e.g. `'clusters.3.nodes.0.port'`, or at a sequence of them,
+        e.g. the `path` of a :class:`ValidationError`.  Paths are compiled
+        once per config class, and up to 1024 are cached.  If a `default` is
+        given, it is returned when the data does not contain the path, e.g. if
+        an index is out of range.
+
+        >>> class Node(Config):
+        ...     port = Field(int, key='listen-port')
+        >>> class Cluster(Config):
+        ...     nodes = ListField(Node)
+        >>> cluster = Cluster(nodes=[{'listen-port': 80}])
+        >>> cluster.get_path('nodes.0.listen-port')
+        80
+        """
+        compiled = self._compile_path(path)
+
+        value = self
+        try:
+            for get in compiled.getters:
+                value = get(value)
+        except (AttributeError, LookupError, TypeError):
+            if default is NotSpecified:
+                raise
+            return default
+
+        return value
+
+    def set_path(self, path, value):
+        """
+        Normalize, validate and set the value at a path (see
+        :meth:`get_path`).  Values inside plain data, e.g. a `dict` field, are
+        set as-is.
+        """
+        compiled = self._compile_path(path)
+        kind, key, field = compiled.steps[-1]
+
+        if kind == 'index':
+            owner = self
+            for get in compiled.owner_getters:
+                owner = get(owner)
+            if owner._frozen:
+                raise FrozenConfigError('Config is frozen')
+
+            # An overlay copies the list before it is changed
+            name = compiled.steps[-2][1]
+            values = owner._properties.get(name)
+            if isinstance(values, ColumnarList):
+                self._set_row(values, key, value, field, name, compiled.prefix)
+                return
+            elif not isinstance(values, list):
+                raise ReadOnlyListError(
+                    'Items of {0} may not be set'.format(compiled.prefix))
+
+            value, = field.normalize_items([value], name, compiled.prefix,
+                                           parent=owner, start=key)
+
+            # Validators of the whole list, e.g. Length, see the new item
+            previous, values[key] = values[key], value
+            try:
+                field.validate(values, compiled.prefix, True)
+            except ValidationError:
+                values[key] = previous
+                raise
+            return
+
+        target = self
+        for get in compiled.parent_getters:
+            target = get(target)
+
+        if kind == 'item':
+            target[key] = value
+            return
+
+        if target._frozen:
+            raise FrozenConfigError('Config is frozen')
+
+        normalized = field.normalize(
+            {field.key or key: value}, key, prefix=compiled.prefix,
+            parent=target)[1]
+
+        if len(compiled.steps) > 1 and compiled.steps[-2][0] == 'index':
+            # Keep the index of a list that contains the config up to date
+            list_field = compiled.steps[-2][2]
+            if list_field.index and key in list_field.index:
+                items = self
+                for get in compiled.owner_getters:
+                    items = get(items)
+                items._rekey(target, {key: normalized})
+
+        target._properties[key] = normalized
+
+    @staticmethod
+    def _set_row(table, index, value, field, name, prefix):
+        """Normalize, validate and set a row of a :class:`ColumnarList`"""
+        if index < 0:
+            index += len(table)
+        if not 0 <= index < len(table):
+            raise IndexError('ColumnarList index out of range')
+
+        previous = table._row(index)
+        if previous is not None:
+            previous = dict(previous._properties)
+
+        table._set(index, field._normalize_row(table, index, value, name,
+                                               prefix))
+        try:
+            field.validate(table, prefix, True)
+        except ValidationError:
+            table._set(index, previous)
+            raise
+
+    def memory_usage(self, deep=True):
+        """
+        Return the approximate number of bytes of memory used by the config,
+        as a dictionary that maps the path of each field, e.g. `db.host`, to
+        the size of its value.  The empty path is the entire config.  Fields of
+        the configs in a list share a path, e.g. `servers.*.host`.  Objects
+        that are referenced more than once, e.g. interned configs, are only
+        counted the first time that they are found.
+
+        If `deep` is `False`, the contents of nested configs and containers
+        are not counted.  The parent of the config is never counted, nor is
+        data that a :class:`SpilledList` has written to disk.
+        """
+        usage = {}
+        usage[''] = _config_usage(self, '', usage, set(), deep)
+        return usage
+
+    def to_dict(self):
+        """Convert the config to a plain python dictionary"""
+        return dict((key, _plain_value(value))
+                    for key, value in self._properties.items())
+
+    @classmethod
+    def to_json_schema(cls):
+        """
+        Return a `JSON schema <http://json-schema.org>`_ (draft 4) that
+        describes the data accepted by this config, for use with external
+        validators.  Values are described in their canonical form, e.g. a
+        field of type `int` is an `integer`, although figgis also accepts
+        values such as `'1'` that can be coerced.  Custom validators and
+        fields typed with functions can not be expressed in the schema.
+
+        >>> class Server(Config):
+        ...     port = Field(int, required=True, nullable=False)
+        >>> schema = Server.to_json_schema()
+        >>> schema['properties']['port']
+        {'type': 'integer'}
+        >>> schema['required']
+        ['port']
+        """
+        schema = deepcopy(cls._json_schema())
+        schema['$schema'] = _JSON_SCHEMA_VERSION
+        return schema
+
+    @classmethod
+    def _json_schema(cls):
+        """Cached JSON schema for this config; must not be modified"""
+        return cls._cached('json_schema', cls._build_json_schema)
+
+    @classmethod
+    def _build_json_schema(cls):
+        properties = dict((field.key or name, field.json_schema())
+                          for name, field in cls._fields.items())
+        required = sorted(field.key or name
+                          for name, field in cls._fields.items()
+                          if field.required)
+
+        schema = {'type': 'object',
+                  'title': cls.__name__,
+                  'properties': properties}
+        if required:
+            schema['required'] = required
+        if not cls._allow_extra:
+            schema['additionalProperties'] = False
+        if hasattr(cls, '__help__'):
+            schema['description'] = cls.__help__
+
+        return schema
+
+    @classmethod
+    def fingerprint(cls):
+        """
+        Return a string that identifies the schema of this config, i.e. its
+        fields, their types and options, and those of any nested configs.
+        Configs with the same fingerprint normalize data identically, except
+        for differences inside custom types and validators.
+        """
+        return cls._cached('fingerprint', cls._build_fingerprint)
+
+    @classmethod
+    def _build_fingerprint(cls):
+        data = json.dumps(cls._fingerprint_data(), sort_keys=True)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _fingerprint_data(cls):
+        return {
+            'allow_extra': cls._allow_extra,
+            'fields': dict((name, field.fingerprint_data())
+                           for name, field in cls._fields.items()),
+        }
+
+    @classmethod
+    def validate_to_dict(cls, data=None, **kwargs):
+        """
+        Normalize and validate data exactly as the constructor does, but
+        return the result as plain python data, like :meth:`to_dict`, without
+        creating any configs
+
+        >>> class Point(Config):
+        ...     x = Field(int)
+        >>> class Line(Config):
+        ...     points = ListField(Point)
+        >>> Line.validate_to_dict({'points': [{'x': '1'}]})
+        {'points': [{'x': 1}]}
+        """
+        data = dict(data or {}, **kwargs)
+        return cls._normalize(data, context=_ParseContext(plain=True))
+
+    @classmethod
+    def validate_to_dicts(cls, items):
+        """Return a list of :meth:`validate_to_dict` for each item of data"""
+        context = _ParseContext(plain=True)
+        normalize = cls._normalize
+        return [normalize(data, context=context) for data in items]
+
+    @classmethod
+    def _flat_trie(cls, sep, fold_case):
+        return cls._cached(('flat', sep, fold_case),
+                           lambda: compile_flat(cls, sep, fold_case))
+
+    @classmethod
+    def from_flat(cls, mapping, sep='.', fold_case=False, prefix=None,
+                  **options):
+        """
+        Create a config from flat keys, such as environment variables, where
+        nested fields and list indices are joined by `sep`.  Keys are routed
+        through a trie of the config's keys, which is built once per class.
+
+        :param sep: Separator between the segments of a key
+        :param fold_case: If `True`, match keys regardless of case
+        :param prefix: If not `None`, only read keys that start with the
+                       prefix and the separator, e.g. `APP__`
+        :param options: Options for :meth:`parse`
+
+        >>> class Database(Config):
+        ...     host = Field(required=True)
+        ...     port = Field(int, default=5432)
+        >>> class App(Config):
+        ...     db = Field(Database, required=True)
+        ...     workers = ListField(int)
+        >>> app = App.from_flat({'APP__DB__HOST': 'localhost',
+        ...                      'APP__WORKERS__0': '4', 'HOME': '/root'},
+        ...                     sep='__', fold_case=True, prefix='app')
+        >>> app.db.host, app.db.port, app.workers
+        ('localhost', 5432, [4])
+        """
+        data = unflatten(cls, mapping, sep=sep, fold_case=fold_case,
+                         prefix=prefix)
+        return cls.parse(data, **options) if options else cls(data)
+
+    @classmethod
+    def is_valid(cls, data=None, **kwargs):
+        """
+        Return whether the constructor would accept the data.  Missing required
+        fields and unexpected keys, including those of nested configs, are
+        found before normalizing the data, so most invalid data is rejected
+        without creating a config or an error.
+        """
+        if data is None:
+            data = {}
+        if kwargs:
+            data = dict(data, **kwargs)
+
+        if not isinstance(data, dict) or cls._rejects(data):
+            return False
+
+        try:
+            cls._normalize(data)
+        except (ValidationError, PropertyError):
+            return False
+
+        return True
+
+    @classmethod
+    def _rejects(cls, data):
+        """
+        Return `True` if data is certainly invalid, which is checked using only
+        the keys of the data and of any nested configs
+        """
+        required, allowed, nested = cls._cached('checks', cls._build_checks)
+
+        if allowed is not None and not allowed.issuperset(data):
+            return True
+
+        for key in required:
+            if key not in data:
+                return True
+
+        for key, config_type, many in nested:
+            value = data.get(key)
+            if many and isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict) and config_type._rejects(item):
+                        return True
+            elif not many and isinstance(value, dict):
+                if config_type._rejects(value):
+                    return True
+
+        return False
+
+    @classmethod
+    def _build_checks(cls):
+        required = tuple(field.key or name
+                         for name, field in cls._fields.items()
+                         if field.required)
+        allowed = None if cls._allow_extra else frozenset(cls._fields)
+
+        # Configs that normalize the value of a field directly; streamed
+        # items are only normalized when the stream is read
+        nested = tuple((field.key or name, field.config_type,
+                        isinstance(field, ListField))
+                       for name, field in cls._fields.items()
+                       if field.config_type is not None and
+                       len(field.types) == 1 and
+                       not getattr(field, 'stream', False))
+
+        return required, allowed, nested
+
+    @classmethod
+    def from_trusted(cls, data, fingerprint):
+        """
+        Create a config from data that is known to be valid, such as the
+        output of :meth:`to_dict` from a config with the same schema.  No
+        coercion or validation is performed, so this is much faster than
+        normalizing the data, but the result is undefined if the data is not
+        actually valid.
+
+        The `fingerprint` of the schema that produced the data (see
+        :meth:`fingerprint`) must match that of this config, or
+        :class:`FingerprintError` is thrown.
+
+        >>> class Server(Config):
+        ...     port = Field(int, default=80)
+        >>> data, fingerprint = Server().to_dict(), Server.fingerprint()
+        >>> Server.from_trusted(data, fingerprint).port
+        80
+        """
+        if fingerprint != cls.fingerprint():
+            raise FingerprintError(
+                'Data for {0} was produced by a different schema'.format(
+                    cls.__name__))
+
+        return cls._from_trusted(data)
+
+    @classmethod
+    def _from_trusted(cls, data, parent=None):
+        config = cls(NormalizedDict(), __parent=parent)
+        config._properties.update(cls._trusted_properties(data, config))
+        return config
+
+    @classmethod
+    def _trusted_properties(cls, data, parent):
+        properties = NormalizedDict()
+        for name, field in cls._fields.items():
+            if name in data:
+                properties[name] = field.from_trusted(data[name], parent=parent,
+                                                      name=name)
+            else:
+                # Missing keys get the same default as a normalized config
+                properties[name] = field.normalize({}, name, parent=parent)[1]
+
+        return properties
+
+    @classmethod
+    def describe(cls):
+        """
+        Return a pretty-formatted string that describes the format of the data
+        """
+        return cls._cached('describe', cls._build_description)
+
+    @classmethod
+    def _build_description(cls):
         names = sorted(name for name, field in cls._fields.items()
                        if not field.hidden)
         desc = ['{0} {1}'.format(name, cls._fields[name].describe())
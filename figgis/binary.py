@@ -0,0 +1,285 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Compact, schema-driven binary serialization of :class:`~figgis.Config`
+instances.
+
+Fields are written in a fixed order without their names, and nested configs
+are written inline, so the data can only be read by a config with the same
+schema.  The schema's :meth:`~figgis.Config.fingerprint` is written to the
+header and checked when loading.  Loading does not normalize or validate the
+data, so it is much faster than creating a config from, e.g., json.
+
+>>> from figgis import Config, Field
+>>> from figgis import binary
+>>> class Server(Config):
+...     host = Field(required=True)
+...     port = Field(int, default=80)
+>>> data = binary.dumps(Server(host='example.com'))
+>>> binary.loads(Server, data).port
+80
+"""
+
+import binascii
+import struct
+
+import six
+
+from figgis import (Config, ColumnarList, SpilledList, IndexedList,
+                    NormalizedDict, FingerprintError)
+
+
+__all__ = ['dumps', 'loads']
+
+
+MAGIC = b'FGB\x01'
+
+# Value tags
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT8 = 0x03
+_INT32 = 0x04
+_INT64 = 0x05
+_BIGINT = 0x06
+_FLOAT = 0x07
+_TEXT8 = 0x08
+_TEXT32 = 0x09
+_BYTES = 0x0a
+_LIST = 0x0b
+_TUPLE = 0x0c
+_DICT = 0x0d
+_CONFIG = 0x0e
+
+_UINT8 = struct.Struct('<B')
+_INT8_STRUCT = struct.Struct('<b')
+_INT32_STRUCT = struct.Struct('<i')
+_INT64_STRUCT = struct.Struct('<q')
+_UINT32 = struct.Struct('<I')
+_DOUBLE = struct.Struct('<d')
+
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def field_order(cls):
+    """
+    Return the names of a config's fields in the order in which they are
+    serialized, which does not depend on dictionary ordering
+    """
+    return cls._cached('binary_field_order', lambda: tuple(sorted(cls._fields)))
+
+
+######################################################################
+# Encoding
+######################################################################
+
+def _encode_int(out, value):
+    if -128 <= value < 128:
+        out.append(_INT8)
+        out += _INT8_STRUCT.pack(value)
+    elif _INT32_MIN <= value <= _INT32_MAX:
+        out.append(_INT32)
+        out += _INT32_STRUCT.pack(value)
+    elif _INT64_MIN <= value <= _INT64_MAX:
+        out.append(_INT64)
+        out += _INT64_STRUCT.pack(value)
+    else:
+        _encode_sized(out, _BIGINT, str(value).encode('ascii'))
+
+
+def _encode_sized(out, tag, data):
+    out.append(tag)
+    out += _UINT32.pack(len(data))
+    out += data
+
+
+def _encode_items(out, tag, items, config_type):
+    out.append(tag)
+    out += _UINT32.pack(len(items))
+    for item in items:
+        _encode_value(out, item, config_type)
+
+
+def _encode_value(out, value, config_type=None):
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, six.integer_types):
+        _encode_int(out, value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, six.text_type):
+        data = value.encode('utf-8')
+        if len(data) < 256:
+            out.append(_TEXT8)
+            out.append(len(data))
+            out += data
+        else:
+            _encode_sized(out, _TEXT32, data)
+    elif isinstance(value, six.binary_type):
+        _encode_sized(out, _BYTES, value)
+    elif isinstance(value, Config):
+        if config_type is None or type(value) is not config_type:
+            raise TypeError('Can not encode config of type {0} in a field of '
+                            'type {1}'.format(type(value).__name__,
+                                              config_type))
+
+        out.append(_CONFIG)
+        _encode_config(out, value)
+    elif isinstance(value, (list, SpilledList, ColumnarList)):
+        _encode_items(out, _LIST, value, config_type)
+    elif isinstance(value, tuple):
+        _encode_items(out, _TUPLE, value, config_type)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        out += _UINT32.pack(len(value))
+        for key, item in value.items():
+            _encode_value(out, key)
+            _encode_value(out, item)
+    else:
+        raise TypeError('Can not encode value of type {0}'.format(
+            type(value).__name__))
+
+
+def _encode_config(out, config):
+    cls = type(config)
+    fields = cls._fields
+    properties = config._properties
+    for name in field_order(cls):
+        _encode_value(out, properties.get(name), fields[name].config_type)
+
+
+def dumps(config):
+    """
+    Serialize a config to bytes.  Throws `TypeError` if any value is not
+    `None`, a `bool`, number, string, list, tuple, `dict` or nested config,
+    or if a :class:`~figgis.ListField` uses `stream`.
+    """
+    out = bytearray(MAGIC)
+    out += binascii.unhexlify(type(config).fingerprint())
+    _encode_config(out, config)
+    return bytes(out)
+
+
+######################################################################
+# Decoding
+######################################################################
+
+class _Decoder(object):
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, size):
+        start, self.pos = self.pos, self.pos + size
+        if self.pos > len(self.data):
+            raise ValueError('Truncated figgis binary data')
+
+        return self.data[start:self.pos]
+
+    def unpack(self, struct_):
+        value, = struct_.unpack_from(self.data, self.pos)
+        self.pos += struct_.size
+        return value
+
+    def value(self, config_type=None, parent=None):
+        tag = self.unpack(_UINT8)
+
+        if tag == _TEXT8:
+            return self.read(self.unpack(_UINT8)).decode('utf-8')
+        elif tag == _INT8:
+            return self.unpack(_INT8_STRUCT)
+        elif tag == _NONE:
+            return None
+        elif tag == _TRUE:
+            return True
+        elif tag == _FALSE:
+            return False
+        elif tag == _FLOAT:
+            return self.unpack(_DOUBLE)
+        elif tag == _INT32:
+            return self.unpack(_INT32_STRUCT)
+        elif tag == _CONFIG:
+            if config_type is None:
+                raise ValueError('Unexpected config in figgis binary data')
+
+            return self.config(config_type, parent)
+        elif tag == _LIST:
+            return [self.value(config_type, parent)
+                    for _ in range(self.unpack(_UINT32))]
+        elif tag == _TEXT32:
+            return self.read(self.unpack(_UINT32)).decode('utf-8')
+        elif tag == _INT64:
+            return self.unpack(_INT64_STRUCT)
+        elif tag == _BIGINT:
+            return int(self.read(self.unpack(_UINT32)).decode('ascii'))
+        elif tag == _BYTES:
+            return bytes(self.read(self.unpack(_UINT32)))
+        elif tag == _TUPLE:
+            return tuple(self.value(config_type, parent)
+                         for _ in range(self.unpack(_UINT32)))
+        elif tag == _DICT:
+            return dict((self.value(), self.value())
+                        for _ in range(self.unpack(_UINT32)))
+
+        raise ValueError('Invalid tag in figgis binary data: {0}'.format(tag))
+
+    def config(self, cls, parent=None):
+        config = cls(NormalizedDict(), __parent=parent)
+        properties = config._properties
+        fields = cls._fields
+
+        for name in field_order(cls):
+            field = fields[name]
+            value = self.value(field.config_type, config)
+
+            if getattr(field, 'columnar', False):
+                table = ColumnarList(field.config_type, parent=config)
+                for item in value:
+                    table._append(None if item is None else item._properties)
+                value = table.compact()
+            elif getattr(field, 'spill', False):
+                value = SpilledList(value, parent=config)
+            elif getattr(field, 'index', None):
+                value = IndexedList(value, field, name, parent=config)
+            elif getattr(field, 'sample', None) is not None:
+                value = field.sampled_list(value)
+
+            properties[name] = value
+
+        return config
+
+
+def loads(cls, data):
+    """
+    Create a config of the given type from bytes produced by :func:`dumps`.
+    Throws :class:`~figgis.FingerprintError` if the data was produced by a
+    config with a different schema, or `ValueError` if the data is invalid.
+    """
+    decoder = _Decoder(data)
+    try:
+        if decoder.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not figgis binary data')
+
+        fingerprint = binascii.hexlify(decoder.read(20)).decode('ascii')
+        if fingerprint != cls.fingerprint():
+            raise FingerprintError(
+                'Data for {0} was produced by a different schema'.format(
+                    cls.__name__))
+
+        config = decoder.config(cls)
+    except struct.error:
+        raise ValueError('Truncated figgis binary data')
+
+    if decoder.pos != len(data):
+        raise ValueError('Trailing data after figgis binary data')
+
+    return config
@@ -0,0 +1,71 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Report the memory used by configs, using :meth:`~figgis.Config.memory_usage`.
+To report on a config parsed from a json file, run::
+
+    python -m figgis.memory mypackage.module:MyConfig data.json
+"""
+
+from __future__ import print_function
+
+from importlib import import_module
+import argparse
+import json
+import sys
+
+
+__all__ = ['heaviest', 'format_report']
+
+
+def heaviest(config, count=10, deep=True):
+    """
+    Return the `(path, bytes)` of the fields of a config that use the most
+    memory, largest first.  The size of a field includes its nested fields.
+    """
+    usage = config.memory_usage(deep=deep)
+    usage.pop('', None)
+    return sorted(usage.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+
+def format_report(config, count=10, deep=True):
+    """Return a table of the fields that use the most memory"""
+    total = config.memory_usage(deep=deep)['']
+    lines = ['{0:>12}  {1}'.format(total, '(total)')]
+    lines.extend('{0:>12}  {1}'.format(size, path)
+                 for path, size in heaviest(config, count=count, deep=deep))
+    return '\n'.join(lines)
+
+
+def load_class(name):
+    """Import a config class given as `module:Class`"""
+    module, _, attr = name.partition(':')
+    if not attr:
+        raise ValueError('Expected module:Class, got {0}'.format(name))
+
+    return getattr(import_module(module), attr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Report the memory used by a config parsed from json')
+    parser.add_argument('config', help='Config class, as module:Class')
+    parser.add_argument('data', help="json file to parse, or '-' for stdin")
+    parser.add_argument('-n', '--count', type=int, default=10,
+                        help='Number of fields to report')
+    args = parser.parse_args(argv)
+
+    cls = load_class(args.config)
+    if args.data == '-':
+        data = json.load(sys.stdin)
+    else:
+        with open(args.data) as handle:
+            data = json.load(handle)
+
+    print(format_report(cls(data), count=args.count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,652 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+"""
+Differential testing of the ways that figgis normalizes data.
+
+:func:`reference_normalize` is a deliberately simple implementation of the
+semantics of :meth:`Field.normalize <figgis.Field.normalize>`, without any
+of the specialized coercers, compiled validators, cached defaults or other
+fast paths.  It also describes how each kind of :class:`ListField
+<figgis.ListField>` (e.g. `stream` or `columnar`) orders its coercion and
+checks.  :func:`check` normalizes data with the reference and with each
+mode in :data:`MODES`, e.g. :meth:`Config.parse <figgis.Config.parse>` with
+`intern=True` or :mod:`figgis.binary`, and throws :class:`AssertionError`
+unless they all produce the same data, or errors of the same type, code and
+path.  :func:`fuzz` checks randomly generated schemas and data:
+
+>>> from figgis.testing import fuzz
+>>> fuzz(iterations=10, seed=1)
+"""
+
+from __future__ import print_function
+
+from copy import copy, deepcopy
+from inspect import isclass, isfunction
+from types import GeneratorType
+import random
+import six
+
+from figgis import (Config, Field, ListField, ValidationError, PropertyError,
+                    NotSpecified, Range, Length, Sample, validator_cost,
+                    binary)
+
+
+__all__ = ['reference_normalize', 'MODES', 'run_mode', 'check',
+           'random_schema', 'random_data', 'fuzz']
+
+
+_TRUTHY = frozenset((1, 'true', 'True', 'yes', '1', True))
+_FALSEY = frozenset((0, 'false', 'False', 'no', '0', False))
+
+_ERRORS = (ValidationError, PropertyError)
+
+
+######################################################################
+# Reference
+######################################################################
+
+def _error(cls, code, location):
+    return cls.lazy(code, '{0}: {1}', (code, location), location)
+
+
+class _State(object):
+
+    """Options of a single call to :func:`reference_normalize`"""
+
+    def __init__(self, defer_validation):
+        # Validators to run once every type has been applied, if deferred
+        self.pending = [] if defer_validation else None
+
+    def inline(self):
+        """Return a copy of the state that runs validators immediately"""
+        state = copy(self)
+        state.pending = None
+        return state
+
+
+def _is_config(type_):
+    return isclass(type_) and issubclass(type_, Config)
+
+
+def _engine(field):
+    """Return the name of the way that a list field normalizes its items"""
+    for engine in ('stream', 'spill', 'columnar', 'sample', 'index'):
+        if getattr(field, engine):
+            return engine
+
+    return 'list'
+
+
+def _coerce(type_, value):
+    """Coerce a value that is not `None` to a type, or return `NotSpecified`"""
+    if isclass(type_) and isinstance(value, type_):
+        return value
+    elif type_ is bool:
+        try:
+            if value in _TRUTHY:
+                return True
+            elif value in _FALSEY:
+                return False
+        except TypeError:
+            # Unhashable
+            pass
+        return NotSpecified
+
+    try:
+        return type_(value)
+    except (TypeError, ValueError):
+        if isfunction(type_):
+            raise
+        return NotSpecified
+
+
+def _normalize_value(field, type_, value, prefixed, state):
+    """Apply one of a field's types to a single value"""
+    if value is None:
+        if not field.nullable:
+            raise _error(ValidationError, 'type', prefixed)
+        return None
+    elif isclass(type_) and issubclass(type_, Config):
+        if not isinstance(value, (type_, dict)):
+            raise _error(ValidationError, 'type', prefixed)
+        elif isinstance(value, type_):
+            return value.to_dict()
+        return _normalize(type_, value, prefixed, None, state)
+
+    coerced = _coerce(type_, value)
+    if coerced is NotSpecified:
+        raise _error(ValidationError, 'type', prefixed)
+
+    return coerced
+
+
+def _validators(field, reference):
+    """Return the field's own validators and the reference choice check"""
+    own = [validator for validator in field.validators
+           if getattr(validator, '__self__', None) is not field]
+    return sorted(own + [reference], key=validator_cost)
+
+
+def _validate(field, value, prefixed, choices):
+    def check_choices(value):
+        if choices is None:
+            return True
+
+        values = value if isinstance(field, ListField) else [value]
+        for item in values:
+            if item not in choices:
+                raise _error(ValidationError, 'choice', prefixed)
+
+        return True
+
+    check_choices.cost = 0
+
+    for validator in _validators(field, check_choices):
+        try:
+            valid = validator(value)
+        except ValidationError as ex:
+            raise _error(ValidationError, ex.code or 'invalid', prefixed)
+
+        if not valid:
+            raise _error(ValidationError, 'invalid', prefixed)
+
+
+def _check_choice(field, value, location):
+    if field.choices is not None and value not in field.choices:
+        raise _error(ValidationError, 'choice', location)
+
+
+def _check_unique(field, values, prefixed):
+    for name in field.index:
+        seen = {}
+        for i, item in enumerate(values):
+            value = None if item is None else item.get(name)
+            if value is None:
+                continue
+
+            try:
+                duplicate = value in seen
+            except TypeError:
+                raise _error(ValidationError, 'invalid', (prefixed, i, name))
+
+            if duplicate:
+                raise _error(ValidationError, 'unique', (prefixed, i, name))
+            seen[value] = True
+
+
+def _normalize_item(field, value, location, state):
+    for type_ in field.types:
+        value = _normalize_value(field, type_, value, location, state)
+    return value
+
+
+def _normalize_stream(field, values, prefixed, state):
+    """Normalize the items of a stream as it is consumed, after the parse"""
+    state = state.inline()
+    for i, value in enumerate(values):
+        location = '{0}.{1}'.format(prefixed, i)
+        value = _normalize_item(field, value, location, state)
+        _check_choice(field, value, location)
+        yield value
+
+
+def _normalize_list(field, value, prefixed, state):
+    if value is None and not field.required and field.default is NotSpecified:
+        value = []
+    elif not isinstance(value, list):
+        raise _error(ValidationError, 'list', prefixed)
+
+    engine = _engine(field)
+    if engine == 'stream':
+        return _normalize_stream(field, value, prefixed, state)
+    elif engine in ('spill', 'columnar'):
+        # Every type is applied to each item in turn
+        items = []
+        for i, item in enumerate(value):
+            location = '{0}.{1}'.format(prefixed, i)
+            item = _normalize_item(field, item, location, state)
+            if engine == 'spill':
+                _check_choice(field, item, location)
+            items.append(item)
+        return items
+
+    # Every item has each type applied before the next type
+    for type_ in field.types:
+        value = [_normalize_value(field, type_, item,
+                                  '{0}.{1}'.format(prefixed, i), state)
+                 for i, item in enumerate(value)]
+
+    if engine == 'sample':
+        for i, item in enumerate(value):
+            _check_choice(field, item, '{0}.{1}'.format(prefixed, i))
+    elif engine == 'index':
+        _check_unique(field, value, prefixed)
+
+    return value
+
+
+def _normalize_field(field, name, data, prefix, state):
+    prefixed = name if prefix is None else '{0}.{1}'.format(prefix, name)
+
+    key = field.key or name
+    if key in data:
+        exists, value = True, data[key]
+    elif field.required:
+        raise _error(PropertyError, 'required', prefixed)
+    elif field.default_factory is not None:
+        exists, value = True, field.default_factory()
+    else:
+        exists = field.default is not NotSpecified
+        value = field.default if exists else None
+
+    if isinstance(field, ListField):
+        value = _normalize_list(field, value, prefixed, state)
+
+        # Lazy and sampled lists check choices item by item
+        choices = (None if _engine(field) in ('stream', 'spill', 'sample')
+                   else field.choices)
+    else:
+        value = _normalize_item(field, value, prefixed, state)
+        choices = field.choices
+
+    if not exists:
+        pass
+    elif state.pending is not None:
+        state.pending.append((field, value, prefixed, choices))
+    else:
+        _validate(field, value, prefixed, choices)
+
+    return value
+
+
+def _normalize(cls, data, prefix, allow_extra, state):
+    extra = frozenset(data) - frozenset(cls._fields)
+    if extra and not (cls._allow_extra if allow_extra is None
+                      else allow_extra):
+        raise _error(PropertyError, 'extra',
+                     (prefix, six.next(iter(extra))))
+
+    return dict((name, _normalize_field(field, name, data, prefix, state))
+                for name, field in cls._fields.items())
+
+
+def reference_normalize(cls, data, allow_extra=None, defer_validation=False):
+    """
+    Normalize data for a config class into plain data, as
+    :meth:`Config.to_dict <figgis.Config.to_dict>` would return it, or throw
+    the error that the config would throw.  If `allow_extra` is not `None`,
+    it overrides the `__allow_extra__` of the class, but not of nested
+    configs.  If `defer_validation` is `True`, validators only run once
+    every type has been applied.  Like the config, streams are generators,
+    which throw the errors of their items as they are consumed.
+    """
+    state = _State(defer_validation)
+    normalized = _normalize(cls, data, None, allow_extra, state)
+
+    for field, value, prefixed, choices in state.pending or ():
+        _validate(field, value, prefixed, choices)
+
+    return normalized
+
+
+######################################################################
+# Modes
+######################################################################
+
+def _consume(value):
+    """Convert the streams in plain data to lists, depth first"""
+    if isinstance(value, dict):
+        return dict((key, _consume(item)) for key, item in value.items())
+    elif isinstance(value, (list, GeneratorType)):
+        return [_consume(item) for item in value]
+
+    return value
+
+
+def _fields(cls):
+    # Fields are projected in order, so project them all in the class's order
+    return list(cls._fields)
+
+
+def _deferred(cls, data):
+    config = cls.parse(data, defer_validation=True)
+    config.validation.result()
+    return config.to_dict()
+
+
+def _overlay(cls, data):
+    # Replace every field that is in the data by normalizing it again
+    changes = dict((name, data[field.key or name])
+                   for name, field in cls._fields.items()
+                   if (field.key or name) in data)
+    return cls(data).overlay(**changes).to_dict()
+
+
+def _flatten(cls, data, prefix='', flat=None):
+    """Convert data for a config class into flat keys for `from_flat`"""
+    if flat is None:
+        flat = {}
+
+    keys = dict((field.key or name, field)
+                for name, field in cls._fields.items())
+    for key, value in data.items():
+        field, path = keys.get(key), prefix + key
+        config_type = None if field is None else field.config_type
+        if isinstance(field, ListField) and isinstance(value, list) and value:
+            for i, item in enumerate(value):
+                item_path = '{0}.{1}'.format(path, i)
+                if config_type is not None and type(item) is dict and item:
+                    _flatten(config_type, item, item_path + '.', flat)
+                else:
+                    flat[item_path] = item
+        elif (config_type is not None and not isinstance(field, ListField) and
+                type(value) is dict and value):
+            _flatten(config_type, value, path + '.', flat)
+        else:
+            # Empty containers have no keys of their own
+            flat[path] = value
+
+    return flat
+
+
+def _limited(cls, data):
+    return cls.parse(data, max_depth=64, max_list_length=1000,
+                     max_values=100000, time_budget=60,
+                     cpu_budget=60).to_dict()
+
+
+# Each mode normalizes data for a config class into plain data, and the
+# options for reference_normalize that produce the same result
+MODES = {
+    'config': (lambda cls, data: cls(data).to_dict(), {}),
+    'plain': (lambda cls, data: cls.validate_to_dict(data), {}),
+    'intern': (lambda cls, data: cls.parse(data, intern=True).to_dict(), {}),
+    'weak_parents': (
+        lambda cls, data: cls.parse(data, weak_parents=True).to_dict(), {}),
+    'deferred': (_deferred, {'defer_validation': True}),
+    'projection': (
+        lambda cls, data: cls.parse(data, only=_fields(cls)).to_dict(),
+        {'allow_extra': True}),
+    'limits': (_limited, {}),
+    'overlay': (_overlay, {}),
+    'from_flat': (lambda cls, data: cls.from_flat(_flatten(cls, data)).to_dict(),
+                  {}),
+    'is_valid': (lambda cls, data: cls.is_valid(data), {}),
+    'trusted': (
+        lambda cls, data: cls.from_trusted(_consume(cls(data).to_dict()),
+                                           cls.fingerprint()).to_dict(), {}),
+    'binary': (
+        lambda cls, data: binary.loads(cls, binary.dumps(cls(data))).to_dict(),
+        {}),
+}
+
+
+def run_mode(mode, cls, data):
+    """
+    Normalize data with one of the :data:`MODES`, and return `('ok', value)`
+    or `('error', type, code, path)`
+    """
+    normalize = MODES[mode][0] if mode in MODES else mode
+    try:
+        return ('ok', _consume(normalize(cls, data)))
+    except _ERRORS as ex:
+        return ('error', type(ex), ex.code, ex.path)
+
+
+def check(cls, data, modes=None):
+    """
+    Check that each mode (by default, all of :data:`MODES`) normalizes data
+    like the reference.  Throws :class:`AssertionError` if not.  The binary
+    mode is skipped for schemas with streams, which it can not encode.
+    """
+    for mode in sorted(MODES) if modes is None else modes:
+        if mode == 'binary' and cls._has_streams():
+            continue
+
+        options = MODES[mode][1]
+        if mode == 'is_valid':
+            # Streams are not consumed, so the errors of their items are
+            # ignored
+            try:
+                reference_normalize(cls, data, **options)
+            except _ERRORS:
+                expected = ('ok', False)
+            else:
+                expected = ('ok', True)
+        else:
+            expected = run_mode(
+                lambda cls, data: reference_normalize(cls, data, **options),
+                cls, data)
+
+        result = run_mode(mode, cls, data)
+        if result != expected:
+            raise AssertionError(
+                'Mode {0} differs from the reference for {1} with data {2!r}:'
+                ' {3!r} != {4!r}'.format(mode, cls.__name__, data, result,
+                                         expected))
+
+
+######################################################################
+# Random schemas and data
+######################################################################
+
+def _text(value):
+    """Field type that accepts any value, as text"""
+    return six.text_type(value)
+
+
+def _magnitude(value):
+    """Field type that makes numbers positive and keeps other values"""
+    if isinstance(value, (float,) + six.integer_types):
+        return abs(value)
+    return value
+
+
+_SCALARS = (int, float, bool, six.text_type, dict, _text, _magnitude)
+
+# Types applied one after another
+_CHAINS = ((six.text_type, int), (float, int), (int, _magnitude),
+           (_text, six.text_type), (dict, _text))
+
+_VALUES = {
+    int: lambda rng: rng.choice([rng.randint(-5, 5), str(rng.randint(0, 9))]),
+    float: lambda rng: rng.choice([rng.uniform(-5, 5), rng.randint(-5, 5),
+                                   '1.5']),
+    bool: lambda rng: rng.choice([True, False, 'yes', 'no', 0, 1, 'true']),
+    six.text_type: lambda rng: rng.choice(['a', 'b', 'c', 'abc', 1]),
+    dict: lambda rng: rng.choice([{}, {'a': 1}, [('b', 2)]]),
+    _text: lambda rng: rng.choice(['a', 1, 2.5, True]),
+    _magnitude: lambda rng: rng.choice([-3, 2, 1.5, 'x']),
+}
+
+_JUNK = (None, 'x', '', 1.5, -1, [], [1], {}, {'a': None}, True, '2')
+
+
+def _random_types(rng, depth, name):
+    if depth > 0 and rng.random() < 1.0 / (len(_SCALARS) + 1):
+        config_type = random_schema(rng, depth - 1, name.capitalize())
+        return (dict, config_type) if rng.random() < 0.2 else (config_type,)
+    elif rng.random() < 0.2:
+        return rng.choice(_CHAINS)
+
+    return (rng.choice(_SCALARS),)
+
+
+def _not_equal(forbidden):
+    """Validator that returns `False` for a single value"""
+    return lambda value: value != forbidden
+
+
+def _normalized(types, value):
+    for type_ in types:
+        value = type_(value)
+    return value
+
+
+def _random_validators(rng, types, is_list):
+    validators = []
+    last = types[-1]
+    if last in (int, float) and rng.random() < 0.3:
+        validators.append(Range(min=rng.randint(-5, 0), max=rng.randint(0, 5)))
+    elif last is six.text_type and rng.random() < 0.3:
+        validators.append(Length(max=2))
+
+    if is_list:
+        validators = [(lambda validator: lambda values: all(
+            validator(value) for value in values))(validator)
+            for validator in validators]
+        if rng.random() < 0.15:
+            validators.append(lambda values: len(values) != 2)
+    elif types[0] in _VALUES and rng.random() < 0.15:
+        try:
+            validators.append(_not_equal(_normalized(
+                types, _VALUES[types[0]](rng))))
+        except (TypeError, ValueError):
+            pass
+
+    return validators
+
+
+def _random_list_options(rng, types, options):
+    config_type = types[-1] if _is_config(types[-1]) else None
+    engines = ['list', 'list', 'stream', 'spill', 'sample']
+    if config_type is not None:
+        engines.append('columnar')
+
+        # Nested lists and configs are only hashable as objects, not as data
+        keys = [name for name, field in config_type._fields.items()
+                if not isinstance(field, ListField) and
+                field.config_type is None]
+        if keys:
+            engines.append('index')
+
+    engine = rng.choice(engines)
+    if (engine == 'spill' and config_type is not None and
+            config_type._has_streams()):
+        # Spilled configs are pickled, and streams can not be
+        engine = 'list'
+
+    if engine == 'stream':
+        options.pop('validator', None)
+        options['stream'] = True
+    elif engine == 'spill':
+        options['spill'] = True
+    elif engine == 'sample':
+        # Sample every item, so that every item is validated
+        options['sample'] = Sample(head=100)
+    elif engine == 'columnar':
+        options['columnar'] = True
+    elif engine == 'index':
+        options['index'] = rng.choice(keys)
+
+
+def _random_field(rng, depth, name):
+    types = _random_types(rng, depth, name)
+    is_list = rng.random() < 0.3
+
+    options = {}
+    if rng.random() < 0.2:
+        options['required'] = True
+    if rng.random() < 0.2:
+        options['nullable'] = False
+    if rng.random() < 0.1:
+        options['key'] = '@' + name
+
+    if types[0] in _VALUES and not _is_config(types[-1]):
+        # Choices throw TypeError for unhashable values, which _magnitude keeps
+        if types != (_magnitude,) and rng.random() < 0.2:
+            try:
+                # Choices must be hashable and of the normalized type
+                choices = [_normalized(types, _VALUES[types[0]](rng))
+                           for _ in range(3)]
+                frozenset(choices)
+            except (TypeError, ValueError):
+                pass
+            else:
+                options['choices'] = choices
+
+        validators = _random_validators(rng, types, is_list)
+        if validators:
+            options['validator'] = validators
+
+    if not options.get('required') and rng.random() < 0.3:
+        data_type = _data_type(types)
+        default = ([_value(rng, data_type)] if is_list
+                   else _value(rng, data_type))
+        if rng.random() < 0.2:
+            options['default_factory'] = lambda: deepcopy(default)
+        else:
+            options['default'] = default
+
+    if is_list:
+        _random_list_options(rng, types, options)
+        return ListField(*types, **options)
+
+    return Field(*types, **options)
+
+
+def _data_type(types):
+    """Return the type of the data to generate for a field's types"""
+    return types[-1] if _is_config(types[-1]) else types[0]
+
+
+def _value(rng, type_):
+    if rng.random() < 0.15:
+        return rng.choice(_JUNK)
+    elif type_ in _VALUES:
+        return _VALUES[type_](rng)
+
+    return random_data(rng, type_)
+
+
+def random_schema(rng, depth=2, name='Schema'):
+    """Create a random config class, with configs nested up to `depth`"""
+    dct = {'__allow_extra__': rng.random() < 0.7}
+    for i in range(rng.randint(1, 5)):
+        field_name = '{0}{1}'.format(name.lower(), i)
+        dct[field_name] = _random_field(rng, depth, field_name)
+
+    return type(Config)(str(name), (Config,), dct)
+
+
+def random_data(rng, cls):
+    """Create random data, which is mostly valid, for a config class"""
+    data = {}
+    for name, field in cls._fields.items():
+        if rng.random() < 0.2:
+            continue
+
+        type_ = _data_type(field.types)
+        if isinstance(field, ListField) and rng.random() < 0.9:
+            value = [_value(rng, type_) for _ in range(rng.randint(0, 3))]
+        else:
+            value = _value(rng, type_)
+
+        data[field.key or name] = value
+
+    if rng.random() < 0.1:
+        data['unexpected'] = rng.choice(_JUNK)
+
+    return data
+
+
+def fuzz(iterations=100, seed=None, modes=None, depth=2):
+    """
+    :func:`check` random data for random schemas.  The error message of the
+    :class:`AssertionError` includes the seed that reproduces it.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    rng = random.Random(seed)
+    for i in range(iterations):
+        cls = random_schema(rng, depth)
+        for _ in range(5):
+            data = random_data(rng, cls)
+            try:
+                check(cls, data, modes)
+            except AssertionError as ex:
+                raise AssertionError('{0} (seed {1}, iteration {2})'.format(
+                    ex, seed, i))
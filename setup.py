@@ -61,7 +61,7 @@ if __name__ == '__main__':
         url='https://github.com/thesquelched/figgis',
         download_url=download_url(),
 
-        packages=find_packages(exclude=['tests']),
+        packages=find_packages(exclude=['tests', 'benchmarks']),
 
         classifiers=[
             'Development Status :: 5 - Production/Stable',
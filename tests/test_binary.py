@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from figgis import Config, Field, ListField, FingerprintError
+from figgis import binary
+
+import pytest
+import six
+
+
+class Address(Config):
+    street = Field(required=True)
+    number = Field(int)
+
+
+class Person(Config):
+    name = Field(required=True)
+    age = Field(int, default=0)
+    score = Field(float)
+    active = Field(bool, default=True)
+    data = Field(dict)
+    raw = Field(bytes)
+    address = Field(Address)
+    nicknames = ListField()
+    history = ListField(Address)
+
+
+def test_round_trip():
+    person = Person(
+        name=u'Jöhn', age=2 ** 40, score=1.5, active=False,
+        data={'a': [1, -300, None], 'b': (2 ** 70, u'x' * 300)},
+        raw=b'\x00\xff', address={'street': 'Main', 'number': 12},
+        nicknames=['J'], history=[{'street': 'Elm'}, {'street': 'Oak'}])
+
+    loaded = binary.loads(Person, binary.dumps(person))
+    assert loaded.to_dict() == person.to_dict()
+    assert loaded.address.parent is loaded
+    assert loaded.history[1].parent is loaded
+    assert loaded.history[1].number is None
+    assert loaded.data['b'] == (2 ** 70, u'x' * 300)
+
+
+def test_round_trip_lazy_lists():
+    class Conf(Config):
+        columns = ListField(Address, columnar=True)
+        spilled = ListField(Address, spill=True)
+
+    config = Conf(columns=[{'street': 'Main', 'number': 1}, None],
+                  spilled=[{'street': 'Elm'}])
+    loaded = binary.loads(Conf, binary.dumps(config))
+
+    assert loaded.to_dict() == config.to_dict()
+    assert loaded.columns[0].parent is loaded
+    assert loaded.spilled[0].street == 'Elm'
+
+
+def test_unsupported_value():
+    class Conf(Config):
+        value = Field(lambda value: value)
+
+    with pytest.raises(TypeError):
+        binary.dumps(Conf(value=object()))
+
+    with pytest.raises(TypeError):
+        binary.dumps(Conf(value=Address(street='Main')))
+
+
+def test_stream_not_supported():
+    class Conf(Config):
+        items = ListField(int, stream=True)
+
+    with pytest.raises(TypeError):
+        binary.dumps(Conf(items=[1, 2]))
+
+
+def test_fingerprint_mismatch():
+    data = binary.dumps(Address(street='Main'))
+
+    class Other(Config):
+        street = Field()
+
+    with pytest.raises(FingerprintError):
+        binary.loads(Other, data)
+
+
+def test_invalid_data():
+    data = binary.dumps(Address(street='Main'))
+
+    with pytest.raises(ValueError):
+        binary.loads(Address, b'JSON' + data[4:])
+
+    with pytest.raises(ValueError):
+        binary.loads(Address, data[:-1])
+
+    with pytest.raises(ValueError):
+        binary.loads(Address, data + b'\x00')
+
+
+def test_field_order_is_sorted():
+    assert binary.field_order(Person)[:3] == ('active', 'address', 'age')
+    assert isinstance(binary.dumps(Address(street='x')), six.binary_type)
@@ -2,9 +2,15 @@
 # Copyrights licensed under the BSD License. See the accompanying LICENSE
 # file for terms.
 
-from figgis import Config, Field, ListField, ValidationError, PropertyError
+from figgis import (Config, Field, ListField, ValidationError, PropertyError,
+                    FrozenConfigError, ProjectionError, IndexedList,
+                    LimitExceededError, ReadOnlyListError, Length)
 
 from copy import deepcopy
+import gc
+import threading
+import time
+import weakref
 import pytest
 import six
 
@@ -251,6 +257,29 @@ def test_list_choices():
     assert ChoiceConfig(values=[1, 2, 3]) is not None
 
 
+def test_list_choices_index():
+    class ChoiceConfig(Config):
+        values = ListField(int, choices=[1, 2, 3])
+
+    with pytest.raises(ValidationError) as exc:
+        ChoiceConfig(values=[1, 2, 15, 3, 16])
+
+    assert "Value '15' at index 2 is not a valid choice" in str(exc.value)
+
+
+def test_list_exact_types():
+    class ListConfig(Config):
+        values = ListField(int)
+
+    data = [1, 2, 3]
+    c = ListConfig(values=data)
+    assert c.values == data
+    assert c.values is not data
+
+    c = ListConfig(values=[1, '2', 3])
+    assert c.values == [1, 2, 3]
+
+
 def test_coerce():
     class SubConfig(Config):
         value = Field()
@@ -400,6 +429,16 @@ def test_reserved():
     pytest.raises(TypeError, create_bad_config3)
     pytest.raises(TypeError, create_bad_config4)
 
+    # Methods that figgis calls on configs may not be overwritten either
+    for name in ('fingerprint', 'freeze', 'parse', 'from_trusted'):
+        pytest.raises(TypeError, type(Config), 'BadConfig', (Config,),
+                      {name: Field()})
+
+    class Renamed(Config):
+        fingerprint_ = Field(key='fingerprint')
+
+    assert Renamed(fingerprint='abc').freeze().fingerprint_ == 'abc'
+
 
 def test_nullable():
     class TestConfig(Config):
@@ -430,6 +469,105 @@ def test_nullable_default():
     assert TestConfig(default='foo')
 
 
+def test_prepared_default():
+    coerced = []
+
+    class Port(int):
+        def __new__(cls, value):
+            coerced.append(value)
+            return int.__new__(cls, value)
+
+    class SubConfig(Config):
+        name = Field()
+
+    class TestConfig(Config):
+        port = Field(Port, default='80')
+        tags = Field(list, default=['a'])
+        sub = Field(SubConfig, default={'name': 'none'})
+        invalid = Field(int, default=0, validator=lambda value: value > 0)
+
+    first = TestConfig(invalid=1)
+    second = TestConfig(invalid=1)
+    assert first.port == second.port == 80
+    assert coerced == ['80']
+
+    first.tags.append('b')
+    assert second.tags == ['a']
+    assert TestConfig._fields['tags'].default == ['a']
+
+    assert first.sub == second.sub
+    assert first.sub is not second.sub
+    assert second.sub.parent is second
+
+    pytest.raises(ValidationError, TestConfig)
+    pytest.raises(ValidationError, TestConfig)
+
+
+def test_shared_default():
+    class Resource(object):
+        def __init__(self):
+            self.lock = threading.Lock()
+
+    shared = Resource()
+
+    class TestConfig(Config):
+        resource = Field(Resource, default=shared)
+        names = Field(set, default=set(['a']))
+
+    first, second = TestConfig(), TestConfig()
+    assert first.resource is second.resource is shared
+
+    first.names.add('b')
+    assert second.names == set(['a'])
+
+
+def test_default_with_stream():
+    class Inner(Config):
+        values = ListField(int, default=['1', '2'], stream=True)
+
+    class TestConfig(Config):
+        inner = Field(Inner, default={})
+
+    # Each config gets its own stream
+    for _ in range(2):
+        assert list(TestConfig().inner.values) == [1, 2]
+
+
+def test_default_with_factory():
+    counter = iter(range(10))
+
+    class Sub(Config):
+        id = Field(int, default_factory=lambda: six.next(counter))
+        label = Field(lambda value: 'label-' + value, default='a')
+
+    class Inner(Config):
+        sub = Field(Sub, default={})
+
+    class TestConfig(Config):
+        inner = Field(Inner, default={})
+
+    # Factories of nested configs run for every config
+    first, second = TestConfig(), TestConfig()
+    assert (first.inner.sub.id, second.inner.sub.id) == (0, 1)
+    assert second.inner.sub.label == 'label-a'
+
+
+def test_default_factory():
+    counter = iter(range(10))
+
+    class TestConfig(Config):
+        count = Field(int, default_factory=lambda: str(six.next(counter)))
+        items = ListField(int, default_factory=list)
+
+    first, second = TestConfig(), TestConfig()
+    assert (first.count, second.count) == (0, 1)
+    assert first.items == [] and first.items is not second.items
+    assert 'default_factory=<lambda>' in TestConfig.describe()
+
+    with pytest.raises(ValueError):
+        Field(list, default=[], default_factory=list)
+
+
 def test_allow_extra():
     class TestConfig(Config):
         __allow_extra__ = False
@@ -549,3 +687,783 @@ def test_subconfig_parent():
     assert conf.value == 1
     assert conf.child.value == 2
     assert conf.child.parent_value == 1
+
+
+def test_overlay():
+    class Child(Config):
+        value = Field(int)
+
+    class Conf(Config):
+        foo = Field(int, validator=lambda value: value > 0)
+        bar = Field(key='@bar')
+        child = Field(Child)
+
+    base = Conf({'foo': 1, '@bar': 'bar', 'child': {'value': 1}})
+    overlay = base.overlay(foo='2')
+
+    assert overlay.foo == 2
+    assert overlay.bar == 'bar'
+    assert overlay.child == base.child
+    assert overlay.get('foo') == 2
+    assert 'bar' in overlay
+    assert overlay.to_dict() == {'foo': 2, 'bar': 'bar', 'child': {'value': 1}}
+    assert list(base.overlay(bar='baz').to_dict()) == list(base.to_dict())
+    assert base.foo == 1
+
+    assert base.overlay(bar='baz').bar == 'baz'
+    assert base.overlay(child={'value': 5}).child.value == 5
+
+    overlay.update(foo=3)
+    assert overlay.foo == 3
+    assert base.foo == 1
+
+    nested = overlay.overlay(bar='nested')
+    assert (nested.foo, nested.bar) == (3, 'nested')
+    assert overlay.bar == 'bar'
+
+    pytest.raises(ValidationError, base.overlay, foo=0)
+    pytest.raises(PropertyError, base.overlay, baz=1)
+
+    # Nested values are copied the first time that they are read
+    class Tagged(Config):
+        tags = ListField()
+        child = Field(Child)
+        options = Field(dict)
+
+    tagged = Tagged(tags=['a'], child={'value': 1}, options={'a': [1]})
+    overlay = tagged.overlay()
+    overlay.tags.append('b')
+    overlay.child.update(value=2)
+    overlay.options['a'].append(2)
+    assert overlay.tags == ['a', 'b'] and overlay.child.value == 2
+    assert overlay.child.parent is overlay
+    assert overlay.options == {'a': [1, 2]}
+    assert tagged.to_dict() == {'tags': ['a'], 'child': {'value': 1},
+                                'options': {'a': [1]}}
+
+    # Frozen values can not change, so they are shared
+    tagged.freeze()
+    assert tagged.overlay().child is tagged.child
+
+
+def test_coerce_instance():
+    class SubConfig(Config):
+        value = Field(int)
+
+    class TestConfig(Config):
+        sub = Field(SubConfig)
+        subs = ListField(SubConfig)
+
+    sub = SubConfig(value=1)
+    tc = TestConfig(sub=sub, subs=[sub, {'value': 2}])
+    assert tc.sub is sub
+    assert tc.subs[0] is sub
+    assert tc.subs[1].value == 2
+
+
+def test_list_type_error_index():
+    class ListConfig(Config):
+        values = ListField(int)
+        flags = ListField(bool, nullable=False)
+
+    with pytest.raises(ValidationError) as exc:
+        ListConfig(values=[1, '2', 'three'])
+    assert 'values.2 is not of type int' in str(exc.value)
+
+    assert ListConfig(flags=['yes', 0, True]).flags == [True, False, True]
+    with pytest.raises(ValidationError) as exc:
+        ListConfig(flags=[True, None])
+    assert 'flags.1 is not of type bool' in str(exc.value)
+
+    pytest.raises(ValidationError, ListConfig, flags=[[]])
+
+    # Type errors do not chain the coercer's exception
+    class Single(Config):
+        value = Field(int)
+
+    for cls, data in ((ListConfig, {'values': [1, 'x']}), (Single, {'value': 'x'})):
+        with pytest.raises(ValidationError) as exc:
+            cls(data)
+        if six.PY3:
+            assert exc.value.__suppress_context__
+
+
+def test_freeze():
+    class Child(Config):
+        value = Field(int, read_only=False)
+
+    class Parent(Config):
+        child = Field(Child)
+        children = ListField(Child)
+
+    conf = Parent(child={'value': 1}, children=[{'value': 2}])
+    assert not conf.frozen
+    assert conf.freeze() is conf
+    assert conf.frozen
+    assert conf.child.frozen
+    assert conf.children[0].frozen
+
+    pytest.raises(FrozenConfigError, conf.update, child=None)
+    with pytest.raises(FrozenConfigError):
+        conf.child.value = 3
+    assert conf.child.value == 1
+
+    # Lists, dicts and sets are frozen too
+    class Values(Config):
+        tags = ListField()
+        options = Field(dict)
+        names = Field(set)
+
+    values = Values(tags=['a'], options={'a': [1]}, names=set(['a']))
+    values.freeze()
+    pytest.raises(FrozenConfigError, values.tags.append, 'b')
+    pytest.raises(FrozenConfigError, values.options['a'].append, 2)
+    with pytest.raises(FrozenConfigError):
+        values.options['b'] = 1
+    pytest.raises(AttributeError, getattr, values.names, 'add')
+    assert values == Values(tags=['a'], options={'a': [1]}, names=set(['a']))
+    assert values.to_dict() == {'tags': ['a'], 'options': {'a': [1]},
+                                'names': set(['a'])}
+    assert type(values.to_dict()['options']['a']) is list
+    assert deepcopy(values) == values
+
+    overlay = conf.overlay(child={'value': 5})
+    assert overlay.child.value == 5
+    assert not overlay.frozen
+
+
+def test_parse_intern():
+    class Address(Config):
+        street = Field()
+        number = Field(int)
+
+    class Store(Config):
+        name = Field()
+        label = Field()
+        address = Field(Address)
+
+    class Chain(Config):
+        stores = ListField(Store)
+        tags = ListField()
+
+    data = {
+        'stores': [
+            {'name': 'one', 'address': {'street': 'Main', 'number': 1}},
+            {'name': 'two', 'address': {'street': 'Main', 'number': 1}},
+            {'name': 'two', 'address': {'street': 'Main', 'number': 1}},
+            {'name': 'three', 'label': 1},
+            {'name': 'three', 'label': True},
+        ],
+        'tags': [''.join(['t', 'ag']), ''.join(['ta', 'g'])],
+    }
+    chain = Chain.parse(data, intern=True)
+    stores = chain.stores
+
+    assert stores[0].address is stores[1].address
+    assert stores[0] is not stores[1]
+    assert stores[1] is stores[2]
+    assert stores[1].frozen
+    assert stores[1].parent is None
+    assert stores[0].address.number == 1
+
+    # Equal, but differently typed, data are not shared
+    assert stores[3].label == '1'
+    assert stores[4].label == 'True'
+
+    assert chain.tags[0] is chain.tags[1]
+    assert chain.to_dict() == Chain(data).to_dict()
+
+    # Interned configs are shared, so nothing in them may change
+    class Branch(Config):
+        tags = ListField()
+        products = ListField(Address, columnar=True)
+        spilled = ListField(Address, spill=True)
+
+    class Branches(Config):
+        branches = ListField(Branch)
+
+    branch = {'tags': ['a'], 'products': [{'number': 1}],
+              'spilled': [{'number': 2}]}
+    first, second = Branches.parse({'branches': [branch, branch]},
+                                   intern=True).branches
+    assert first is second
+    pytest.raises(FrozenConfigError, first.tags.append, 'b')
+    row = first.products[0]
+    assert row.frozen
+    pytest.raises(FrozenConfigError, row.update, number=5)
+    with pytest.raises(FrozenConfigError):
+        row._properties['number'] = 5
+    pytest.raises(FrozenConfigError, first.set_path, 'products.0.number', 5)
+    assert first.spilled[0].frozen
+    assert second.to_dict() == Branch(branch).to_dict()
+
+    class Streamed(Config):
+        values = ListField(int, default=[1], stream=True)
+
+    class Streams(Config):
+        items = ListField(Streamed)
+
+    items = Streams.parse({'items': [{}, {}]}, intern=True).items
+    assert items[0] is not items[1]
+    assert [list(item.values) for item in items] == [[1], [1]]
+
+    pytest.raises(TypeError, Chain.parse, data, bogus=True)
+
+
+def test_nested_parent():
+    class GrandChild(Config):
+        value = Field(int)
+
+    class Child(Config):
+        grandchild = Field(GrandChild)
+        grandchildren = ListField(GrandChild)
+
+    class Parent(Config):
+        child = Field(Child)
+
+    conf = Parent(child={'grandchild': {}, 'grandchildren': [{}]})
+    assert conf.child.parent is conf
+    assert conf.child.grandchild.parent is conf.child
+    assert conf.child.grandchildren[0].parent is conf.child
+
+
+def test_parse_weak_parents():
+    class GrandChild(Config):
+        value = Field(int)
+
+    class Child(Config):
+        grandchild = Field(GrandChild)
+
+    class Parent(Config):
+        child = Field(Child)
+        children = ListField(Child)
+
+    data = {'child': {'grandchild': {}}, 'children': [{'grandchild': {}}]}
+    conf = Parent.parse(data, weak_parents=True)
+    child = conf.child
+    assert child.parent is conf
+    assert child.grandchild.parent is child
+    assert conf.children[0].parent is conf
+    assert conf.children[0].grandchild.parent is conf.children[0]
+
+    gc.disable()
+    try:
+        ref = weakref.ref(conf)
+        del conf
+        # Freed by reference counting alone
+        assert ref() is None
+        assert child.parent is None
+    finally:
+        gc.enable()
+
+
+def test_parse_limits():
+    class Leaf(Config):
+        value = Field(int)
+
+    class Branch(Config):
+        leaves = ListField(Leaf)
+
+    class Tree(Config):
+        branches = ListField(Branch)
+
+    data = {'branches': [{'leaves': [{'value': i} for i in range(3)]}
+                         for _ in range(2)]}
+    assert Tree.parse(data, max_depth=3, max_list_length=3, max_values=20,
+                      time_budget=10, cpu_budget=10) == Tree(data)
+
+    with pytest.raises(LimitExceededError) as exc:
+        Tree.parse(data, max_depth=2)
+    assert exc.value.code == 'max_depth'
+    assert exc.value.path == ('branches', 0, 'leaves', 0)
+
+    with pytest.raises(LimitExceededError) as exc:
+        Tree.parse(data, max_list_length=2)
+    assert exc.value.code == 'max_list_length'
+    assert exc.value.path == ('branches', 0, 'leaves')
+
+    with pytest.raises(LimitExceededError) as exc:
+        Tree.parse(data, max_values=10)
+    assert exc.value.code == 'max_values'
+    assert isinstance(exc.value, ValidationError)
+
+    with pytest.raises(LimitExceededError) as exc:
+        Tree.parse(data, time_budget=0)
+    assert exc.value.code == 'time_budget'
+
+    pytest.raises(ValueError, Tree.parse, data, max_depth=0)
+
+
+def test_parse_time_budget():
+    coerced = []
+
+    def slow_int(value):
+        if not coerced:
+            time.sleep(0.05)
+        coerced.append(value)
+        return int(value)
+
+    class Slow(int):
+        def __new__(cls, value):
+            return int.__new__(cls, slow_int(value))
+
+    class Many(Config):
+        xs = ListField(Slow)
+        spilled = ListField(slow_int, spill=True)
+        checked = Field(float, validator=lambda value: time.sleep(value) or True)
+
+    # Long lists are checked as their items are coerced
+    with pytest.raises(LimitExceededError) as exc:
+        Many.parse({'xs': list(range(10000))}, time_budget=0.01)
+    assert exc.value.code == 'time_budget'
+    assert exc.value.path == ('xs',)
+    assert len(coerced) < 1000
+
+    del coerced[:]
+    with pytest.raises(LimitExceededError):
+        Many.parse({'spilled': list(range(10000))}, time_budget=0.01)
+    assert len(coerced) < 1000
+
+    # A slow validator is caught once the config is created
+    with pytest.raises(LimitExceededError):
+        Many.parse({'checked': 0.05}, time_budget=0.01)
+    assert Many.parse({'checked': 0}, time_budget=10).checked == 0
+
+    # Budgets are checked between configs, not only every so many values
+    class Item(Config):
+        checked = Field(float, validator=lambda value: time.sleep(value) or True)
+
+    class Items(Config):
+        items = ListField(Item)
+
+    start = time.time()
+    with pytest.raises(LimitExceededError):
+        Items.parse({'items': [{'checked': 0.01}] * 100}, time_budget=0.05)
+    assert time.time() - start < 0.5
+
+
+def test_parse_only():
+    class Database(Config):
+        host = Field(required=True)
+        port = Field(int, required=True, validator=lambda port: port > 0)
+
+    class Server(Config):
+        __allow_extra__ = False
+
+        db = Field(Database, required=True)
+        workers = Field(int, default=1)
+        name = Field(required=True)
+
+    config = Server.parse({'db': {'host': 'localhost', 'port': -1},
+                           'workers': '4', 'unknown': True},
+                          only=['db.host', 'workers'])
+
+    assert config.db.host == 'localhost'
+    assert config.workers == 4
+    assert config.to_dict() == {'db': {'host': 'localhost'}, 'workers': 4}
+
+    with pytest.raises(ProjectionError):
+        config.name
+
+    with pytest.raises(ProjectionError):
+        config.db.port
+
+    with pytest.raises(ValidationError):
+        Server.parse({'db': {'port': -1}}, only=['db.port'])
+
+    # Projecting an entire field normalizes all of it
+    config = Server.parse({'db': {'host': 'localhost', 'port': '5'}},
+                          only=['db.host', 'db'])
+    assert config.db.port == 5
+
+
+def test_parse_only_lists():
+    class Item(Config):
+        name = Field(required=True)
+        count = Field(int)
+
+    class Order(Config):
+        items = ListField(Item)
+        columns = ListField(Item, columnar=True)
+
+    config = Order.parse({'items': [{'name': 'a', 'count': 'bad'}],
+                          'columns': [{'name': 'b', 'count': 'bad'}]},
+                         only=['items.name', 'columns.name'])
+
+    assert config.items[0].name == 'a'
+    assert config.columns[0].name == 'b'
+    with pytest.raises(ProjectionError):
+        config.items[0].count
+
+
+def test_parse_only_invalid_path():
+    class Conf(Config):
+        name = Field()
+        tags = ListField()
+
+    for path in ('missing', 'name.first', 'tags.0'):
+        with pytest.raises(ValueError):
+            Conf.parse({}, only=[path])
+
+
+def test_class_cache_threads():
+    class Sub(Config):
+        value = Field(int)
+
+    schemas = [type('Schema{0}'.format(i), (Config,), {
+        'name': Field(required=True),
+        'sub': Field(Sub),
+        'items': ListField(Sub),
+    }) for i in range(50)]
+
+    builds = []
+    results = []
+    start = threading.Event()
+
+    def build(cls):
+        builds.append(cls)
+        time.sleep(0.001)
+        return object()
+
+    def run():
+        start.wait()
+        for cls in schemas:
+            results.append((cls, cls._cached('test', lambda: build(cls)),
+                            cls.fingerprint(), cls._json_schema()))
+
+    threads = [threading.Thread(target=run) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+
+    # Every key is built once per class, and all threads see the same data
+    assert sorted(builds, key=id) == sorted(schemas, key=id)
+    for cls, value, fingerprint, schema in results:
+        assert value is cls._cached('test', None)
+        assert fingerprint == cls.fingerprint()
+        assert schema is cls._json_schema()
+
+
+def test_equality():
+    class Sub(Config):
+        value = Field(int)
+
+    class Conf(Config):
+        name = Field()
+        sub = Field(Sub)
+        subs = ListField(Sub)
+        columns = ListField(Sub, columnar=True)
+
+    data = {'name': 'a', 'sub': {'value': 1}, 'subs': [{'value': 2}],
+            'columns': [{'value': 3}, None]}
+    config = Conf(data)
+
+    assert config == Conf(data)
+    assert not config != Conf(data)
+    assert config != Conf(data, name='b')
+    assert config != Conf(data, columns=[{'value': 4}, None])
+    assert config.overlay(name='a') == config
+    assert config.overlay(name='b') != config
+    assert Sub(value=1) != Conf(name='a')
+
+    assert Sub(value=1) < Sub(value=2)
+    assert Sub(value=1) <= Sub(value=1) <= Sub(value=2)
+    assert Sub(value=2) > Sub(value=1)
+    assert Sub(value=2) >= Sub(value=2) >= Sub(value=1)
+    assert not Sub(value=1) > Sub(value=1)
+    assert Sub(value=None) < Sub(value=0)
+    assert Sub(value=0) > Sub(value=None)
+    assert sorted([Conf(name='b'), Conf(name='a')])[0].name == 'a'
+
+    # Only frozen configs are hashable
+    pytest.raises(TypeError, hash, config)
+
+    frozen = Conf(data).freeze()
+    assert hash(frozen) == hash(Conf(data).freeze())
+    assert len(set([frozen, Conf(data).freeze(),
+                    Conf(data, name='b').freeze()])) == 2
+
+    # Lists of frozen configs can not change, so the hash is cached
+    pytest.raises(FrozenConfigError, frozen.subs.append, Sub(value=5))
+    assert frozen.subs == [Sub(value=2)]
+    assert hash(frozen) == frozen._hash
+
+    class Spilled(Config):
+        subs = ListField(Sub, spill=True)
+
+    assert Spilled(subs=[{'value': 1}]) == Spilled(subs=[{'value': 1}])
+    assert Spilled(subs=[{'value': 1}]) != Spilled(subs=[{'value': 2}])
+
+
+def test_get_path():
+    class Address(Config):
+        port = Field(int, key='listen-port')
+
+    class Node(Config):
+        address = Field(Address)
+        tags = ListField()
+        meta = Field(dict)
+
+    class Cluster(Config):
+        nodes = ListField(Node)
+        columns = ListField(Address, columnar=True)
+
+    cluster = Cluster(nodes=[{'address': {'listen-port': 80}, 'tags': ['a'],
+                              'meta': {'labels': ['x', 'y']}}],
+                      columns=[{'listen-port': 1}])
+
+    assert cluster.get_path('nodes.0.address.port') == 80
+    assert cluster.get_path('nodes.0.address.listen-port') == 80
+    assert cluster.get_path(('nodes', 0, 'address', 'port')) == 80
+    assert cluster.get_path('nodes.-1.tags.0') == 'a'
+    assert cluster.get_path('nodes.0.meta.labels.1') == 'y'
+    assert cluster.get_path('columns.0.port') == 1
+    assert cluster.get_path('nodes.1.address', default=None) is None
+
+    with pytest.raises(IndexError):
+        cluster.get_path('nodes.1.address')
+
+    for path in ('missing', 'nodes.first', 'nodes.0.address.x', ''):
+        with pytest.raises(ValueError):
+            cluster.get_path(path)
+
+
+def test_set_path():
+    class Node(Config):
+        port = Field(int, validator=lambda port: port > 0)
+        tags = ListField(choices=['a', 'b'])
+
+    class Cluster(Config):
+        nodes = ListField(Node)
+        meta = Field(dict)
+
+    cluster = Cluster(nodes=[{'port': 1}], meta={})
+
+    cluster.set_path('nodes.0.port', '8080')
+    assert cluster.nodes[0].port == 8080
+
+    cluster.set_path('nodes.0.tags', ['a'])
+    cluster.set_path('nodes.0.tags.0', 'b')
+    assert cluster.nodes[0].tags == ['b']
+
+    cluster.set_path('nodes.0', {'port': 2})
+    assert cluster.nodes[0].port == 2
+    assert cluster.nodes[0].parent is cluster
+
+    cluster.set_path('meta.name', 'x')
+    assert cluster.meta == {'name': 'x'}
+
+    with pytest.raises(ValidationError) as exc:
+        cluster.set_path('nodes.0.port', -1)
+    assert exc.value.path == ('nodes', 0, 'port')
+
+    with pytest.raises(ValidationError) as exc:
+        cluster.set_path('nodes.0.tags.0', 'c')
+    assert exc.value.path == ('nodes', 0, 'tags', 0)
+
+    class Budget(Config):
+        costs = ListField(int, validator=lambda costs: sum(costs) < 10)
+
+    budget = Budget(costs=[1, 2])
+    budget.set_path('costs.1', '3')
+    assert budget.costs == [1, 3]
+    with pytest.raises(ValidationError) as exc:
+        budget.set_path('costs.1', 9)
+    assert exc.value.path == ('costs',)
+    assert budget.costs == [1, 3]
+
+    # Only a bounded number of distinct paths are cached
+    for i in range(2000):
+        budget.get_path('costs.{0}'.format(i), None)
+    assert len(Budget._cached('paths', dict)) <= 1024
+
+    # Overlays do not change the config that they were made from
+    base = Cluster(nodes=[{'port': 1, 'tags': ['a']}], meta={})
+    overlay = base.overlay()
+    overlay.set_path('nodes.0.tags.0', 'b')
+    overlay.set_path('nodes.0.port', 2)
+    overlay.set_path('meta.name', 'x')
+    assert overlay.to_dict() == {'nodes': [{'port': 2, 'tags': ['b']}],
+                                 'meta': {'name': 'x'}}
+    assert base.to_dict() == {'nodes': [{'port': 1, 'tags': ['a']}],
+                              'meta': {}}
+
+    class Lists(Config):
+        columns = ListField(Node, columnar=True, nullable=True,
+                            validator=lambda nodes: len(nodes) < 3)
+        spilled = ListField(Node, spill=True)
+
+    lists = Lists(columns=[{'port': 1}, None], spilled=[{'port': 1}])
+    lists.set_path('columns.1', {'port': '3', 'tags': ['a']})
+    lists.set_path('columns.0', None)
+    assert lists.to_dict()['columns'] == [None, {'port': 3, 'tags': ['a']}]
+    pytest.raises(ValidationError, lists.set_path, 'columns.0', {'port': 0})
+    assert lists.columns[0] is None
+    pytest.raises(IndexError, lists.set_path, 'columns.2', {'port': 1})
+    with pytest.raises(ReadOnlyListError):
+        lists.set_path('spilled.0', {'port': 2})
+
+    cluster.freeze()
+    with pytest.raises(FrozenConfigError):
+        cluster.set_path('nodes.0.port', 3)
+
+
+def test_from_flat():
+    class Node(Config):
+        name = Field(required=True)
+        port = Field(int, default=80)
+        tags = ListField()
+
+    class Cluster(Config):
+        __allow_extra__ = False
+
+        nodes = ListField(Node)
+        meta = Field(dict)
+        leader = Field(Node)
+
+    cluster = Cluster.from_flat({
+        'nodes.1.name': 'b',
+        'nodes.0.name': 'a',
+        'nodes.0.port': '8080',
+        'nodes.0.tags.1': 'y',
+        'nodes.0.tags.0': 'x',
+        'meta.owner.name': 'ops',
+        'leader.name': 'a',
+    })
+    assert [node.name for node in cluster.nodes] == ['a', 'b']
+    assert cluster.nodes[0].port == 8080
+    assert cluster.nodes[0].tags == ['x', 'y']
+    assert cluster.nodes[1].parent is cluster
+    assert cluster.meta == {'owner': {'name': 'ops'}}
+    assert cluster.leader.name == 'a'
+
+    env = {'APP__NODES__0__NAME': 'a', 'APP__LEADER__NAME': 'b',
+           'PATH': '/bin'}
+    cluster = Cluster.from_flat(env, sep='__', fold_case=True, prefix='app')
+    assert cluster.nodes[0].name == 'a'
+    assert cluster.leader.name == 'b'
+
+    with pytest.raises(PropertyError) as exc:
+        Cluster.from_flat({'nodes.1.name': 'b'})
+    assert exc.value.path == ('nodes', 0)
+
+    with pytest.raises(PropertyError) as exc:
+        Cluster.from_flat({'nodes.first.name': 'b'})
+    assert exc.value.code == 'extra'
+
+    pytest.raises(PropertyError, Cluster.from_flat, {'other': 1})
+    pytest.raises(ValidationError, Cluster.from_flat,
+                  {'meta': 1, 'meta.owner': 2})
+
+
+def test_from_flat_keys():
+    class TestConfig(Config):
+        dotted = Field(key='a.b')
+        upper = Field(int, key='Upper')
+
+    config = TestConfig.from_flat({'a.b': 'x', 'UPPER': '1'}, fold_case=True)
+    assert (config.dotted, config.upper) == ('x', 1)
+    assert TestConfig.from_flat({'Upper': '2'}, only=['upper']).upper == 2
+
+
+def test_indexed_list():
+    class Product(Config):
+        name = Field(required=True)
+        sku = Field(int)
+
+    class Catalog(Config):
+        products = ListField(Product, index=['name', 'sku'])
+
+    catalog = Catalog(products=[{'name': 'Orange', 'sku': '1'},
+                                {'name': 'Apple', 'sku': 2}])
+    products = catalog.products
+    assert isinstance(products, IndexedList)
+    assert products.by_name['Orange'] is products[0]
+    assert products.by_sku[2].name == 'Apple'
+
+    with pytest.raises(ValidationError) as exc:
+        Catalog(products=[{'name': 'Orange'}, {'name': 'Orange'}])
+    assert exc.value.code == 'unique'
+    assert exc.value.path == ('products', 1, 'name')
+
+    products.append({'name': 'Pear'})
+    assert products.by_name['Pear'].parent is catalog
+    pytest.raises(ValidationError, products.append, {'name': 'Pear'})
+    pytest.raises(PropertyError, products.insert, 0, {})
+    assert len(products) == 3
+
+    products[0] = {'name': 'Kiwi', 'sku': 1}
+    assert 'Orange' not in products.by_name
+    assert products.by_sku[1].name == 'Kiwi'
+
+    del products[1]
+    assert sorted(products.by_name) == ['Kiwi', 'Pear']
+    assert sorted(products.by_sku) == [1]
+
+    catalog.set_path('products.1.name', 'Plum')
+    assert sorted(products.by_name) == ['Kiwi', 'Plum']
+    pytest.raises(ValidationError, catalog.set_path, 'products.1.name',
+                  'Kiwi')
+    assert products[1].name == 'Plum'
+
+    # Changing an indexed field of an item keeps the index up to date
+    products[1].update(name='Fig')
+    assert sorted(products.by_name) == ['Fig', 'Kiwi']
+    catalog.set_path('products.1.name', 'Plum')
+    assert sorted(products.by_name) == ['Kiwi', 'Plum']
+    with pytest.raises(ValidationError) as exc:
+        products[1].update(name='Kiwi', sku=5)
+    assert exc.value.code == 'unique'
+    assert exc.value.path == ('products', 1, 'name')
+    assert products[1].name == 'Plum' and products[1].sku is None
+    assert products.by_name['Plum'] is products[1]
+
+    copied = deepcopy(catalog)
+    assert copied.products.by_name['Plum'] is copied.products[1]
+
+    # Even an empty list is converted to a plain list
+    assert type(Catalog(products=[]).to_dict()['products']) is list
+
+    catalog.freeze()
+    pytest.raises(FrozenConfigError, products.append, {'name': 'Fig'})
+
+    class Editable(Config):
+        name = Field(read_only=False)
+
+    class Editables(Config):
+        items = ListField(Editable, index='name')
+        single = Field(Editable)
+
+    editables = Editables(items=[{'name': 'a'}], single={'name': 'a'})
+    editables.items[0].name = 'b'
+    assert list(editables.items.by_name) == ['b']
+    editables.single.name = 'b'
+    assert editables.items.by_name['b'] is editables.items[0]
+    with pytest.raises(ValidationError):
+        editables.items.append({'name': 'b'})
+
+    # Changes are checked against the validators of the whole list
+    class Basket(Config):
+        products = ListField(Product, index='name',
+                             validator=Length(min=1, max=2))
+
+    products = Basket(products=[{'name': 'Fig'}, {'name': 'Kiwi'}]).products
+    pytest.raises(ValidationError, products.append, {'name': 'Plum'})
+    pytest.raises(ValidationError, products.extend, [{'name': 'Plum'}])
+    pytest.raises(ValidationError, products.insert, 0, {'name': 'Plum'})
+    pytest.raises(ValidationError, products.__setitem__, slice(0, 0),
+                  [{'name': 'Plum'}])
+    assert [product.name for product in products] == ['Fig', 'Kiwi']
+    assert 'Plum' not in products.by_name
+    products.pop()
+    pytest.raises(ValidationError, products.pop)
+    with pytest.raises(ValidationError):
+        del products[0]
+    assert [product.name for product in products] == ['Fig']
+
+    with pytest.raises(ValueError):
+        ListField(Product, index='missing')
+    with pytest.raises(ValueError):
+        ListField(Product, index='name', columnar=True)
@@ -1,4 +1,6 @@
-from figgis import Field, Config, ListField
+from figgis import Field, Config, ListField, FingerprintError, ValidationError
+
+import pytest
 
 
 def test_to_dict():
@@ -34,3 +36,115 @@ def test_to_dict_complex_list():
     config = Conf(subconf=[{'field': 'value'}, {'field': 'value'}])
     assert config.to_dict() == {'subconf': [{'field': 'value'},
                                             {'field': 'value'}]}
+
+
+def test_from_trusted():
+    class SubConf(Config):
+        value = Field(int, validator=lambda value: value > 0)
+
+    class Conf(Config):
+        name = Field(key='@name')
+        sub = Field(SubConf)
+        subs = ListField(SubConf)
+        values = ListField(int)
+        default = Field(SubConf, default={'value': 1})
+
+    config = Conf({'@name': 'conf', 'sub': {'value': '1'},
+                   'subs': [{'value': 2}, {'value': 3}], 'values': [1, 2]})
+    data = config.to_dict()
+
+    trusted = Conf.from_trusted(data, Conf.fingerprint())
+    assert trusted.to_dict() == data
+    assert trusted.name == 'conf'
+    assert trusted.sub.parent is trusted
+    assert trusted.sub.value == 1
+    assert [sub.value for sub in trusted.subs] == [2, 3]
+    assert trusted.subs[0].parent is trusted
+
+    # No validation is performed
+    trusted = Conf.from_trusted({'sub': {'value': -1}}, Conf.fingerprint())
+    assert trusted.sub.value == -1
+    assert trusted.default.value == 1
+    assert trusted.subs == []
+
+
+def test_from_trusted_defaults():
+    class SubConf(Config):
+        value = Field(int)
+
+    class Conf(Config):
+        port = Field(int, default='5')
+        sub = Field(SubConf, default={'value': '7'})
+        extra = Field(dict, default_factory=dict)
+        tags = Field(list, default=['a'])
+
+    first = Conf.from_trusted({}, Conf.fingerprint())
+    second = Conf.from_trusted({}, Conf.fingerprint())
+    assert first.port == 5
+    assert first.sub.value == 7
+    assert first.sub.parent is first
+    assert first.extra == {}
+    assert first.extra is not second.extra
+
+    first.tags.append('b')
+    assert second.tags == ['a']
+    assert second.to_dict() == Conf().to_dict() == {
+        'port': 5, 'sub': {'value': 7}, 'extra': {}, 'tags': ['a']}
+
+
+def test_from_trusted_fingerprint():
+    def make_conf(type_):
+        class Conf(Config):
+            value = Field(type_)
+
+        return Conf
+
+    IntConf, FloatConf = make_conf(int), make_conf(float)
+    assert IntConf.fingerprint() == make_conf(int).fingerprint()
+    assert IntConf.fingerprint() != FloatConf.fingerprint()
+
+    pytest.raises(FingerprintError, IntConf.from_trusted, {'value': 1},
+                  FloatConf.fingerprint())
+
+
+def test_validate_to_dict():
+    class Point(Config):
+        x = Field(int, validator=lambda x: x >= 0)
+        label = Field(key='point-label')
+
+    class Shape(Config):
+        origin = Field(Point, validator=lambda point: point.x < 10)
+        points = ListField(Point)
+        columns = ListField(Point, columnar=True)
+        spilled = ListField(Point, spill=True)
+        tags = ListField(choices=['a', 'b'])
+
+    data = {'origin': {'x': '1'}, 'points': [{'x': 2, 'point-label': 'p'}],
+            'columns': [{'x': 3}, None], 'spilled': [{'x': 4}],
+            'tags': ['a']}
+
+    plain = Shape.validate_to_dict(data)
+    assert plain == Shape(data).to_dict()
+    assert type(plain) is dict
+    assert type(plain['origin']) is dict
+    assert type(plain['columns']) is list
+    assert type(plain['spilled']) is list
+
+    assert Shape.validate_to_dict(origin=Point(x=5)) == \
+        Shape(origin=Point(x=5)).to_dict()
+
+    for invalid in ({'origin': {'x': 10}}, {'points': [{'x': -1}]},
+                    {'tags': ['c']}, {'columns': [{'x': 'x'}]}):
+        with pytest.raises(ValidationError):
+            Shape.validate_to_dict(invalid)
+
+    assert Shape.validate_to_dicts([data, {}]) == [plain, Shape().to_dict()]
+
+    # Columnar rows are normalized one at a time, as in a config
+    class Rows(Config):
+        rows = ListField(dict, Point, columnar=True)
+
+    for normalize in (Rows, Rows.validate_to_dict):
+        with pytest.raises(ValidationError) as exc:
+            normalize({'rows': [{'x': -1}, 'x']})
+        assert exc.value.path == ('rows', 0, 'x')
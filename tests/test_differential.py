@@ -0,0 +1,58 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+from figgis import Config, Field, ListField, Sample
+from figgis import testing
+import pytest
+
+
+def test_fuzz():
+    testing.fuzz(iterations=100, seed=0)
+
+
+def test_check():
+    class Item(Config):
+        name = Field(required=True)
+
+    class TestConfig(Config):
+        items = ListField(Item, nullable=True)
+        flag = Field(bool, default='no')
+
+    testing.check(TestConfig, {'items': [None, {'name': 'a'}]})
+    testing.check(TestConfig, {'items': [{}], 'flag': 'maybe'})
+    testing.check(TestConfig, {'items': None})
+
+
+def test_check_list_engines():
+    class Item(Config):
+        name = Field(required=True)
+        count = Field(int, default=0)
+
+    class TestConfig(Config):
+        streamed = ListField(int, stream=True, choices=[1, 2])
+        spilled = ListField(int, spill=True)
+        columns = ListField(dict, Item, columnar=True)
+        sampled = ListField(int, sample=Sample(head=100), choices=[1, 2])
+        indexed = ListField(Item, index='name')
+
+    testing.check(TestConfig, {
+        'streamed': ['1', 2], 'spilled': [3], 'sampled': [1],
+        'columns': [{'name': 'a'}, [('name', 'b')]],
+        'indexed': [{'name': 'a'}, {'name': 'b', 'count': '2'}],
+    })
+    testing.check(TestConfig, {'streamed': [1, 3]})
+    testing.check(TestConfig, {'columns': [{'name': 'a'}, 'x', {}]})
+    testing.check(TestConfig, {'indexed': [{'name': 'a'}, {'name': 'a'}]})
+
+
+def test_check_divergence(monkeypatch):
+    class TestConfig(Config):
+        value = Field(int)
+
+    monkeypatch.setitem(testing.MODES, 'broken', (
+        lambda cls, data: dict(cls(data).to_dict(), value=0), {}))
+
+    testing.check(TestConfig, {'value': 0}, modes=['broken'])
+    with pytest.raises(AssertionError):
+        testing.check(TestConfig, {'value': 1}, modes=['broken'])
@@ -0,0 +1,355 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+from figgis import (Config, Field, ListField, SpilledList, ColumnarList,
+                    IndexedList, Sample, SampledList, ValidationError,
+                    PropertyError)
+from figgis import binary
+
+from array import array
+
+import pytest
+
+
+class Item(Config):
+    name = Field(required=True)
+    count = Field(int, default=0)
+
+
+def test_stream():
+    class Conf(Config):
+        values = ListField(int, stream=True)
+
+    conf = Conf(values=(str(i) for i in range(5)))
+    assert not isinstance(conf.values, list)
+    assert list(conf.values) == [0, 1, 2, 3, 4]
+
+    assert list(Conf().values) == []
+
+
+def test_stream_errors_on_consumption():
+    class Conf(Config):
+        values = ListField(int, stream=True, choices=[1, 2])
+
+    conf = Conf(values=[1, 'a'])
+    values = iter(conf.values)
+    assert next(values) == 1
+    pytest.raises(ValidationError, next, values)
+
+    conf = Conf(values=[1, 3])
+    with pytest.raises(ValidationError) as exc:
+        list(conf.values)
+    assert 'at index 1' in str(exc.value)
+
+    pytest.raises(ValidationError, Conf, values='12')
+    pytest.raises(ValidationError, Conf, values={'a': 1})
+
+
+def test_stream_options():
+    pytest.raises(ValueError, ListField, int, stream=True, spill=True)
+    pytest.raises(ValueError, ListField, int, stream=True,
+                  validator=lambda values: True)
+
+
+def test_stream_config():
+    class Conf(Config):
+        items = ListField(Item, stream=True)
+
+    conf = Conf(items=iter([{'name': 'one'}, {'name': 'two', 'count': 2}]))
+    items = list(conf.items)
+    assert [item.name for item in items] == ['one', 'two']
+    assert items[1].count == 2
+    assert items[0].parent is conf
+
+
+def test_stream_to_dict():
+    class Conf(Config):
+        items = ListField(Item, stream=True)
+
+    data = {'items': [{'name': 'one', 'count': 1}]}
+    trusted = Conf.from_trusted(data, Conf.fingerprint())
+    for conf in (Conf(data), trusted):
+        items = conf.to_dict()['items']
+        assert not isinstance(items, list)
+        assert list(items) == data['items']
+
+    trusted = Conf.from_trusted(data, Conf.fingerprint())
+    assert next(iter(trusted.items)).parent is trusted
+
+
+def test_stream_after_parse():
+    class Outer(Config):
+        name = Field(str)
+        items = ListField(Item, stream=True)
+
+    class Conf(Config):
+        outer = Field(Outer)
+        other = Field(Item)
+
+    data = {'outer': {'items': [{'name': 'one', 'count': 1}]},
+            'other': {'name': 'two'}}
+
+    # Items are normalized with the projection of their own field
+    conf = Conf.parse(data, only=['outer.items.name', 'other'])
+    assert [item.to_dict() for item in conf.outer.items] == [{'name': 'one'}]
+
+    # Validators run as the items are consumed, since nothing is deferred
+    class Checked(Config):
+        items = ListField(int, stream=True, choices=[1, 2])
+
+    conf = Checked.parse({'items': [1, 3]}, defer_validation=True,
+                         time_budget=60)
+    items = iter(conf.items)
+    assert next(items) == 1
+    pytest.raises(ValidationError, next, items)
+
+
+def test_spill():
+    class Conf(Config):
+        values = ListField(int, spill=True, choices=list(range(100)),
+                           validator=lambda values: len(values) == 100)
+
+    conf = Conf(values=(str(i) for i in range(100)))
+    assert isinstance(conf.values, SpilledList)
+    assert len(conf.values) == 100
+    assert list(conf.values) == list(range(100))
+    assert conf.values[5] == 5
+    assert conf.values[-1] == 99
+    assert conf.values[2:5] == [2, 3, 4]
+    pytest.raises(IndexError, lambda: conf.values[100])
+
+    pytest.raises(ValidationError, Conf, values=range(99))
+    pytest.raises(ValidationError, Conf, values=['a'] + list(range(99)))
+    pytest.raises(ValidationError, Conf, values=range(1, 101))
+
+
+def test_spill_file(monkeypatch):
+    class Conf(Config):
+        values = ListField(int, spill=True)
+
+    # Small lists stay in memory, so many of them do not open many files
+    confs = [Conf(values=[i]) for i in range(2000)]
+    assert not any(conf.values._file._rolled for conf in confs)
+
+    monkeypatch.setattr(SpilledList, '_SPOOL_SIZE', 100)
+    conf = Conf(values=range(100))
+    assert conf.values._file._rolled
+    assert list(conf.values) == list(range(100))
+    conf.values.close()
+
+
+def test_spill_config():
+    class Nested(Config):
+        item = Field(Item)
+
+    class Conf(Config):
+        items = ListField(Nested, spill=True)
+
+    conf = Conf(items=[{'item': {'name': 'one'}}, {'item': {'name': 'two'}}])
+    first = conf.items[0]
+    assert first.parent is conf
+    assert first.item.parent is first
+    assert first.item.name == 'one'
+    assert [nested.item.name for nested in conf.items] == ['one', 'two']
+
+    assert conf.to_dict() == {'items': [
+        {'item': {'name': 'one', 'count': 0}},
+        {'item': {'name': 'two', 'count': 0}},
+    ]}
+
+
+def test_spill_nested_lists():
+    class Group(Config):
+        columns = ListField(Item, columnar=True)
+        indexed = ListField(Item, index='name')
+
+    class Conf(Config):
+        groups = ListField(Group, spill=True)
+
+    data = {'groups': [{'columns': [{'name': 'a'}], 'indexed': [{'name': 'b'}]}]}
+    conf = Conf(data)
+    group = conf.groups[0]
+    assert isinstance(group.columns, ColumnarList)
+    assert isinstance(group.indexed, IndexedList)
+    assert group.indexed.by_name['b'].parent is group
+    assert group.parent is conf
+    assert conf.to_dict() == Conf(data).to_dict()
+
+
+def test_columnar():
+    class Address(Config):
+        street = Field()
+
+    class Product(Config):
+        name = Field(required=True)
+        price = Field(float, default=0.0)
+        count = Field(int)
+        address = Field(Address)
+
+        @property
+        def label(self):
+            return '{0} ({1})'.format(self.name, self.price)
+
+    class Catalog(Config):
+        products = ListField(Product, columnar=True)
+
+    catalog = Catalog(products=[
+        {'name': 'Orange', 'price': '0.5', 'count': 1},
+        {'name': 'Apple', 'count': 2, 'address': {'street': 'Main'}},
+        Product(name='Pear', price=1),
+    ])
+    products = catalog.products
+    assert isinstance(products, ColumnarList)
+    assert len(products) == 3
+
+    assert products.column('price') == array('d', [0.5, 0.0, 1.0])
+    assert products.column('count') == [1, 2, None]
+    assert products.column('name') == ['Orange', 'Apple', 'Pear']
+
+    apple = products[1]
+    assert isinstance(apple, Product)
+    assert apple.name == 'Apple'
+    assert apple.label == 'Apple (0.0)'
+    assert apple.address.street == 'Main'
+    assert apple.parent is catalog
+    assert isinstance(apple.address.parent, Product)
+    assert apple.address.parent.name == 'Apple'
+    assert apple.address.parent.parent is catalog
+    assert not hasattr(products, 'append')
+    assert apple.get('count') == 2
+    assert products[-1].name == 'Pear'
+    assert [product.name for product in products[:2]] == ['Orange', 'Apple']
+    pytest.raises(IndexError, lambda: products[3])
+
+    apple.update(price=2.5, count=None)
+    assert products.column('price')[1] == 2.5
+    assert products[1].count is None
+
+    assert catalog.to_dict() == {'products': [
+        {'name': 'Orange', 'price': 0.5, 'count': 1, 'address': None},
+        {'name': 'Apple', 'price': 2.5, 'count': None,
+         'address': {'street': 'Main'}},
+        {'name': 'Pear', 'price': 1.0, 'count': None, 'address': None},
+    ]}
+
+    pytest.raises(PropertyError, Catalog, products=[{'price': 1}])
+    pytest.raises(ValidationError, Catalog, products=[1])
+    pytest.raises(ValidationError, Catalog, products={})
+
+
+def test_columnar_copy():
+    class Catalog(Config):
+        items = ListField(Item, columnar=True, nullable=True)
+        other = Field()
+
+    catalog = Catalog(items=[{'name': 'one'}, None, {'name': 'two'}])
+    for copied in (catalog.copy(), catalog.overlay(other='x').copy()):
+        assert isinstance(copied.items, ColumnarList)
+        assert copied.items is not catalog.items
+        assert copied.items == catalog.items
+
+    copied.items[0].update(name='three')
+    assert catalog.items[0].name == 'one'
+
+    class Other(Config):
+        name = Field()
+
+    class Others(Config):
+        items = ListField(Other, columnar=True)
+
+    pytest.raises(ValidationError, Others, items=catalog.items)
+
+
+def test_columnar_trusted():
+    class Catalog(Config):
+        items = ListField(Item, columnar=True)
+
+    data = Catalog(items=[{'name': 'one'}, {'name': 'two'}]).to_dict()
+    catalog = Catalog.from_trusted(data, Catalog.fingerprint())
+    assert isinstance(catalog.items, ColumnarList)
+    assert catalog.to_dict() == data
+
+
+def test_columnar_row_parent():
+    class Address(Config):
+        street = Field()
+
+    class Product(Config):
+        name = Field()
+        address = Field(Address)
+
+    class Catalog(Config):
+        products = ListField(Product, columnar=True)
+
+    data = {'products': [{'name': 'a', 'address': {'street': 'Main'}}]}
+    for catalog in (Catalog(data),
+                    Catalog.parse(data, weak_parents=True),
+                    Catalog.from_trusted(data, Catalog.fingerprint())):
+        address = catalog.products[0].address
+        assert address.parent.name == 'a'
+        assert address.parent.parent is catalog
+
+
+def test_columnar_options():
+    pytest.raises(ValueError, ListField, int, columnar=True)
+    pytest.raises(ValueError, ListField, Item, columnar=True, spill=True)
+
+
+def test_sample_indices():
+    assert Sample(head=2, tail=2).indices(10) == set([0, 1, 8, 9])
+    assert Sample(head=5, tail=5).indices(3) == set([0, 1, 2])
+    assert Sample(stride=4).indices(10) == set([0, 4, 8])
+
+    sample = Sample(head=1, size=3, seed=42)
+    indices = sample.indices(100)
+    assert len(indices) == 4 and 0 in indices
+    assert sample.indices(100) == indices
+
+    with pytest.raises(ValueError):
+        Sample(stride=0)
+
+
+def test_sample_validates_sample():
+    class Item(Config):
+        value = Field(int, validator=lambda value: value >= 0)
+
+    class Conf(Config):
+        items = ListField(Item, sample=Sample(head=1, tail=1))
+        flags = ListField(int, choices=[0, 1], sample=Sample(head=2))
+
+    config = Conf(items=[{'value': 0}, {'value': '-1'}, {'value': 2}],
+                  flags=[0, 1, 7])
+
+    # Every item is coerced, but only sampled items are validated
+    assert [item.value for item in config.items] == [0, -1, 2]
+    assert config.items[1].parent is config
+    assert config.flags == [0, 1, 7]
+    assert isinstance(config.items, SampledList)
+    assert config.items.sampled == 2
+    assert config.items.ratio == 2.0 / 3
+    assert Conf(items=[]).items.ratio == 1.0
+
+    with pytest.raises(ValidationError):
+        Conf(items=[{'value': 1}, {'value': 'x'}, {'value': 1}])
+
+    with pytest.raises(ValidationError):
+        Conf(items=[{'value': 1}, {'value': 1}, {'value': -1}])
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(flags=[0, 7, 1])
+    assert exc.value.path == ('flags', 1)
+
+    # Trusted data is loaded into sampled lists as well
+    for copied in (Conf.from_trusted(config.to_dict(), Conf.fingerprint()),
+                   binary.loads(Conf, binary.dumps(config))):
+        assert isinstance(copied.items, SampledList)
+        assert copied.items.sampled == 2
+        assert copied.items[1].parent is copied
+        assert isinstance(copied.flags, SampledList)
+        assert copied.to_dict() == config.to_dict()
+
+
+def test_sample_exclusive():
+    with pytest.raises(ValueError):
+        ListField(int, stream=True, sample=Sample(head=1))
@@ -0,0 +1,62 @@
+from figgis import Config, Field, ListField
+from figgis import memory
+
+import json
+import sys
+
+
+class Database(Config):
+    host = Field()
+    port = Field(int)
+
+
+class Service(Config):
+    db = Field(Database)
+    replicas = ListField(Database)
+    columns = ListField(Database, columnar=True)
+    tags = ListField()
+
+
+def test_memory_usage():
+    config = Service(db={'host': 'x' * 1000, 'port': 5432},
+                     replicas=[{'host': 'a'}, {'host': 'b'}],
+                     columns=[{'port': 1}, {'port': 2}],
+                     tags=['one', 'two'])
+    usage = config.memory_usage()
+
+    assert set(usage) == set([
+        '', 'db', 'db.host', 'db.port', 'replicas', 'replicas.*.host',
+        'replicas.*.port', 'columns', 'columns.*.host', 'columns.*.port',
+        'tags'])
+    assert usage['db.host'] >= sys.getsizeof('x' * 1000)
+    assert usage['db'] > usage['db.host'] + usage['db.port']
+    assert usage[''] > sum(usage[name]
+                           for name in ('db', 'replicas', 'columns', 'tags'))
+
+    # Only direct values are counted
+    shallow = config.memory_usage(deep=False)
+    assert set(shallow) == set(['', 'db', 'replicas', 'columns', 'tags'])
+    assert shallow['db'] < usage['db']
+
+
+def test_memory_usage_shared():
+    db = Database(host='x' * 1000)
+    config = Service(replicas=[db, db])
+    usage = config.memory_usage()
+
+    # The shared config is only counted once, and its parent is not counted
+    assert usage['replicas.*.host'] == db.memory_usage()['host']
+    assert usage['replicas'] < 2 * db.memory_usage()['']
+
+
+def test_report(tmpdir, capsys):
+    config = Service(db={'host': 'x' * 1000})
+    assert memory.heaviest(config, count=2) == [
+        ('db', config.memory_usage()['db']),
+        ('db.host', config.memory_usage()['db.host'])]
+    assert memory.format_report(config).splitlines()[2].endswith('db.host')
+
+    path = tmpdir.join('data.json')
+    path.write(json.dumps({'db': {'host': 'x' * 1000}}))
+    memory.main(['tests.test_memory:Service', str(path), '-n', '1'])
+    assert capsys.readouterr()[0].splitlines()[1].endswith(' db')
@@ -0,0 +1,82 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+from figgis import Config, Field, ListField
+
+
+class Address(Config):
+    __help__ = 'A street address'
+    __allow_extra__ = False
+
+    number = Field(int, required=True, nullable=False)
+    street = Field(required=True)
+    suffix = Field(default='St.', choices=['St.', 'Ave.'])
+
+
+class Person(Config):
+    name = Field(required=True, help='Full name')
+    age = Field(int, validator=lambda age: age > 0)
+    translated = Field(bool, key='@translated')
+    address = Field(Address)
+    tags = ListField(nullable=False, choices=['a', 'b'])
+    aliases = ListField(required=True)
+    scores = ListField(int, default=[1])
+    custom = Field(lambda value: value)
+
+
+def test_json_schema():
+    schema = Person.to_json_schema()
+
+    assert schema['$schema'] == 'http://json-schema.org/draft-04/schema#'
+    assert schema['type'] == 'object'
+    assert schema['title'] == 'Person'
+    assert schema['required'] == ['aliases', 'name']
+    assert 'additionalProperties' not in schema
+
+    props = schema['properties']
+    assert sorted(props) == ['@translated', 'address', 'age', 'aliases',
+                             'custom', 'name', 'scores', 'tags']
+    assert props['name'] == {'type': ['string', 'null'],
+                             'description': 'Full name'}
+    assert props['age'] == {'type': ['integer', 'null']}
+    assert props['@translated'] == {'type': ['boolean', 'null']}
+    assert props['custom'] == {}
+    assert props['tags'] == {'type': ['array', 'null'],
+                             'items': {'type': 'string', 'enum': ['a', 'b']}}
+    assert props['aliases'] == {'type': 'array',
+                                'items': {'type': ['string', 'null']}}
+    assert props['scores'] == {'type': 'array', 'default': [1],
+                               'items': {'type': ['integer', 'null']}}
+
+    address = props['address']
+    assert address['type'] == ['object', 'null']
+    assert address['description'] == 'A street address'
+    assert address['required'] == ['number', 'street']
+    assert address['additionalProperties'] is False
+    assert address['properties']['number'] == {'type': 'integer'}
+    assert address['properties']['suffix'] == {
+        'type': ['string', 'null'],
+        'enum': ['Ave.', 'St.'],
+        'default': 'St.',
+    }
+
+
+def test_json_schema_inherits():
+    class Child(Config):
+        __inherits__ = [Address]
+
+        unit = Field(int)
+
+    schema = Child.to_json_schema()
+    assert sorted(schema['properties']) == ['number', 'street', 'suffix',
+                                            'unit']
+    assert schema['required'] == ['number', 'street']
+
+
+def test_json_schema_cached():
+    schema = Person.to_json_schema()
+    schema['properties'].clear()
+
+    assert Person.to_json_schema()['properties']
+    assert Person._json_schema() is Person._json_schema()
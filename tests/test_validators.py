@@ -0,0 +1,244 @@
+# Copyright 2015 Yahoo! Inc.
+# Copyrights licensed under the BSD License. See the accompanying LICENSE
+# file for terms.
+
+from figgis import (Config, Field, ListField, ValidationError, PropertyError,
+                    Range, Length, Regex)
+
+import pickle
+import re
+import threading
+import pytest
+
+
+def test_range():
+    class Conf(Config):
+        both = Field(int, validator=Range(1, 10))
+        low = Field(float, validator=Range(min=0))
+        high = Field(int, validator=Range(max=5, exclusive=True))
+
+    conf = Conf(both=1, low=0, high=4)
+    assert (conf.both, conf.low, conf.high) == (1, 0.0, 4)
+    assert Conf(both=10).both == 10
+    assert Conf(both=None).both is None
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(both=11)
+    assert str(exc.value) == "Field 'both' is invalid: Value 11 is not in [1, 10]"
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(low=-0.1)
+    assert str(exc.value) == "Field 'low' is invalid: Value -0.1 is not at least 0"
+    with pytest.raises(ValidationError) as exc:
+        Conf(high=5)
+    assert str(exc.value) == "Field 'high' is invalid: Value 5 is not less than 5"
+    pytest.raises(ValueError, Range)
+
+
+def test_wrong_types():
+    class Conf(Config):
+        number = Field(validator=Range(1, 10))
+        name = Field(int, validator=Length(max=2))
+        word = Field(list, validator=Regex('[a-z]+'))
+
+    for data in ({'number': 'five'}, {'name': 5}, {'word': ['a']}):
+        pytest.raises(ValidationError, Conf, **data)
+        assert not Conf.is_valid(data)
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(name=5)
+    assert str(exc.value) == "Field 'name' is invalid: Value 5 has no length"
+
+
+def test_length():
+    class Conf(Config):
+        name = Field(validator=Length(1, 3))
+        values = ListField(int, validator=Length(max=2))
+
+    assert Conf(name='abc', values=[1, 2]).name == 'abc'
+    pytest.raises(ValidationError, Conf, name='')
+    pytest.raises(ValidationError, Conf, name='abcd')
+    with pytest.raises(ValidationError) as exc:
+        Conf(values=[1, 2, 3])
+    assert str(exc.value) == "Field 'values' is invalid: Length 3 is not at most 2"
+
+
+def test_regex():
+    class Conf(Config):
+        name = Field(validator=Regex('[a-z]+'))
+        upper = Field(validator=Regex(re.compile('[a-z]+', re.I)))
+
+    assert Conf(name='abc', upper='ABC').upper == 'ABC'
+    pytest.raises(ValidationError, Conf, name='abc1')
+    pytest.raises(ValidationError, Conf, name='1abc')
+    pytest.raises(ValidationError, Conf, upper='ABC1')
+
+
+def test_validator_cost_order():
+    calls = []
+
+    def expensive(value):
+        calls.append('expensive')
+        return True
+
+    def cheap(value):
+        calls.append('cheap')
+        return True
+
+    def declared(value):
+        calls.append('declared')
+        return True
+
+    cheap.cost = 1
+
+    class Conf(Config):
+        value = Field(int, choices=[1, 2],
+                      validator=[expensive, declared, cheap])
+
+    Conf(value=1)
+    assert calls == ['cheap', 'expensive', 'declared']
+
+    del calls[:]
+    with pytest.raises(ValidationError) as exc:
+        Conf(value=3)
+    assert calls == []
+    assert 'not a valid choice' in str(exc.value)
+
+
+def test_validator_messages():
+    def fails(value):
+        return False
+
+    def raises(value):
+        raise ValidationError('bad value')
+
+    class Conf(Config):
+        false = Field(validator=[fails])
+        error = Field(validator=[lambda value: True, raises])
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(false='value')
+    assert str(exc.value) == "Field 'false' is invalid"
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(error='value')
+    assert str(exc.value) == "Field 'error' is invalid: bad value"
+
+
+def test_error_details():
+    class Sub(Config):
+        value = Field(int, validator=Range(0, 10))
+
+    class Conf(Config):
+        subs = ListField(Sub)
+        values = ListField(int)
+        name = Field(required=True)
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(name='x', subs=[{'value': 1}, {'value': 11}])
+    error = exc.value
+    assert error.code == 'range'
+    assert error.path == ('subs', 1, 'value')
+    assert error.value == 11
+    assert error.field is Sub._fields['value']
+    assert str(error) == "Field 'subs.1.value' is invalid: Value 11 is not in [0, 10]"
+
+    with pytest.raises(ValidationError) as exc:
+        Conf(name='x', values=[1, 2, 'three'])
+    assert exc.value.code == 'type'
+    assert exc.value.path == ('values', 2)
+    assert exc.value.value == 'three'
+    assert 'values.2 is not of type int' in str(exc.value)
+
+    with pytest.raises(PropertyError) as exc:
+        Conf()
+    assert exc.value.code == 'required'
+    assert exc.value.path == ('name',)
+    assert str(exc.value) == "'Missing property: name'"
+
+    # Errors are pickled with their message, but without the field
+    copied = pickle.loads(pickle.dumps(error))
+    assert error.args == copied.args == (str(error),)
+    assert (copied.code, copied.path, copied.value) == ('range', ('subs', 1, 'value'), 11)
+    assert copied.field is None
+    assert str(copied) == str(error)
+
+
+def test_is_valid():
+    class Sub(Config):
+        __allow_extra__ = False
+
+        value = Field(int, required=True, validator=Range(0, 10))
+
+    class Conf(Config):
+        sub = Field(Sub)
+        subs = ListField(Sub)
+        stream = ListField(Sub, stream=True)
+
+    assert Conf.is_valid({'sub': {'value': 1}, 'subs': [{'value': '2'}]})
+    assert Conf.is_valid(sub={'value': 1})
+    assert not Conf.is_valid({'sub': {}})
+    assert not Conf.is_valid({'subs': [{'value': 1}, {'value': 1, 'x': 1}]})
+    assert not Conf.is_valid({'sub': {'value': 11}})
+    assert not Conf.is_valid({'sub': {'value': 'x'}})
+    assert not Conf.is_valid([])
+
+    # Like the constructor, streamed items are not checked
+    assert Conf.is_valid({'stream': [{}]})
+
+
+def test_deferred_validation():
+    release = threading.Event()
+    checked = []
+
+    def slow(value):
+        release.wait(5)
+        checked.append(value)
+        return value > 0
+
+    class Sub(Config):
+        value = Field(int, validator=slow)
+
+    class Conf(Config):
+        sub = Field(Sub)
+        name = Field(validator=Length(max=3))
+
+    config = Conf.parse({'sub': {'value': '1'}, 'name': 'abc'},
+                        defer_validation=True)
+
+    # Types are applied immediately, but validators have not run
+    assert config.sub.value == 1
+    assert not config.validation.done()
+    assert checked == []
+
+    release.set()
+    assert config.validation.wait(5)
+    config.validation.result()
+    assert config.validation.error is None
+    assert checked == [1]
+    assert config.sub.value == 1
+
+    config = Conf.parse({'sub': {'value': -1}}, defer_validation=True)
+    sub = config.sub
+    config.validation.wait(5)
+    assert isinstance(config.validation.error, ValidationError)
+    assert config.validation.error.path == ('sub', 'value')
+
+    called = []
+    config.validation.add_done_callback(called.append)
+    assert called == [config.validation]
+
+    # Both the config and the config with the invalid field are poisoned
+    with pytest.raises(ValidationError) as exc:
+        config.sub
+    assert exc.value.path == ('sub', 'value')
+    with pytest.raises(ValidationError):
+        sub.value
+    with pytest.raises(ValidationError):
+        config.to_dict()
+    with pytest.raises(ValidationError):
+        config.validation.result()
+
+    # Configs that were not deferred are already validated
+    assert Conf(name='a').validation.done()
+    assert Conf(name='a').validation.error is None